@@ -0,0 +1,238 @@
+#! /usr/bin/env python3
+"""Benchmarks of pgraph on synthetic graphs
+
+Times the main operations of Graph on the graphs of generators.py, at
+growing sizes, and writes a JSON report with the time, throughput and
+peak memory of every run, plus the scaling curve of each benchmark
+(time against edges, with the exponent of its log-log fit).
+
+Usage:
+    python3 benchmarks/bench.py [--sizes 1000 4000 16000]
+                                [--generators random grid ...]
+                                [--benchmarks dijkstra max_flux_dinic ...]
+                                [--repeat 3] [--seed 0] [-o report.json]
+"""
+
+import argparse
+import datetime
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                "..", "src"))
+
+from pgraph.graph import Graph, parse_graph
+from pgraph._flow import ALGORITHMS
+from generators import GENERATORS
+
+def _write_data(edges:list, path:str) -> None:
+    """Writes edges in the format of test.data
+    """
+    with open(path, "w") as f:
+        for start, end, weight, lbound, ubound, flux in edges:
+            f.write("{} -> {} (${};B{};~{});\n".format(start, end, weight,
+                                                      ubound, flux))
+
+def _build(edges:list) -> "Graph":
+    g = Graph()
+    g.add_edges_from(edges)
+    return g
+
+def _source_sink(graph:"Graph") -> tuple:
+    labels = list(graph.list_nodes())
+    return labels[0], labels[-1]
+
+# each benchmark takes the edges, the graph built from them and a
+# temporary directory, and returns the function to be timed; the work
+# done before returning isn't timed
+
+def _bench_parse_graph(edges, graph, tmp):
+    path = os.path.join(tmp, "graph.data")
+    _write_data(edges, path)
+    return lambda: parse_graph(path)
+
+def _bench_add_connection(edges, graph, tmp):
+    def run():
+        g = Graph()
+        for edge in edges:
+            g.add_connection(*edge)
+    return run
+
+def _bench_add_edges_from(edges, graph, tmp):
+    return lambda: _build(edges)
+
+def _bench_dijkstra(edges, graph, tmp):
+    source = _source_sink(graph)[0]
+    return lambda: graph.dijkstra(source)
+
+def _bench_bellman(edges, graph, tmp):
+    source = _source_sink(graph)[0]
+    return lambda: graph.bellman(source)
+
+def _bench_residual_graph(edges, graph, tmp):
+    return graph.residual_graph
+
+def _bench_max_flux(algorithm):
+    def bench(edges, graph, tmp):
+        source, sink = _source_sink(graph)
+        # max_flux writes the flux back, so each run gets its own copy
+        return lambda: graph.copy().max_flux(source, sink, algorithm)
+    return bench
+
+def _bench_copy(edges, graph, tmp):
+    return graph.copy
+
+def _bench_copy_scenario(changes):
+    def bench(edges, graph, tmp):
+        # a what-if scenario: a copy with the weights of a few edges
+        # changed, whose time should grow with changes only through
+        # the nodes it copies
+        changed = edges[:changes]
+        def run():
+            g = graph.copy()
+            for start, end, weight, *_ in changed:
+                g.set_weight(start, end, weight + 1)
+        return run
+    return bench
+
+def _bench_copy_flatten(edges, graph, tmp):
+    return lambda: graph.copy(flatten=True)
+
+def _bench_write_dot(edges, graph, tmp):
+    return lambda: graph.write_dot(io.StringIO())
+
+BENCHMARKS = {
+    "parse_graph": _bench_parse_graph,
+    "add_connection": _bench_add_connection,
+    "add_edges_from": _bench_add_edges_from,
+    "dijkstra": _bench_dijkstra,
+    "bellman": _bench_bellman,
+    "residual_graph": _bench_residual_graph,
+    "copy": _bench_copy,
+    "copy_scenario_10": _bench_copy_scenario(10),
+    "copy_scenario_100": _bench_copy_scenario(100),
+    "copy_flatten": _bench_copy_flatten,
+    "write_dot": _bench_write_dot,
+}
+for _algorithm in ALGORITHMS:
+    BENCHMARKS["max_flux_" + _algorithm] = _bench_max_flux(_algorithm)
+
+def measure(function:"Callable", repeat:int) -> tuple:
+    """Returns the best time of repeat runs of function and the peak
+       memory allocated by one more run, traced by tracemalloc
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def _slope(points:list) -> float:
+    """Returns the slope of the least squares line through the points
+       in log-log scale, None if there are less than two
+    """
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+def run(sizes:list, generators:list, benchmarks:list, repeat:int=3,
+        seed:int=0, log:"TextIO"=sys.stderr) -> dict:
+    """Runs the benchmarks on every generator at every size
+
+    Returns:
+        The report, ready to be dumped as JSON
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for generator in generators:
+            for size in sizes:
+                edges = GENERATORS[generator](size, seed=seed)
+                graph = _build(edges)
+                nodes = len(graph.node_map)
+                for name in benchmarks:
+                    function = BENCHMARKS[name](edges, graph, tmp)
+                    seconds, peak = measure(function, repeat)
+                    results.append({
+                        "generator": generator,
+                        "size": size,
+                        "nodes": nodes,
+                        "edges": len(edges),
+                        "benchmark": name,
+                        "seconds": seconds,
+                        "edges_per_second": len(edges) / seconds
+                                            if seconds > 0 else None,
+                        "peak_bytes": peak,
+                    })
+                    if log != None:
+                        print("{:>12} {:>8} {:<22} {:10.4f}s {:12d}B".format(
+                              generator, size, name, seconds, peak),
+                              file=log)
+    scaling = {}
+    for name in benchmarks:
+        scaling[name] = {}
+        for generator in generators:
+            curve = [(r["edges"], r["seconds"]) for r in results
+                     if r["benchmark"] == name and r["generator"] == generator]
+            scaling[name][generator] = {"curve": curve,
+                                        "exponent": _slope(curve)}
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+
+def main(argv:list=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of pgraph")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 4000, 16000],
+                        help="number of nodes of the generated graphs")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS),
+                        choices=list(GENERATORS))
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS),
+                        choices=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per benchmark, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output",
+                        help="file of the JSON report, stdout by default")
+    args = parser.parse_args(argv)
+    report = run(args.sizes, args.generators, args.benchmarks, args.repeat,
+                 args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+"""Seeded generators of synthetic graphs
+
+Every generator returns a list of edges (start, end, weight, lbound,
+ubound, flux), as accepted by Graph.add_edges_from, over the integer
+labels 0..n-1; the same arguments always give the same graph. Weights
+are non negative so that every algorithm can run on every graph, and
+every edge has a capacity with no flux, node 0 being the source and
+node n-1 the sink of the flow problems
+"""
+
+import random
+
+def _edge(rng:random.Random, start:int, end:int, max_weight:int,
+          max_capacity:int) -> tuple:
+    return (start, end, rng.randint(0, max_weight), None,
+            rng.randint(1, max_capacity), 0)
+
+def random_graph(nodes:int, degree:int=4, seed:int=0, max_weight:int=100,
+                 max_capacity:int=100) -> list:
+    """Returns a random graph with about degree edges per node
+
+    The nodes are first chained 0 -> 1 -> ... -> n-1 so that all of
+    them are reachable from 0
+    """
+    rng = random.Random(seed)
+    edges = {}
+    for i in range(nodes - 1):
+        edges[i, i+1] = _edge(rng, i, i + 1, max_weight, max_capacity)
+    target = nodes * degree
+    while len(edges) < target and len(edges) < nodes * (nodes - 1):
+        start = rng.randrange(nodes)
+        end = rng.randrange(nodes)
+        if start != end and (start, end) not in edges:
+            edges[start, end] = _edge(rng, start, end, max_weight,
+                                      max_capacity)
+    return list(edges.values())
+
+def grid_graph(nodes:int, seed:int=0, max_weight:int=100,
+               max_capacity:int=100) -> list:
+    """Returns a square grid with about nodes nodes, each one connected
+       to its right and lower neighbours
+    """
+    rng = random.Random(seed)
+    side = max(2, int(nodes ** 0.5))
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            i = row * side + column
+            if column + 1 < side:
+                edges.append(_edge(rng, i, i + 1, max_weight, max_capacity))
+            if row + 1 < side:
+                edges.append(_edge(rng, i, i + side, max_weight,
+                                   max_capacity))
+    return edges
+
+def scale_free(nodes:int, degree:int=3, seed:int=0, max_weight:int=100,
+               max_capacity:int=100) -> list:
+    """Returns a scale free graph grown by preferential attachment
+
+    Each new node is connected from degree existing nodes, chosen with
+    probability proportional to their degree (Barabasi-Albert model)
+    """
+    rng = random.Random(seed)
+    degree = max(1, min(degree, nodes - 1))
+    edges = {}
+    # every edge end appears once, so uniform picks follow the degrees
+    ends = list(range(degree))
+    for i in range(degree, nodes):
+        chosen = set()
+        while len(chosen) < degree:
+            chosen.add(rng.choice(ends))
+        for start in chosen:
+            edges[start, i] = _edge(rng, start, i, max_weight, max_capacity)
+            ends.append(start)
+        ends.extend([i] * degree)
+    return list(edges.values())
+
+def layered_dag(nodes:int, width:int=32, degree:int=4, seed:int=0,
+                max_weight:int=100, max_capacity:int=100) -> list:
+    """Returns a directed acyclic graph of layers of width nodes, each
+       node being connected to degree nodes of the following layer
+    """
+    rng = random.Random(seed)
+    width = max(1, min(width, nodes))
+    edges = {}
+    for i in range(nodes - width):
+        layer_end = (i // width + 2) * width
+        next_layer = range((i // width + 1) * width, min(layer_end, nodes))
+        for end in rng.sample(next_layer, min(degree, len(next_layer))):
+            edges[i, end] = _edge(rng, i, end, max_weight, max_capacity)
+    # connect the source to the first layer and the last one to the sink
+    for i in range(1, width):
+        edges[0, i] = _edge(rng, 0, i, max_weight, max_capacity)
+    for i in range(max(0, nodes - width), nodes - 1):
+        edges[i, nodes-1] = _edge(rng, i, nodes - 1, max_weight,
+                                  max_capacity)
+    return list(edges.values())
+
+def flow_network(nodes:int, width:int=16, degree:int=3, seed:int=0,
+                 max_weight:int=100, max_capacity:int=100) -> list:
+    """Returns a layered flow network from 0 to nodes-1
+
+    Besides the edges between consecutive layers, some edges go back
+    to the previous layer, so that the augmenting paths have to undo
+    part of the flux
+    """
+    edges = layered_dag(nodes, width, degree, seed, max_weight,
+                        max_capacity)
+    rng = random.Random(seed + 1)
+    existing = {(e[0], e[1]) for e in edges}
+    for start, end, *_ in list(edges[:len(edges) // 4]):
+        if start != 0 and end != nodes - 1 and (end, start) not in existing:
+            edges.append(_edge(rng, end, start, max_weight, max_capacity))
+    return edges
+
+GENERATORS = {
+    "random": random_graph,
+    "grid": grid_graph,
+    "scale_free": scale_free,
+    "layered_dag": layered_dag,
+    "flow_network": flow_network,
+}
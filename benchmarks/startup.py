@@ -0,0 +1,130 @@
+#! /usr/bin/env python3
+"""Startup benchmark of the pgraph command line
+
+Times fresh interpreters running the bare interpreter, the import of
+pgraph and a few pgraph invocations on a small graph, and checks that
+importing pgraph doesn't load the modules meant to be imported lazily.
+Writes a JSON report with the best and median time of every command
+and its overhead over the bare interpreter.
+
+Usage:
+    python3 benchmarks/startup.py [--repeat 20] [--max-overhead 0.1]
+                                  [-o report.json]
+
+With --max-overhead the exit status is 1 if a command is slower than
+the bare interpreter by more than that many seconds, or if a lazy
+module is imported eagerly.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+PGRAPH = os.path.join(ROOT, "pgraph")
+DATA = os.path.join(SRC, "test.data")
+FLUX_DATA = os.path.join(SRC, "test2.data")
+
+# modules that "import pgraph" must not load
+LAZY_MODULES = ("re", "subprocess", "concurrent.futures", "multiprocessing",
+                "pgraph._dot", "pgraph._flow", "pgraph._parallel",
+                "pgraph._binary", "pgraph._batch")
+
+_IMPORT = "import sys; sys.path.insert(0, {!r}); import pgraph".format(SRC)
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "import_graph": ["-c", _IMPORT],
+    "pgraph_path": [PGRAPH, "-q", "-a", "dijkstra", DATA],
+    "pgraph_flux": [PGRAPH, "-f", "-s", "1", "-d", "6", FLUX_DATA],
+    "pgraph_batch": [PGRAPH, "-b", "-q", "-j", "1", DATA],
+}
+
+def time_command(args:list, repeat:int) -> list:
+    """Returns the wall time of repeat runs of the interpreter with args
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+def eager_imports() -> list:
+    """Returns the lazy modules loaded by importing pgraph
+    """
+    code = _IMPORT + "; print(' '.join(m for m in {!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c",
+                             code.format(LAZY_MODULES)],
+                            check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+def run(repeat:int=20, log:"TextIO"=sys.stderr) -> dict:
+    """Runs every command of COMMANDS repeat times
+
+    Returns:
+        The report, ready to be dumped as JSON
+    """
+    results = {}
+    for name, args in COMMANDS.items():
+        times = time_command(args, repeat)
+        results[name] = {"best": min(times),
+                         "median": statistics.median(times)}
+    baseline = results["python"]["best"]
+    for name, result in results.items():
+        result["overhead"] = result["best"] - baseline
+        if log != None:
+            print("{:<14} {:8.4f}s {:8.4f}s {:+8.4f}s".format(
+                  name, result["best"], result["median"],
+                  result["overhead"]), file=log)
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "repeat": repeat,
+        },
+        "results": results,
+        "eager_imports": eager_imports(),
+    }
+
+def main(argv:list=None) -> int:
+    parser = argparse.ArgumentParser(description="Startup benchmark of pgraph")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="runs per command, the best one is kept")
+    parser.add_argument("--max-overhead", type=float,
+                        help="fail if a command is slower than the bare "
+                             "interpreter by more than these seconds")
+    parser.add_argument("-o", "--output",
+                        help="file of the JSON report, stdout by default")
+    args = parser.parse_args(argv)
+    report = run(args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.max_overhead != None:
+        slow = [name for name, result in report["results"].items()
+                if result["overhead"] > args.max_overhead]
+        if slow or report["eager_imports"]:
+            print("Too slow: {}; eager imports: {}".format(
+                  ", ".join(slow) or "none",
+                  ", ".join(report["eager_imports"]) or "none"),
+                  file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+#! /usr/bin/env python3
+
+from .graph import Graph, parse_graph, parse_dot, load_binary, main
+from ._csr import FrozenGraph
+from ._errors import NoConnection, NegativeCycle, CyclicGraph
+from ._traversal import STOP
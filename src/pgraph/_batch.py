@@ -0,0 +1,152 @@
+#! /usr/bin/env python3
+
+from types import GeneratorType
+import itertools
+import json
+import os
+import sys
+
+from .graph import parse_graph, parse_dot
+from ._flow import ALGORITHMS as FLUX_ALGORITHMS
+
+PATH_ALGORITHMS = ("dijkstra", "bellman")
+
+# file extensions picked from directories, with the parser of each one
+LOADERS = {
+    ".data": parse_graph,
+    ".gv": parse_dot,
+    ".dot": parse_dot,
+}
+
+def graph_files(paths:list) -> GeneratorType:
+    """Returns an iterator of the graph files among paths
+
+    Files are produced as they are, directories are searched
+    recursively for the files with an extension in LOADERS, in sorted
+    order
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if os.path.splitext(name)[1] in LOADERS:
+                    yield os.path.join(root, name)
+
+def _load(path:str) -> "Graph":
+    return LOADERS.get(os.path.splitext(path)[1], parse_graph)(path)
+
+def _labelled(mapping:dict) -> dict:
+    # JSON keys must be strings, labels are often ints
+    return {str(label): value for label, value in mapping.items()}
+
+def process_file(path:str, mode:str="path", algorithms:tuple=PATH_ALGORITHMS,
+                 source:"Hashable"=1, dest:"Hashable"=None) -> dict:
+    """Runs the algorithms on the graph of the file path
+
+    The visits and the flux are computed on the snapshot of the graph
+    (see Graph.freeze), which is cheaper than building the graph of
+    each visit
+
+    Args:
+        mode:       Either "path", to run the shortest path algorithms
+                    from source, or "flux", to compute the maximum flux
+                    from source to dest
+        algorithms: The algorithms to be run: some of PATH_ALGORITHMS
+                    in "path" mode, some of the flux engines in "flux"
+                    mode
+
+    Returns:
+        The result, ready to be dumped as JSON: the file, the size of
+        the graph and, in "path" mode, the distance and parent of each
+        node reached for each algorithm, in "flux" mode the value of
+        the maximum flux. Failures don't raise, but are reported as
+        the "error" of the result
+    """
+    result = {"file": path}
+    try:
+        frozen = _load(path).freeze()
+        result["nodes"] = frozen.node_count()
+        result["edges"] = frozen.edge_count()
+        result["source"] = source
+        if mode == "flux":
+            if dest == None:
+                raise ValueError("Dest not specified")
+            result["dest"] = dest
+            for algorithm in algorithms:
+                result[algorithm] = frozen.max_flux(source, dest,
+                                                    algorithm)[0]
+        else:
+            for algorithm in algorithms:
+                if algorithm == "dijkstra":
+                    distance, father = frozen.dijkstra(source)
+                elif algorithm == "bellman":
+                    distance, father = frozen.bellman(source)
+                else:
+                    raise ValueError("Unknown algorithm {}".format(
+                                     algorithm))
+                result[algorithm] = {"distance": _labelled(distance),
+                                     "parent": _labelled(father)}
+    except Exception as e:
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+    return result
+
+def run_batch(paths:list, output:"TextIO"=None, mode:str="path",
+              algorithms:tuple=PATH_ALGORITHMS, source:"Hashable"=1,
+              dest:"Hashable"=None, workers:int=None,
+              chunksize:int=None) -> int:
+    """Processes the graph files among paths, writing a JSON line with
+       the result of each one to output
+
+    Results are written in the order of the files; see graph_files and
+    process_file
+
+    Args:
+        output:     Optional. A text stream, stdout by default
+        workers:    Number of worker processes, by default one per CPU;
+                    with 1 the files are processed in the calling
+                    process
+        chunksize:  Number of files handed to a worker at a time
+
+    Returns:
+        The number of files that failed
+
+    Raises:
+        ValueError: mode or an algorithm isn't known
+    """
+    known = {"path": PATH_ALGORITHMS, "flux": FLUX_ALGORITHMS}
+    if mode not in known:
+        raise ValueError("Unknown mode {}".format(mode))
+    for algorithm in algorithms:
+        if algorithm not in known[mode]:
+            raise ValueError("Unknown algorithm {}".format(algorithm))
+    if output == None:
+        output = sys.stdout
+    files = list(graph_files(paths))
+    if workers == None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(files))
+    failed = 0
+    args = (mode, algorithms, source, dest)
+    if workers <= 1:
+        results = (process_file(f, *args) for f in files)
+        executor = None
+    else:
+        if chunksize == None:
+            chunksize = max(1, len(files) // (workers * 4))
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers)
+        results = executor.map(process_file, files,
+                               *(itertools.repeat(a) for a in args),
+                               chunksize=chunksize)
+    try:
+        for result in results:
+            if "error" in result:
+                failed += 1
+            output.write(json.dumps(result, default=str) + "\n")
+    finally:
+        if executor != None:
+            executor.shutdown(cancel_futures=True)
+    return failed
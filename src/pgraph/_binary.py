@@ -0,0 +1,114 @@
+#! /usr/bin/env python3
+
+import mmap
+import struct
+
+from ._csr import FrozenGraph
+
+MAGIC = b"PGRAPHB\0"
+FORMAT_VERSION = 2
+BYTE_ORDER = 0x01020304
+
+# magic, format version, byte order mark, node count, size of the
+# label table
+_HEADER = struct.Struct("=8sIIQQ")
+_INT = struct.Struct("=q")
+_FLOAT = struct.Struct("=d")
+_LENGTH = struct.Struct("=I")
+
+def _pack_object(obj:object, out:list) -> None:
+    """Appends the encoding of a label or node value to out
+    """
+    if obj == None:
+        out.append(b"n")
+    elif type(obj) is int and -2**63 <= obj < 2**63:
+        out.append(b"i" + _INT.pack(obj))
+    elif type(obj) is float:
+        out.append(b"f" + _FLOAT.pack(obj))
+    elif type(obj) is str:
+        data = obj.encode("utf-8")
+        out.append(b"s" + _LENGTH.pack(len(data)) + data)
+    else:
+        raise TypeError("Can't store {!r} in a binary graph".format(obj))
+
+def _unpack_object(buffer:"Buffer", position:int) -> tuple:
+    """Decodes the object at position, returning it with the position
+       following it
+    """
+    kind = buffer[position]
+    position += 1
+    if kind == ord("n"):
+        return None, position
+    elif kind == ord("i"):
+        return _INT.unpack_from(buffer, position)[0], position + _INT.size
+    elif kind == ord("f"):
+        return _FLOAT.unpack_from(buffer, position)[0], position + _FLOAT.size
+    elif kind == ord("s"):
+        length = _LENGTH.unpack_from(buffer, position)[0]
+        position += _LENGTH.size
+        data = bytes(buffer[position:position+length])
+        return data.decode("utf-8"), position + length
+    raise ValueError("Corrupted label table")
+
+def write_binary(frozen:"FrozenGraph", path:str) -> None:
+    """Writes the snapshot to the file path
+
+    The file holds a header, the table of the labels and node values,
+    then the arrays of the snapshot as laid out by write_into, aligned
+    to 8 bytes so that they can be mapped back without copies
+
+    Raises:
+        TypeError:  a label or value isn't None, int, float or str, or
+                    an edge attribute is an integer too large for the
+                    float column holding it
+    """
+    if not frozen.exact:
+        raise TypeError("Can't store edge attributes too large for a float "
+                        "in a binary graph")
+    table = []
+    for label, value in zip(frozen.labels, frozen.values):
+        _pack_object(label, table)
+        _pack_object(value, table)
+    table = b"".join(table)
+    table += b"\0" * (-(_HEADER.size + len(table)) % 8)
+    arrays = bytearray(frozen.nbytes())
+    frozen.write_into(arrays)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER,
+                             len(frozen.labels), len(table)))
+        f.write(table)
+        f.write(arrays)
+
+def read_binary(path:str) -> "FrozenGraph":
+    """Maps the file path, written by write_binary, as a snapshot
+
+    The arrays of the snapshot are views over the mapped file, which
+    stays mapped as long as the snapshot is alive; processes mapping
+    the same file share its pages
+
+    Raises:
+        FileNotFoundError:  no file called path was found
+        ValueError:         path isn't a binary graph written on a
+                            machine with the same byte order
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise ValueError("{} is not a binary graph".format(path))
+    magic, version, byte_order, n, table_size = _HEADER.unpack_from(mapped)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("{} is not a binary graph".format(path))
+    if byte_order != BYTE_ORDER:
+        raise ValueError("{} was written with a different byte "
+                         "order".format(path))
+    view = memoryview(mapped)
+    arrays = view[_HEADER.size+table_size:]
+    labels = []
+    values = []
+    position = _HEADER.size
+    for _ in range(n):
+        label, position = _unpack_object(view, position)
+        value, position = _unpack_object(view, position)
+        labels.append(label)
+        values.append(value)
+    return FrozenGraph.from_buffer(arrays, tuple(labels), tuple(values))
@@ -0,0 +1,77 @@
+#! /usr/bin/env python3
+
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+class LRUCache():
+    """Least recently used cache
+
+    Holds at most maxsize entries, dropping the least recently used one
+    when full; with maxsize 0 nothing is stored
+    """
+
+    def __init__(self, maxsize:int=128) -> None:
+        """constructor
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key:"Hashable", default:object=None,
+                  validate:"Callable"=None) -> object:
+        """Returns the value stored for key, default if there is none
+
+        Args:
+            validate:   Optional. A function telling whether the value
+                        stored is still usable; if it isn't, the entry
+                        is dropped and default returned
+        """
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if validate != None and not validate(value):
+            del(self.entries[key])
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key:"Hashable", value:object) -> None:
+        """Stores value for key
+        """
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def resize(self, maxsize:int) -> None:
+        """Changes the maximum number of entries
+        """
+        self.maxsize = maxsize
+        while len(self.entries) > max(maxsize, 0):
+            self.entries.popitem(last=False)
+
+    def purge(self) -> None:
+        """Drops every entry, keeping the statistics
+        """
+        self.entries.clear()
+
+    def clear(self) -> None:
+        """Drops every entry and resets the statistics
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> "CacheInfo":
+        """Returns the statistics of the cache
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self.entries))
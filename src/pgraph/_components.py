@@ -0,0 +1,121 @@
+#! /usr/bin/env python3
+
+# The functions work on the compressed sparse row arrays of a snapshot:
+# the arcs leaving node i are targets[offsets[i]:offsets[i+1]]
+
+def strong_components(offsets:"Sequence", targets:"Sequence") -> tuple:
+    """Finds the strongly connected components with Tarjan's algorithm
+
+    The depth first visit keeps its own stack of (node, next arc), so
+    the depth of the graph isn't bound by the recursion limit; the time
+    is linear in the size of the graph
+
+    Returns:
+        A tuple (count, component), where component[i] is the id of
+        the component of node i. Ids are in topological order: every
+        arc goes from a component to itself or to one with higher id
+    """
+    n = len(offsets) - 1
+    order = [-1] * n
+    low = [0] * n
+    component = [-1] * n
+    stack = []
+    count = 0
+    visited = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = visited
+        visited += 1
+        stack.append(root)
+        calls = [(root, offsets[root])]
+        while calls:
+            node, arc = calls[-1]
+            end = offsets[node+1]
+            while arc < end:
+                target = targets[arc]
+                arc += 1
+                if order[target] < 0:
+                    break
+                # visited but without component: still on the stack
+                if component[target] < 0 and order[target] < low[node]:
+                    low[node] = order[target]
+            else:
+                calls.pop()
+                if low[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        component[member] = count
+                        if member == node:
+                            break
+                    count += 1
+                if calls:
+                    parent = calls[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                continue
+            calls[-1] = (node, arc)
+            order[target] = low[target] = visited
+            visited += 1
+            stack.append(target)
+            calls.append((target, offsets[target]))
+    # Tarjan's algorithm closes the components in reverse topological
+    # order
+    last = count - 1
+    return count, [last - c for c in component]
+
+def connected_components(offsets:"Sequence", targets:"Sequence") -> tuple:
+    """Finds the connected components, ignoring the direction of arcs,
+       with a union-find forest (union by size, path halving)
+
+    Returns:
+        A tuple (count, component), where component[i] is the id of
+        the component of node i; ids follow the first node of each
+        component
+    """
+    n = len(offsets) - 1
+    parent = list(range(n))
+    size = [1] * n
+    for node in range(n):
+        for arc in range(offsets[node], offsets[node+1]):
+            a = node
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            b = targets[arc]
+            while parent[b] != b:
+                parent[b] = b = parent[parent[b]]
+            if a == b:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+    ids = {}
+    component = [0] * n
+    for node in range(n):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        component[node] = ids.setdefault(root, len(ids))
+    return len(ids), component
+
+def group(labels:"Sequence", count:int, component:list) -> list:
+    """Returns the list of the labels of each component
+    """
+    groups = [[] for _ in range(count)]
+    for label, c in zip(labels, component):
+        groups[c].append(label)
+    return groups
+
+def condensation_arcs(offsets:"Sequence", targets:"Sequence",
+                      component:list) -> list:
+    """Returns the pairs of distinct components joined by an arc, each
+       pair once, in the order of the arcs
+    """
+    arcs = {}
+    for node, c in enumerate(component):
+        for arc in range(offsets[node], offsets[node+1]):
+            d = component[targets[arc]]
+            if c != d:
+                arcs[c, d] = None
+    return list(arcs)
@@ -0,0 +1,624 @@
+#! /usr/bin/env python3
+
+from array import array
+from collections import deque
+from types import GeneratorType
+import heapq
+import itertools
+import struct
+
+from ._errors import NegativeCycle, CyclicGraph
+from ._components import strong_components, connected_components, group
+from ._mst import ALGORITHMS as MST_ALGORITHMS, arc_sources
+from ._dag import topological_sort, find_cycle, dag_paths
+
+WEIGHT = 1
+LBOUND = 2
+UBOUND = 4
+FLUX = 8
+# the flags of the attributes that are integers are set in present
+# shifted left by INT_SHIFT, as float columns hold them as floats
+INT_SHIFT = 4
+
+# node count, arc count, typecodes of the attribute columns, directed
+_HEADER = struct.Struct("=qq4sB3x")
+
+def _column(values:list) -> memoryview:
+    """Packs values in a read-only array, using integers when possible
+    """
+    try:
+        if all(type(v) is int for v in values):
+            return memoryview(array("q", values)).toreadonly()
+    except OverflowError:
+        pass
+    return memoryview(array("d", values)).toreadonly()
+
+class FrozenGraph():
+    """Immutable compressed sparse row snapshot of a Graph
+
+    Nodes are identified by the integers 0..n-1, in the order given
+    by labels; the arcs leaving node i are the ones from offsets[i]
+    to offsets[i+1] (excluded) in targets and in the attribute
+    columns weight, lbound, ubound and flux. Missing attributes are
+    stored as the value the algorithms assume for them (0 for weight,
+    lbound and flux, infinity for ubound), and flagged in present,
+    which also flags the integers (see INT_SHIFT) so that they are
+    given back as int by the float columns. exact is False when some
+    of these integers were too large for a float to hold them
+    """
+
+    def __init__(self, labels:tuple, values:tuple, offsets:memoryview,
+                       targets:memoryview, weight:memoryview,
+                       lbound:memoryview, ubound:memoryview,
+                       flux:memoryview, present:memoryview,
+                       directed:bool=True, exact:bool=True) -> None:
+        """constructor
+        """
+        self.labels = labels
+        self.values = values
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weight = weight
+        self.lbound = lbound
+        self.ubound = ubound
+        self.flux = flux
+        self.present = present
+        self.directed = directed
+        self.exact = exact
+        self._reverse = None
+        # computed by _topological_order on first use
+        self._order = None
+
+    @classmethod
+    def from_graph(cls, graph:"Graph") -> "FrozenGraph":
+        """Builds the snapshot of graph
+        """
+        labels = tuple(graph.node_map.keys())
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = [0]
+        targets = []
+        weight = []
+        lbound = []
+        ubound = []
+        flux = []
+        present = []
+        # the attributes with integers a float can't hold
+        large = 0
+        for label in labels:
+            # undirected edges are held by the connections of both ends
+            for end_label, edge in graph.node_map[label].connections.items():
+                targets.append(index[end_label])
+                flags = 0
+                for flag, value in ((WEIGHT, edge.weight),
+                                    (LBOUND, edge.lbound),
+                                    (UBOUND, edge.ubound),
+                                    (FLUX, edge.flux)):
+                    if value == None:
+                        continue
+                    flags |= flag
+                    if type(value) is int:
+                        flags |= flag << INT_SHIFT
+                        if not -2**53 <= value <= 2**53 and\
+                           float(value) != value:
+                            large |= flag
+                weight.append(edge.weight if edge.weight != None else 0)
+                lbound.append(edge.lbound if edge.lbound != None else 0)
+                ubound.append(edge.ubound if edge.ubound != None
+                                          else float("inf"))
+                flux.append(edge.flux if edge.flux != None else 0)
+                present.append(flags)
+            offsets.append(len(targets))
+        columns = [_column(weight), _column(lbound), _column(ubound),
+                   _column(flux)]
+        exact = not any(large & flag and column.format == "d" for flag, column
+                        in zip((WEIGHT, LBOUND, UBOUND, FLUX), columns))
+        return cls(labels,
+                   tuple(graph.node_map[l].value for l in labels),
+                   memoryview(array("q", offsets)).toreadonly(),
+                   memoryview(array("q", targets)).toreadonly(),
+                   *columns,
+                   memoryview(array("B", present)).toreadonly(),
+                   graph.directed, exact)
+
+    @classmethod
+    def from_buffer(cls, buffer:"Buffer", labels:"Sequence"=None,
+                         values:"Sequence"=None) -> "FrozenGraph":
+        """Builds a snapshot over the arrays laid out in buffer by write_into
+
+        The arrays aren't copied, so buffer must stay alive as long
+        as the snapshot; when labels are not given the nodes are
+        labelled with their ids
+
+        Raises:
+            ValueError: buffer doesn't contain a valid snapshot
+        """
+        view = memoryview(buffer).cast("B")
+        n, m, typecodes, directed = _HEADER.unpack_from(view)
+        position = _HEADER.size
+        def take(typecode, length):
+            nonlocal position
+            size = array(typecode).itemsize * length
+            if position + size > len(view):
+                raise ValueError("Truncated graph buffer")
+            column = view[position:position+size].cast(typecode)
+            position += size
+            return column.toreadonly()
+        offsets = take("q", n + 1)
+        targets = take("q", m)
+        columns = [take(chr(t), m) for t in typecodes]
+        present = take("B", m)
+        if labels == None:
+            labels = range(n)
+        if values == None:
+            values = (None,) * n
+        return cls(labels, values, offsets, targets, *columns, present,
+                   bool(directed))
+
+    def nbytes(self) -> int:
+        """Returns the size of the buffer needed by write_into
+        """
+        return _HEADER.size + sum(c.nbytes for c in self._columns())
+
+    def _columns(self) -> list:
+        return [self.offsets, self.targets, self.weight, self.lbound,
+                self.ubound, self.flux, self.present]
+
+    def write_into(self, buffer:"Buffer") -> None:
+        """Lays out the arrays of the snapshot in buffer
+
+        Labels and values aren't included; buffer must be writable
+        and at least nbytes() long
+        """
+        view = memoryview(buffer).cast("B")
+        typecodes = "".join(c.format for c in (self.weight, self.lbound,
+                                               self.ubound, self.flux))
+        _HEADER.pack_into(view, 0, len(self.labels), len(self.targets),
+                          typecodes.encode("ascii"), self.directed)
+        position = _HEADER.size
+        for column in self._columns():
+            view[position:position+column.nbytes] = column.cast("B")
+            position += column.nbytes
+
+    def node_count(self) -> int:
+        """Returns the number of nodes
+        """
+        return len(self.labels)
+
+    def edge_count(self) -> int:
+        """Returns the number of arcs stored in the snapshot
+
+        Undirected edges are stored once per endpoint
+        """
+        return len(self.targets)
+
+    def forward_star(self, label:"Hashable") -> GeneratorType:
+        """Returns an iterator of the nodes reachable from label
+
+        Raises:
+            KeyError:   label wasn't found in the graph
+        """
+        i = self.index[label]
+        for arc in range(self.offsets[i], self.offsets[i+1]):
+            yield self.labels[self.targets[arc]]
+
+    def reverse(self) -> tuple:
+        """Returns the reverse adjacency as (offsets, arcs)
+
+        The arcs entering node i are arcs[offsets[i]:offsets[i+1]],
+        given as indexes in targets; the start node of an arc is found
+        with arc_source. Computed on first use, then cached
+        """
+        if self._reverse == None:
+            n = len(self.labels)
+            offsets = [0] * (n + 1)
+            for t in self.targets:
+                offsets[t+1] += 1
+            for i in range(n):
+                offsets[i+1] += offsets[i]
+            position = offsets[:-1]
+            arcs = [0] * len(self.targets)
+            sources = [0] * len(self.targets)
+            for i in range(n):
+                for arc in range(self.offsets[i], self.offsets[i+1]):
+                    t = self.targets[arc]
+                    arcs[position[t]] = arc
+                    sources[arc] = i
+                    position[t] += 1
+            self._reverse = (memoryview(array("q", offsets)).toreadonly(),
+                             memoryview(array("q", arcs)).toreadonly(),
+                             memoryview(array("q", sources)).toreadonly())
+        return self._reverse[:2]
+
+    def arc_source(self, arc:int) -> int:
+        """Returns the id of the node the arc starts from
+        """
+        self.reverse()
+        return self._reverse[2][arc]
+
+    def _dijkstra(self, source:int) -> tuple:
+        offsets = self.offsets
+        targets = self.targets
+        weight = self.weight
+        distance = [float("inf")] * len(self.labels)
+        father = [-1] * len(self.labels)
+        length = [0] * len(self.labels)
+        cycle_check = len(self.labels)
+        distance[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > distance[node]:
+                continue
+            for arc in range(offsets[node], offsets[node+1]):
+                neighbour = targets[arc]
+                nd = d + weight[arc]
+                if nd < distance[neighbour]:
+                    distance[neighbour] = nd
+                    father[neighbour] = node
+                    length[neighbour] = length[node] + 1
+                    if length[neighbour] >= cycle_check:
+                        cycle_check = self._check_cycle(father, neighbour,
+                                                        cycle_check)
+                    heapq.heappush(heap, (nd, neighbour))
+        return distance, father
+
+    def _bellman(self, source:int) -> tuple:
+        offsets = self.offsets
+        targets = self.targets
+        weight = self.weight
+        distance = [float("inf")] * len(self.labels)
+        father = [-1] * len(self.labels)
+        queued = bytearray(len(self.labels))
+        length = [0] * len(self.labels)
+        cycle_check = len(self.labels)
+        distance[source] = 0
+        queue = deque([source])
+        queued[source] = 1
+        while queue:
+            node = queue.popleft()
+            queued[node] = 0
+            d = distance[node]
+            for arc in range(offsets[node], offsets[node+1]):
+                neighbour = targets[arc]
+                nd = d + weight[arc]
+                if nd < distance[neighbour]:
+                    distance[neighbour] = nd
+                    father[neighbour] = node
+                    length[neighbour] = length[node] + 1
+                    if length[neighbour] >= cycle_check:
+                        cycle_check = self._check_cycle(father, neighbour,
+                                                        cycle_check)
+                    if not queued[neighbour]:
+                        queued[neighbour] = 1
+                        queue.append(neighbour)
+        return distance, father
+
+    def _check_cycle(self, father:list, start:int, cycle_check:int) -> int:
+        """Raises NegativeCycle if the father list contains a cycle
+
+        Returns the next path length at which to check again
+        """
+        state = [-1] * len(father)
+        for origin in itertools.chain([start], range(len(father))):
+            node = origin
+            path = []
+            while node >= 0 and state[node] < 0:
+                state[node] = origin
+                path.append(node)
+                node = father[node]
+            if node >= 0 and state[node] == origin:
+                cycle = path[path.index(node):]
+                raise NegativeCycle([self.labels[i] for i in cycle[::-1]])
+        return cycle_check * 2
+
+    def _to_labels(self, distance:list, father:list) -> tuple:
+        labels = self.labels
+        distance_map = {}
+        father_map = {}
+        for i, d in enumerate(distance):
+            if d != float("inf"):
+                distance_map[labels[i]] = d
+                father_map[labels[i]] = labels[father[i]]\
+                                        if father[i] >= 0 else None
+        return distance_map, father_map
+
+    def dijkstra(self, start_label:"Hashable") -> tuple:
+        """Returns the (distance, father) maps of the visit from start_label
+
+        Only the reached nodes appear in the maps; Dijkstra's algorithm
+        is used for the visit
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NegativeCycle:  a negative cycle is reachable from start_label
+        """
+        return self._to_labels(*self._dijkstra(self.index[start_label]))
+
+    def bellman(self, start_label:"Hashable") -> tuple:
+        """Returns the (distance, father) maps of the visit from start_label
+
+        Only the reached nodes appear in the maps; Bellman's algorithm
+        is used for the visit
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NegativeCycle:  a negative cycle is reachable from start_label
+        """
+        return self._to_labels(*self._bellman(self.index[start_label]))
+
+    def bfs(self, start_label:"Hashable") -> GeneratorType:
+        """Returns an iterator of the nodes reachable from start_label,
+           in breadth first order
+
+        Raises:
+            KeyError:   start_label wasn't found in the graph
+        """
+        offsets = self.offsets
+        targets = self.targets
+        source = self.index[start_label]
+        seen = bytearray(len(self.labels))
+        seen[source] = 1
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            yield self.labels[node]
+            for arc in range(offsets[node], offsets[node+1]):
+                neighbour = targets[arc]
+                if not seen[neighbour]:
+                    seen[neighbour] = 1
+                    queue.append(neighbour)
+
+    def _arc_lists(self) -> tuple:
+        # lists are indexed about three times faster than memoryviews,
+        # which pays off for the visits making several passes
+        return self.offsets.tolist(), self.targets.tolist()
+
+    def _strong_components(self) -> tuple:
+        """Returns (count, component) as given by strong_components
+
+        Raises:
+            ValueError: the snapshot isn't of a directed graph
+        """
+        if not self.directed:
+            raise ValueError("Strongly connected components need a "
+                             "directed graph")
+        return strong_components(*self._arc_lists())
+
+    def strongly_connected_components(self) -> list:
+        """Returns the list of the strongly connected components, each
+           one a list of labels, in topological order
+
+        Raises:
+            ValueError: the snapshot isn't of a directed graph
+        """
+        return group(self.labels, *self._strong_components())
+
+    def connected_components(self) -> list:
+        """Returns the list of the connected components, each one a list
+           of labels; the direction of the arcs is ignored
+        """
+        return group(self.labels, *connected_components(*self._arc_lists()))
+
+    def _topological_order(self) -> list:
+        """Returns the ids of the nodes in topological order, computed
+           on first use then cached
+
+        Raises:
+            ValueError:     the snapshot isn't of a directed graph
+            CyclicGraph:    the graph has a cycle
+        """
+        if not self.directed:
+            raise ValueError("Topological orders need a directed graph")
+        if self._order == None:
+            self._order = topological_sort(*self._arc_lists())
+        if len(self._order) < len(self.labels):
+            cycle = find_cycle(*self._arc_lists(), self._order)
+            raise CyclicGraph([self.labels[i] for i in cycle])
+        return self._order
+
+    def is_dag(self) -> bool:
+        """Returns True iff the snapshot is of a directed acyclic graph
+        """
+        if not self.directed:
+            return False
+        if self._order == None:
+            self._order = topological_sort(*self._arc_lists())
+        return len(self._order) == len(self.labels)
+
+    def topological_order(self) -> list:
+        """Returns the labels sorted so that every arc goes from a node
+           to a following one
+
+        Raises:
+            ValueError:     the snapshot isn't of a directed graph
+            CyclicGraph:    the graph has a cycle
+        """
+        labels = self.labels
+        return [labels[i] for i in self._topological_order()]
+
+    def _dag_paths(self, start_label:"Hashable", longest:bool) -> tuple:
+        order = self._topological_order()
+        offsets, targets = self._arc_lists()
+        return self._to_labels(*dag_paths(offsets, targets,
+                                          self.weight.tolist(), order,
+                                          self.index[start_label], longest))
+
+    def dag_shortest_path(self, start_label:"Hashable") -> tuple:
+        """Returns the (distance, father) maps of the shortest paths from
+           start_label, as dijkstra does
+
+        The arcs are relaxed once each, in topological order, so the
+        time is linear and negative weights are allowed
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            ValueError:     the snapshot isn't of a directed graph
+            CyclicGraph:    the graph has a cycle
+        """
+        return self._dag_paths(start_label, False)
+
+    def dag_longest_path(self, start_label:"Hashable") -> tuple:
+        """Returns the (distance, father) maps of the longest paths from
+           start_label, see dag_shortest_path
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            ValueError:     the snapshot isn't of a directed graph
+            CyclicGraph:    the graph has a cycle
+        """
+        return self._dag_paths(start_label, True)
+
+    def minimum_spanning_tree(self, algorithm:str="kruskal") -> list:
+        """Returns the edges of a minimum spanning forest, as tuples
+           (start, end, weight)
+
+        Missing weights count as 0
+
+        Args:
+            algorithm:  One of "kruskal", "prim" and "boruvka"
+
+        Raises:
+            ValueError: algorithm isn't known or the snapshot is of a
+                        directed graph
+        """
+        try:
+            engine = MST_ALGORITHMS[algorithm]
+        except KeyError:
+            raise ValueError("Unknown algorithm {}".format(algorithm))
+        if self.directed:
+            raise ValueError("Spanning trees need an undirected graph")
+        offsets, targets = self._arc_lists()
+        sources = arc_sources(offsets)
+        weight = self.weight.tolist()
+        forest = engine(offsets, sources, targets, weight)
+        labels = self.labels
+        present = self.present
+        integer = WEIGHT << INT_SHIFT
+        # missing weights count as the integer 0
+        return [(labels[sources[arc]], labels[targets[arc]],
+                 int(weight[arc]) if present[arc] & (WEIGHT | integer) !=
+                 WEIGHT else weight[arc]) for arc in forest]
+
+    def max_flux(self, start_label:"Hashable", end_label:"Hashable",
+                       algorithm:str="dinic", tracer:"Tracer"=None) -> tuple:
+        """Computes a maximum flux from start_label to end_label
+
+        The current flux is used as the starting point; the snapshot
+        is left untouched.
+
+        Args:
+            algorithm:  The max flux engine, one of "dinic",
+                        "push_relabel" and "edmonds_karp"
+            tracer:     Optional. A Tracer receiving the events of the
+                        engine, see max_flow
+
+        Returns:
+            A tuple (value, flux), where value is the total flux leaving
+            start_label and flux is a list with the flux of each arc,
+            parallel to targets
+
+        Raises:
+            KeyError:   either start_label or end_label weren't found
+                        in the graph
+            ValueError: algorithm isn't known, the graph isn't directed
+                        or the flux is unbounded
+        """
+        from ._flow import max_flow
+        return max_flow(self, self.index[start_label],
+                        self.index[end_label], algorithm, tracer)
+
+    def min_cost_flow(self, supplies:dict) -> tuple:
+        """Computes a minimum cost flux meeting the supplies
+
+        Weights are the costs per unit of flux, lbound and ubound the
+        bounds of the flux of each arc; the current flux is ignored.
+
+        Args:
+            supplies:   The supply of each node, positive for sources
+                        and negative for sinks; missing nodes have 0
+
+        Returns:
+            A tuple (cost, flux), where flux is a list with the flux of
+            each arc, parallel to targets
+
+        Raises:
+            KeyError:   a node of supplies wasn't found in the graph
+            ValueError: the supplies don't balance or can't be met, the
+                        bounds are inconsistent, there is a cycle of
+                        negative cost without ubound on any edge or the
+                        graph isn't directed
+        """
+        supply = [0] * len(self.labels)
+        for label, amount in supplies.items():
+            supply[self.index[label]] = amount
+        from ._flow import min_cost_flow
+        return min_cost_flow(self, supply)
+
+    def thaw(self) -> "Graph":
+        """Builds a mutable Graph equal to the snapshot
+        """
+        from .graph import Graph
+        g = Graph(self.directed)
+        g.add_nodes_from(dict(zip(self.labels, self.values)))
+        g.add_edges_from(self._edges())
+        return g
+
+    def _dot_nodes(self) -> GeneratorType:
+        """Returns an iterator of the (label, value) of the nodes needing
+           a node statement: the ones with a value and the isolated ones,
+           with no arc leaving or reaching them
+        """
+        offsets = self.offsets
+        linked = bytearray(len(self.labels))
+        for target in self.targets:
+            linked[target] = 1
+        for i, (label, value) in enumerate(zip(self.labels, self.values)):
+            if value != None or\
+               not (linked[i] or offsets[i] != offsets[i+1]):
+                yield label, value
+
+    def _edges(self) -> GeneratorType:
+        """Returns an iterator of the arcs as tuples (start, end, weight,
+           lbound, ubound, flux), missing attributes being None
+
+        Undirected edges are produced once, from their end coming
+        first in the snapshot
+        """
+        labels = self.labels
+        offsets = self.offsets
+        targets = self.targets
+        present = self.present
+        weight = self.weight
+        lbound = self.lbound
+        ubound = self.ubound
+        flux = self.flux
+        def convert(column, flag):
+            if column.format == "q":
+                return column.__getitem__
+            integer = flag << INT_SHIFT
+            return lambda arc: int(column[arc]) if present[arc] & integer\
+                               else column[arc]
+        weight = convert(weight, WEIGHT)
+        lbound = convert(lbound, LBOUND)
+        ubound = convert(ubound, UBOUND)
+        flux = convert(flux, FLUX)
+        directed = self.directed
+        for i in range(len(labels)):
+            start = labels[i]
+            loop = False
+            for arc in range(offsets[i], offsets[i+1]):
+                j = targets[arc]
+                if not directed:
+                    if j == i:
+                        if loop:
+                            continue
+                        loop = True
+                    elif j < i:
+                        continue
+                flags = present[arc]
+                yield (start, labels[j],
+                       weight(arc) if flags & WEIGHT else None,
+                       lbound(arc) if flags & LBOUND else None,
+                       ubound(arc) if flags & UBOUND else None,
+                       flux(arc) if flags & FLUX else None)
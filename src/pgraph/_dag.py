@@ -0,0 +1,83 @@
+#! /usr/bin/env python3
+
+# The functions work on the compressed sparse row arrays of the snapshot
+# of a directed graph: the arcs leaving node i are
+# targets[offsets[i]:offsets[i+1]]
+
+def topological_sort(offsets:"Sequence", targets:"Sequence") -> list:
+    """Sorts the nodes with Kahn's algorithm, in O(V+E) time
+
+    Returns:
+        The list of the nodes in topological order. If the graph has a
+        cycle the nodes on it, and the ones reachable from it, are
+        left out
+    """
+    n = len(offsets) - 1
+    indegree = [0] * n
+    for target in targets:
+        indegree[target] += 1
+    order = [node for node in range(n) if indegree[node] == 0]
+    # order grows while it is scanned, acting as the queue
+    for node in order:
+        for arc in range(offsets[node], offsets[node+1]):
+            target = targets[arc]
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                order.append(target)
+    return order
+
+def find_cycle(offsets:"Sequence", targets:"Sequence", order:list) -> list:
+    """Returns a cycle among the nodes left out of order by
+       topological_sort, each node being connected to the following
+       one and the last one to the first
+    """
+    n = len(offsets) - 1
+    left = bytearray(b"\1") * n
+    for node in order:
+        left[node] = 0
+    # every node left out has a predecessor left out too
+    father = [-1] * n
+    for node in range(n):
+        if left[node]:
+            for arc in range(offsets[node], offsets[node+1]):
+                if left[targets[arc]]:
+                    father[targets[arc]] = node
+    node = left.index(1)
+    position = {}
+    path = []
+    while node not in position:
+        position[node] = len(path)
+        path.append(node)
+        node = father[node]
+    return path[position[node]:][::-1]
+
+def dag_paths(offsets:"Sequence", targets:"Sequence", weight:"Sequence",
+              order:list, source:int, longest:bool=False) -> tuple:
+    """Finds the shortest (or longest) paths from source, relaxing the
+       arcs of each node once in topological order, in O(V+E) time
+
+    Negative weights are allowed, since the graph has no cycles
+
+    Returns:
+        A tuple (distance, father) of lists; unreached nodes have
+        distance infinity and father -1, as the source
+    """
+    n = len(offsets) - 1
+    # longest paths are the shortest ones with the weights negated
+    sign = -1 if longest else 1
+    distance = [float("inf")] * n
+    father = [-1] * n
+    distance[source] = 0
+    for node in order:
+        d = distance[node]
+        if d == float("inf"):
+            continue
+        for arc in range(offsets[node], offsets[node+1]):
+            target = targets[arc]
+            nd = d + sign * weight[arc]
+            if nd < distance[target]:
+                distance[target] = nd
+                father[target] = node
+    if longest:
+        distance = [-d if d != float("inf") else d for d in distance]
+    return distance, father
@@ -0,0 +1,403 @@
+#! /usr/bin/env python3
+
+from decimal import Decimal
+from types import GeneratorType
+import io
+import math
+import re
+
+_ID = r'"(?:[^"\\]|\\.)*"|-?(?:\.\d+|\d+(?:\.\d*)?)|[^\W\d]\w*'
+_TOKENS = r"""
+    | (?P<quoted>"(?:[^"\\]|\\.)*")
+    | (?P<edgeop>->|--)
+    | (?P<numeral>-?(?:\.\d+|\d+(?:\.\d*)?))
+    | (?P<name>[^\W\d]\w*)
+    | (?P<punct>[{}\[\];,=:])
+    | (?P<error>.)
+"""
+_TOKEN_REGEX = re.compile(r"""
+      (?P<space>\s+|//[^\n]*\n|/\*.*?\*/|\#[^\n]*\n)
+""" + _TOKENS, re.VERBOSE | re.DOTALL)
+# the common statement "start -> end [key=value, ...];" is matched whole
+_CHUNK_REGEX = re.compile(r"""
+      (?P<space>\s+|//[^\n]*\n|/\*.*?\*/|\#[^\n]*\n)
+    | (?P<statement>(?P<start>ID)\s*(?P<op>->|--)\s*(?P<end>ID)\s*
+                    (?:\[(?P<pairs>(?:\s*(?:ID)\s*=\s*(?:ID)\s*,?)*)\s*\])?
+                    \s*;)
+""".replace("ID", _ID) + _TOKENS, re.VERBOSE | re.DOTALL)
+_PAIR_REGEX = re.compile(r"({0})\s*=\s*({0})".format(_ID), re.DOTALL)
+_ESCAPE_REGEX = re.compile(r'\\(["\\])|\\\n')
+_PLAIN_ID_REGEX = re.compile(r"[^\W\d]\w*\Z")
+_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+
+def _number(value:object) -> object:
+    """Returns value as an int or a float, None if it isn't a number
+    """
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def _unquote(text:str) -> str:
+    text = text[1:-1]
+    if "\\" in text:
+        text = _ESCAPE_REGEX.sub(lambda m: m.group(1) or "", text)
+    return text
+
+def _id_value(text:str) -> "Hashable":
+    """Returns the value of an ID: quoted strings are unquoted,
+       numerals converted to numbers
+    """
+    if text[0] == '"':
+        return _unquote(text)
+    if text[0] in "-.0123456789":
+        return _number(text)
+    return text
+
+def _tokens(file:"TextIO", chunk_size:int,
+            regex:"Pattern"=_CHUNK_REGEX) -> GeneratorType:
+    """Returns an iterator of the tokens of file as (kind, text) pairs
+
+    file is read chunk_size characters at a time; a token is produced
+    only once the character following it has been read. Simple edge
+    statements are returned whole as ("statement", match)
+    """
+    buffer = ""
+    eof = False
+    while not eof:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            chunk = "\n"
+        buffer += chunk
+        end = len(buffer)
+        position = end
+        tokens = []
+        for match in regex.finditer(buffer):
+            kind = match.lastgroup
+            if kind == "error" or (match.end() == end and not eof):
+                position = match.start()
+                break
+            if kind == "statement":
+                tokens.append((kind, match))
+            elif kind == "quoted":
+                tokens.append((kind, _unquote(match.group())))
+            elif kind != "space":
+                tokens.append((kind, match.group()))
+        yield from tokens
+        buffer = buffer[position:]
+    if buffer:
+        raise ValueError("Invalid DOT syntax near {!r}".format(buffer[:20]))
+
+class _DotParser():
+    """Recursive descent parser over the tokens of a DOT file
+    """
+
+    def __init__(self, tokens:GeneratorType) -> None:
+        """constructor
+        """
+        self.tokens = tokens
+        self.pending = []
+
+    def peek_statement(self) -> tuple:
+        """Returns the next token, which may be a whole statement
+        """
+        if not self.pending:
+            self.pending.append(next(self.tokens, (None, None)))
+        return self.pending[-1]
+
+    def peek(self) -> tuple:
+        token = self.peek_statement()
+        if token[0] == "statement":
+            # found where a statement can't start: split it in tokens
+            self.pending.pop()
+            text = io.StringIO(token[1].group())
+            self.pending.extend(reversed(list(_tokens(text, 1<<16,
+                                                      _TOKEN_REGEX))))
+            token = self.pending[-1]
+        return token
+
+    def next(self) -> tuple:
+        token = self.peek()
+        self.pending.pop()
+        return token
+
+    def expect(self, text:str) -> None:
+        kind, token = self.next()
+        if kind == "quoted" or token != text:
+            raise ValueError("Expected {!r} in DOT file, found {!r}".format(
+                             text, token))
+
+    def keyword(self) -> str:
+        """Returns the next token in lower case if it is a keyword
+        """
+        kind, token = self.peek()
+        if kind == "name" and token.lower() in _KEYWORDS:
+            return token.lower()
+        return None
+
+    def identifier(self) -> "Hashable":
+        """Consumes an ID, converting unquoted numerals to numbers
+        """
+        kind, token = self.next()
+        if kind == "numeral":
+            return _number(token)
+        if kind == "quoted" or kind == "name":
+            return token
+        raise ValueError("Expected an ID in DOT file, found {!r}".format(
+                         token))
+
+    def attributes(self, attributes:dict) -> dict:
+        """Consumes the attribute lists following a statement, adding
+           them to attributes
+        """
+        while self.peek() == ("punct", "["):
+            self.next()
+            while self.peek() != ("punct", "]"):
+                key = self.identifier()
+                if self.peek() == ("punct", "="):
+                    self.next()
+                    attributes[key] = self.identifier()
+                else:
+                    attributes[key] = "true"
+                if self.peek() in (("punct", ","), ("punct", ";")):
+                    self.next()
+            self.next()
+        return attributes
+
+    def node_id(self) -> "Hashable":
+        """Consumes a node ID, dropping its port
+        """
+        if self.peek() == ("punct", "{") or self.keyword() == "subgraph":
+            raise ValueError("Subgraphs as edge ends are not supported")
+        label = self.identifier()
+        for _ in range(2):
+            if self.peek() == ("punct", ":"):
+                self.next()
+                self.identifier()
+        return label
+
+    def parse(self) -> GeneratorType:
+        if self.keyword() == "strict":
+            self.next()
+        graph_type = self.keyword()
+        if graph_type != "graph" and graph_type != "digraph":
+            raise ValueError("DOT file doesn't start with graph or digraph")
+        self.next()
+        directed = graph_type == "digraph"
+        edge_op = "->" if directed else "--"
+        yield ("graph", directed)
+        if self.peek() != ("punct", "{"):
+            self.identifier()
+        self.expect("{")
+        scopes = [({}, {})]
+        while scopes:
+            kind, token = self.peek_statement()
+            if kind == "statement":
+                start, op, end, pairs = token.group("start", "op", "end",
+                                                      "pairs")
+                if op == edge_op and start.lower() not in _KEYWORDS and\
+                   end.lower() not in _KEYWORDS:
+                    self.pending.pop()
+                    attributes = dict(scopes[-1][1])
+                    if pairs:
+                        for key, value in _PAIR_REGEX.findall(pairs):
+                            attributes[_id_value(key)] = _id_value(value)
+                    yield ("edge", _id_value(start), _id_value(end),
+                           attributes)
+                    continue
+                kind, token = self.peek()
+            if kind == None:
+                raise ValueError("Unexpected end of DOT file")
+            node_defaults, edge_defaults = scopes[-1]
+            keyword = self.keyword()
+            if kind == "punct" and token == "}":
+                self.next()
+                scopes.pop()
+            elif kind == "punct" and token == ";":
+                self.next()
+            elif (kind == "punct" and token == "{") or keyword == "subgraph":
+                if self.next() != ("punct", "{"):
+                    if self.peek() != ("punct", "{"):
+                        self.identifier()
+                    self.expect("{")
+                scopes.append((dict(node_defaults), dict(edge_defaults)))
+            elif keyword == "node":
+                self.next()
+                self.attributes(node_defaults)
+            elif keyword == "edge":
+                self.next()
+                self.attributes(edge_defaults)
+            elif keyword == "graph":
+                self.next()
+                self.attributes({})
+            else:
+                label = self.node_id()
+                if self.peek() == ("punct", "="):
+                    self.next()
+                    self.identifier()
+                    continue
+                ends = [label]
+                while self.peek()[0] == "edgeop":
+                    op = self.next()[1]
+                    if op != edge_op:
+                        raise ValueError("Edge operator {} in a {}".format(
+                                         op, graph_type))
+                    ends.append(self.node_id())
+                if len(ends) == 1:
+                    yield ("node", label,
+                           self.attributes(dict(node_defaults)))
+                else:
+                    attributes = self.attributes(dict(edge_defaults))
+                    for start, end in zip(ends, ends[1:]):
+                        yield ("edge", start, end, attributes)
+
+def iter_dot(file:"str or TextIO", chunk_size:int=1<<16) -> GeneratorType:
+    """Returns an iterator of the statements of a Graphviz DOT file
+
+    The first item is ("graph", directed), followed by ("node", label,
+    attributes) for each node statement and ("edge", start, end,
+    attributes) for each edge, in the order of the file. The
+    attributes include the defaults set by node and edge statements;
+    unquoted numerals are returned as numbers. Ports are dropped,
+    subgraphs only open a new scope for the defaults
+
+    Raises:
+        FileNotFoundError:  no file called file was found
+        ValueError:         file isn't a valid DOT file
+    """
+    if isinstance(file, str):
+        with open(file, encoding="utf-8") as f:
+            yield from iter_dot(f, chunk_size)
+        return
+    yield from _DotParser(_tokens(file, chunk_size)).parse()
+
+def edge_fields(attributes:dict) -> tuple:
+    """Returns the (weight, lbound, ubound, flux) of an edge statement
+
+    The weight is taken from the weight attribute or, if missing,
+    from a numeric label
+
+    Raises:
+        ValueError: an attribute isn't a number
+    """
+    fields = []
+    for key in ("weight", "lbound", "ubound", "flux"):
+        value = attributes.get(key)
+        if value == None and key == "weight":
+            value = _number(attributes.get("label", ""))
+        elif value != None:
+            number = _number(value)
+            if number == None:
+                raise ValueError("Invalid {} {!r}".format(key, value))
+            value = number
+        fields.append(value)
+    return tuple(fields)
+
+def node_value(attributes:dict) -> object:
+    """Returns the value of a node statement, None if it has none
+    """
+    value = attributes.get("value")
+    number = _number(value) if value != None else None
+    return number if number != None else value
+
+def _quote(obj:object) -> str:
+    if type(obj) is int:
+        return str(obj)
+    if type(obj) is float and math.isfinite(obj):
+        # DOT numerals have no exponent, and need a point to be read
+        # back as float
+        text = format(Decimal(repr(obj)), "f")
+        return text if "." in text else text + ".0"
+    text = str(obj)
+    if _PLAIN_ID_REGEX.match(text) and text.lower() not in _KEYWORDS:
+        return text
+    return '"{}"'.format(text.replace("\\", "\\\\").replace('"', '\\"'))
+
+def dump_dot(directed:bool, nodes:"Iterable", edges:"Iterable",
+             stream:"IO", chunk_size:int=1<<16) -> None:
+    """Writes a graph in the DOT format to stream
+
+    The output is collected and written chunk_size characters at a
+    time; stream may be either a text or a binary stream
+
+    Args:
+        nodes:  (label, value) pairs of the nodes needing a statement
+        edges:  tuples (start, end, weight, lbound, ubound, flux)
+    """
+    binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase))
+    def flush(parts):
+        text = "".join(parts)
+        stream.write(text.encode("utf-8") if binary else text)
+        parts.clear()
+    edge_op = " -> " if directed else " -- "
+    parts = ["digraph {\n" if directed else "graph {\n", "    rankdir=LR\n"]
+    size = 0
+    for label, value in nodes:
+        if value != None:
+            line = "    {} [value={}];\n".format(_quote(label),
+                                                 _quote(value))
+        else:
+            line = "    {} ;\n".format(_quote(label))
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            flush(parts)
+            size = 0
+    for start, end, weight, lbound, ubound, flux in edges:
+        attributes = []
+        if weight != None:
+            attributes.append('label="{}"'.format(weight))
+        if lbound != None:
+            attributes.append('lbound="{}"'.format(lbound))
+        if ubound != None:
+            attributes.append('ubound="{}"'.format(ubound))
+        if flux != None:
+            attributes.append('flux="{}"'.format(flux))
+        if attributes:
+            line = "    {}{}{} [{}];\n".format(_quote(start), edge_op,
+                                               _quote(end),
+                                               ", ".join(attributes))
+        else:
+            line = "    {}{}{} ;\n".format(_quote(start), edge_op,
+                                           _quote(end))
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            flush(parts)
+            size = 0
+    parts.append("}\n")
+    flush(parts)
+
+def render_dot(directed:bool, nodes:"Iterable", edges:"Iterable",
+               path:str, format:str="jpg", program:str="dot") -> None:
+    """Renders a graph to the file path piping it through Graphviz
+
+    Raises:
+        FileNotFoundError:              program wasn't found
+        subprocess.CalledProcessError:  program failed
+    """
+    import subprocess
+    with subprocess.Popen([program, "-T" + format, "-o", path],
+                          stdin=subprocess.PIPE) as proc:
+        dump_dot(directed, nodes, edges, proc.stdin)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+def render_dot_async(*args, **kwargs) -> "Future":
+    """Runs render_dot in a background thread
+
+    Returns:
+        A Future completed when the file has been written
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    executor = ThreadPoolExecutor(1)
+    future = executor.submit(render_dot, *args, **kwargs)
+    executor.shutdown(wait=False)
+    return future
@@ -0,0 +1,170 @@
+#! /usr/bin/env python3
+
+from types import GeneratorType
+
+from ._queues import PriorityQueue
+
+class DynamicShortestPath():
+    """Shortest path tree kept up to date while its graph changes
+
+    The tree is built from the result of dijkstra or bellman and
+    subscribes to the changes of the graph: when a connection is
+    added, removed or changes weight, only the part of the tree
+    affected by the change is computed again, in the style of
+    Ramalingam and Reps. A weight decrease is propagated from the end
+    of the connection; a weight increase or a removal of a tree
+    connection resets the subtree hanging from it, whose nodes are
+    then settled again starting from their connections with the rest
+    of the tree. Negative cycles are not detected
+    """
+
+    def __init__(self, graph:"Graph", source:"Hashable",
+                       algorithm:str="dijkstra") -> None:
+        """constructor
+
+        Args:
+            algorithm:  The algorithm building the initial tree,
+                        either "dijkstra" or "bellman"
+
+        Raises:
+            KeyError:       source wasn't found in the graph
+            ValueError:     algorithm isn't known
+            NegativeCycle:  a negative cycle is reachable from source
+        """
+        if algorithm == "dijkstra":
+            tree = graph.dijkstra(source)
+        elif algorithm == "bellman":
+            tree = graph.bellman(source)
+        else:
+            raise ValueError("Unknown algorithm {}".format(algorithm))
+        self.graph = graph
+        self.source = source
+        self.distance = {}
+        self.father = {}
+        self.children = {}
+        for label in tree.node_map:
+            self.distance[label] = tree.get_node_value(label)
+            self.children[label] = set(tree.forward_star(label))
+            for father in tree.backward_star(label):
+                self.father[label] = father
+        self.father[source] = None
+        graph.subscribe(self._changed)
+
+    def close(self) -> None:
+        """Stops following the changes of the graph
+        """
+        self.graph.unsubscribe(self._changed)
+
+    def get_distance(self, label:"Hashable") -> int:
+        """Returns the distance of label from the source
+
+        Unreachable nodes are at infinite distance
+        """
+        return self.distance.get(label, float("inf"))
+
+    def get_father(self, label:"Hashable") -> "Hashable":
+        """Returns the father of label in the tree, None if label is
+           the source or is unreachable
+        """
+        return self.father.get(label)
+
+    def path(self, label:"Hashable") -> list:
+        """Returns the list of the nodes from the source to label
+
+        Raises:
+            KeyError:   label can't be reached from the source
+        """
+        if label not in self.distance:
+            raise KeyError(label)
+        path = [label]
+        while self.father[label] != None:
+            label = self.father[label]
+            path.append(label)
+        return path[::-1]
+
+    def tree(self) -> "Graph":
+        """Returns the current tree, in the same form as dijkstra
+        """
+        result = type(self.graph)()
+        result.add_node(self.source, value=0)
+        for label, father in self.father.items():
+            if father != None:
+                result.add_connection(father, label)
+                result.set_node_value(label, self.distance[label])
+        return result
+
+    def _weight(self, start:"Hashable", end:"Hashable") -> int:
+        weight = self.graph.get_weight(start, end)
+        if not weight:
+            weight = 0
+        return weight
+
+    def _set_father(self, label:"Hashable", father:"Hashable") -> None:
+        old = self.father.get(label)
+        if old != None:
+            self.children[old].discard(label)
+        self.father[label] = father
+        if father != None:
+            self.children.setdefault(father, set()).add(label)
+
+    def _changed(self, event:str, *args) -> None:
+        if event == "add_connection" or event == "set_weight" or\
+           event == "remove_connection":
+            start, end = args
+            self._connection_changed(start, end)
+            if not self.graph.directed:
+                self._connection_changed(end, start)
+
+    def _connection_changed(self, start:"Hashable", end:"Hashable") -> None:
+        if start not in self.distance:
+            return
+        if self.graph.is_connected(start, end):
+            new_distance = self.distance[start] + self._weight(start, end)
+        else:
+            new_distance = float("inf")
+        old_distance = self.get_distance(end)
+        if new_distance < old_distance:
+            self.distance[end] = new_distance
+            self._set_father(end, start)
+            queue = PriorityQueue()
+            queue.put(end, new_distance)
+            self._settle(queue)
+        elif self.father.get(end) == start and new_distance > old_distance:
+            self._reset_subtree(end)
+
+    def _subtree(self, root:"Hashable") -> GeneratorType:
+        stack = [root]
+        while stack:
+            label = stack.pop()
+            yield label
+            stack.extend(self.children.get(label, ()))
+
+    def _reset_subtree(self, root:"Hashable") -> None:
+        affected = list(self._subtree(root))
+        for label in affected:
+            self._set_father(label, None)
+            del(self.distance[label])
+        queue = PriorityQueue()
+        for label in affected:
+            for start in self.graph.backward_star(label):
+                if start in self.distance:
+                    new_distance = self.distance[start] +\
+                                   self._weight(start, label)
+                    if new_distance < self.get_distance(label):
+                        self.distance[label] = new_distance
+                        self._set_father(label, start)
+                        queue.put(label, new_distance)
+        self._settle(queue)
+
+    def _settle(self, queue:"PriorityQueue") -> None:
+        """Propagates the distances of the queued nodes
+        """
+        while not queue.empty():
+            label = queue.get()
+            for neighbour in self.graph.forward_star(label):
+                new_distance = self.distance[label] +\
+                               self._weight(label, neighbour)
+                if new_distance < self.get_distance(neighbour):
+                    self.distance[neighbour] = new_distance
+                    self._set_father(neighbour, label)
+                    queue.put(neighbour, new_distance)
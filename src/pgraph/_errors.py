@@ -0,0 +1,36 @@
+#! /usr/bin/env python3
+
+class NoConnection(Exception):
+    pass
+
+class NegativeCycle(Exception):
+    """A cycle with negative total weight was found
+
+    The cycle attribute lists its nodes in order: each one is connected
+    to the following, and the last one to the first
+    """
+
+    def __init__(self, cycle:list) -> None:
+        """constructor
+        """
+        super().__init__("Negative cycle: {}".format(
+            " -> ".join(str(n) for n in cycle + cycle[:1])))
+        self.cycle = cycle
+
+    def __reduce__(self) -> tuple:
+        # the arguments are the cycle, not the message, when unpickled
+        # from a worker process
+        return (type(self), (self.cycle,))
+
+class CyclicGraph(Exception):
+    """The graph has a cycle, so its nodes have no topological order
+
+    The cycle attribute lists its nodes in order, as in NegativeCycle
+    """
+
+    def __init__(self, cycle:list) -> None:
+        """constructor
+        """
+        super().__init__("Cycle: {}".format(
+            " -> ".join(str(n) for n in cycle + cycle[:1])))
+        self.cycle = cycle
@@ -0,0 +1,507 @@
+#! /usr/bin/env python3
+
+from collections import deque
+import heapq
+
+from ._trace import phase
+
+def _number(value:"Number") -> "Number":
+    """Turns integral floats back to int, as array columns holding an
+       infinite value store every number as float
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+class ResidualNetwork():
+    """Residual network of a flux
+
+    Every arc added becomes the residual arcs 2a, with capacity
+    ubound - flux, and 2a+1, going backwards with capacity flux and
+    opposite cost; the flux of a is then always the capacity of 2a+1.
+    adjacency[u] lists the residual arcs leaving u
+    """
+
+    def __init__(self, n:int) -> None:
+        """constructor
+
+        Args:
+            n:  The number of nodes, identified by 0..n-1
+        """
+        self.n = n
+        self.head = []
+        self.capacity = []
+        self.cost = []
+        self.adjacency = [[] for _ in range(n)]
+
+    @classmethod
+    def from_frozen(cls, frozen:"FrozenGraph") -> "ResidualNetwork":
+        """Builds the residual network of the flux of the snapshot
+
+        Arc a of the snapshot becomes the residual arcs 2a and 2a+1,
+        with the weight as cost
+
+        Raises:
+            ValueError: the snapshot isn't of a directed graph
+        """
+        if not frozen.directed:
+            raise ValueError("Flux requires a directed graph")
+        net = cls(frozen.node_count())
+        offsets = frozen.offsets
+        targets = frozen.targets
+        ubound = frozen.ubound
+        flux = frozen.flux
+        weight = frozen.weight
+        for u in range(net.n):
+            for arc in range(offsets[u], offsets[u+1]):
+                f = _number(flux[arc])
+                net.add_arc(u, targets[arc], _number(ubound[arc]) - f, f,
+                            _number(weight[arc]))
+        return net
+
+    def add_arc(self, start:int, end:int, capacity:"Number",
+                      flux:"Number"=0, cost:"Number"=0) -> int:
+        """Adds an arc with the given residual capacity and flux
+
+        Returns the id of the forward residual arc
+        """
+        arc = len(self.head)
+        self.head.append(end)
+        self.capacity.append(capacity)
+        self.cost.append(cost)
+        self.head.append(start)
+        self.capacity.append(flux)
+        self.cost.append(-cost)
+        self.adjacency[start].append(arc)
+        self.adjacency[end].append(arc + 1)
+        return arc
+
+    def push(self, arc:int, amount:"Number") -> None:
+        """Sends amount units along the residual arc
+        """
+        self.capacity[arc] -= amount
+        self.capacity[arc^1] += amount
+
+    def flux(self) -> list:
+        """Returns the flux of each arc of the snapshot
+        """
+        return self.capacity[1::2]
+
+    def levels(self, source:int, sink:int=None) -> list:
+        """Returns the BFS distance of each node from source over the
+           arcs with residual capacity, -1 for unreachable nodes
+
+        The visit stops early once sink is reached
+        """
+        level = [-1] * self.n
+        level[source] = 0
+        queue = deque([source])
+        head = self.head
+        capacity = self.capacity
+        while queue:
+            u = queue.popleft()
+            if u == sink:
+                break
+            for arc in self.adjacency[u]:
+                v = head[arc]
+                if level[v] < 0 and capacity[arc] > 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+def edmonds_karp(net:"ResidualNetwork", source:int, sink:int,
+                 tracer:"Tracer"=None) -> "Number":
+    """Augments along shortest paths, one at a time
+
+    Returns the amount of flux pushed; tracer, if given, gets an
+    "augment" event for each path with its bottleneck capacity
+    """
+    head = net.head
+    capacity = net.capacity
+    adjacency = net.adjacency
+    total = 0
+    while True:
+        father_arc = [-1] * net.n
+        father_arc[source] = -2
+        queue = deque([source])
+        while queue and father_arc[sink] == -1:
+            u = queue.popleft()
+            for arc in adjacency[u]:
+                v = head[arc]
+                if father_arc[v] == -1 and capacity[arc] > 0:
+                    father_arc[v] = arc
+                    queue.append(v)
+        if father_arc[sink] == -1:
+            return total
+        pushed = float("inf")
+        length = 0
+        v = sink
+        while v != source:
+            arc = father_arc[v]
+            pushed = min(pushed, capacity[arc])
+            length += 1
+            v = head[arc^1]
+        v = sink
+        while v != source:
+            arc = father_arc[v]
+            net.push(arc, pushed)
+            v = head[arc^1]
+        total += pushed
+        if tracer != None:
+            tracer.event("augment", bottleneck=pushed, length=length)
+
+def dinic(net:"ResidualNetwork", source:int, sink:int,
+          tracer:"Tracer"=None) -> "Number":
+    """Augments along blocking flows of the level graph
+
+    Returns the amount of flux pushed; tracer, if given, gets a
+    "phase" event for each level graph and an "augment" event for
+    each path with its bottleneck capacity
+    """
+    head = net.head
+    capacity = net.capacity
+    adjacency = net.adjacency
+    total = 0
+    while True:
+        level = net.levels(source, sink)
+        if level[sink] < 0:
+            return total
+        if tracer != None:
+            tracer.event("phase", distance=level[sink], total=total)
+        # next[u] is the first arc of u still worth trying
+        next_arc = [0] * net.n
+        while True:
+            path = []
+            u = source
+            while u != sink:
+                arcs = adjacency[u]
+                i = next_arc[u]
+                while i < len(arcs):
+                    arc = arcs[i]
+                    v = head[arc]
+                    if capacity[arc] > 0 and level[v] == level[u] + 1:
+                        break
+                    i += 1
+                next_arc[u] = i
+                if i < len(arcs):
+                    path.append(arcs[i])
+                    u = head[arcs[i]]
+                elif u == source:
+                    break
+                else:
+                    # dead end: retreat and skip the arc leading here
+                    level[u] = -1
+                    arc = path.pop()
+                    u = head[arc^1]
+                    next_arc[u] += 1
+            if u != sink:
+                break
+            pushed = min(capacity[arc] for arc in path)
+            for arc in path:
+                net.push(arc, pushed)
+            total += pushed
+            if tracer != None:
+                tracer.event("augment", bottleneck=pushed, length=len(path))
+
+def push_relabel(net:"ResidualNetwork", source:int, sink:int,
+                 tracer:"Tracer"=None) -> "Number":
+    """Highest label push-relabel with the gap heuristic
+
+    Excess that can't reach sink is sent back to source, so the
+    result is a flux and not just a preflow. Returns the amount of
+    flux pushed; tracer, if given, counts the pushes, the relabels,
+    the gaps and the stale entries popped from the buckets
+    """
+    n = net.n
+    head = net.head
+    capacity = net.capacity
+    adjacency = net.adjacency
+    excess = [0] * n
+    # initial heights: distances from sink in the residual network
+    height = [n] * n
+    height[sink] = 0
+    queue = deque([sink])
+    while queue:
+        v = queue.popleft()
+        for arc in adjacency[v]:
+            u = head[arc]
+            if height[u] == n and u != sink and capacity[arc^1] > 0:
+                height[u] = height[v] + 1
+                queue.append(u)
+    height[source] = n
+    count = [0] * (2 * n + 1)
+    for h in height:
+        count[h] += 1
+    # active[h] holds the nodes with excess at height h; entries made
+    # stale by a relabel are skipped when popped
+    active = [[] for _ in range(2 * n + 1)]
+    highest = 0
+    for arc in adjacency[source]:
+        amount = capacity[arc]
+        if amount > 0:
+            v = head[arc]
+            net.push(arc, amount)
+            excess[source] -= amount
+            if excess[v] == 0 and v != sink and v != source:
+                active[height[v]].append(v)
+                highest = max(highest, height[v])
+            excess[v] += amount
+    while highest >= 0:
+        bucket = active[highest]
+        if not bucket:
+            highest -= 1
+            continue
+        u = bucket.pop()
+        if height[u] != highest or excess[u] <= 0:
+            if tracer != None:
+                tracer.count("stale_pop")
+            continue
+        while excess[u] > 0:
+            h = height[u]
+            for arc in adjacency[u]:
+                v = head[arc]
+                if capacity[arc] > 0 and height[v] == h - 1:
+                    amount = min(excess[u], capacity[arc])
+                    net.push(arc, amount)
+                    if tracer != None:
+                        tracer.count("push")
+                    if excess[v] == 0 and v != sink and v != source:
+                        active[height[v]].append(v)
+                    excess[v] += amount
+                    excess[u] -= amount
+                    if excess[u] == 0:
+                        break
+            if excess[u] == 0:
+                break
+            new_height = 2 * n
+            for arc in adjacency[u]:
+                if capacity[arc] > 0:
+                    new_height = min(new_height, height[head[arc]] + 1)
+            if tracer != None:
+                tracer.count("relabel")
+            count[h] -= 1
+            if count[h] == 0 and h < n:
+                # gap: the nodes above h can't reach sink any more
+                if tracer != None:
+                    tracer.event("gap", height=h)
+                for v in range(n):
+                    if h < height[v] < n:
+                        count[height[v]] -= 1
+                        height[v] = n + 1
+                        count[n + 1] += 1
+                        if excess[v] > 0 and v != sink:
+                            active[n + 1].append(v)
+                new_height = max(new_height, n + 1)
+                highest = max(highest, n + 1)
+            height[u] = new_height
+            count[new_height] += 1
+        highest = max(highest, height[u])
+    return excess[sink]
+
+ALGORITHMS = {
+    "edmonds_karp": edmonds_karp,
+    "dinic": dinic,
+    "push_relabel": push_relabel,
+}
+
+def max_flow(frozen:"FrozenGraph", source:int, sink:int,
+             algorithm:str="dinic", tracer:"Tracer"=None) -> tuple:
+    """Computes a maximum flux from source to sink on the snapshot
+
+    The current flux is used as the starting point. Missing ubounds
+    are treated as infinite capacities
+
+    Args:
+        tracer:     Optional. A Tracer timing the building of the
+                    residual network and the run of the engine, which
+                    reports its augmentations, phases or pushes to it
+
+    Returns:
+        A tuple (value, flux), where value is the total flux leaving
+        source and flux is a list with the flux of each arc of the
+        snapshot
+
+    Raises:
+        ValueError: algorithm isn't known, the snapshot isn't of a
+                    directed graph or the flux is unbounded
+    """
+    try:
+        engine = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError("Unknown algorithm {}".format(algorithm))
+    with phase(tracer, "residual network"):
+        net = ResidualNetwork.from_frozen(frozen)
+        # no finite flux exceeds the sum of the finite capacities,
+        # which can then stand for the infinite ones
+        bound = 1 + sum(c for c in net.capacity if c != float("inf"))
+        unbounded = False
+        for arc, c in enumerate(net.capacity):
+            if c == float("inf"):
+                net.capacity[arc] = bound
+                unbounded = True
+    if source != sink:
+        with phase(tracer, algorithm):
+            pushed = engine(net, source, sink, tracer)
+        if unbounded and pushed >= bound:
+            raise ValueError("Unbounded flux")
+    flux = net.flux()
+    value = 0
+    for arc in net.adjacency[source]:
+        if arc & 1:
+            value -= flux[arc >> 1]
+        else:
+            value += flux[arc >> 1]
+    return value, flux
+
+def _potentials(net:"ResidualNetwork") -> list:
+    """Returns the distances by cost over the arcs with residual
+       capacity from a virtual root joined to every node by an arc of
+       cost 0, so that cycles anywhere in the network are seen
+
+    Raises:
+        ValueError: a cycle of negative cost has residual capacity
+    """
+    head = net.head
+    capacity = net.capacity
+    cost = net.cost
+    distance = [0] * net.n
+    length = [0] * net.n
+    queued = bytearray([1]) * net.n
+    queue = deque(range(net.n))
+    while queue:
+        u = queue.popleft()
+        queued[u] = 0
+        for arc in net.adjacency[u]:
+            v = head[arc]
+            if capacity[arc] > 0 and distance[u] + cost[arc] < distance[v]:
+                distance[v] = distance[u] + cost[arc]
+                length[v] = length[u] + 1
+                if length[v] >= net.n:
+                    raise ValueError("Negative cost cycle")
+                if not queued[v]:
+                    queued[v] = 1
+                    queue.append(v)
+    return distance
+
+def min_cost_flow(frozen:"FrozenGraph", supply:list) -> tuple:
+    """Computes a minimum cost flux meeting the supplies
+
+    Weights are the costs per unit of flux, lbound and ubound the
+    bounds of the flux of each arc (0 and infinity when missing); the
+    current flux is ignored. Lower bounds are removed by sending
+    lbound units on each arc upfront and adjusting the supplies; arcs
+    of negative cost are saturated the same way, so that the residual
+    network has no negative cycle and cycles of negative cost are
+    used as far as their capacities allow. Successive shortest paths
+    from a super source to a super sink then restore the supplies,
+    with Johnson potentials keeping the reduced costs non negative so
+    that Dijkstra applies
+
+    Args:
+        supply: The supply of each node, positive for sources and
+                negative for sinks
+
+    Returns:
+        A tuple (cost, flux), where flux is a list with the flux of
+        each arc of the snapshot
+
+    Raises:
+        ValueError: the supplies don't balance, the bounds or supplies
+                    can't be met, a cycle of negative cost has no
+                    ubound on any of its arcs, so that the cost is
+                    unbounded, or the graph isn't directed
+    """
+    if not frozen.directed:
+        raise ValueError("Flux requires a directed graph")
+    if sum(supply) != 0:
+        raise ValueError("Supplies don't balance")
+    n = frozen.node_count()
+    m = frozen.edge_count()
+    offsets = frozen.offsets
+    targets = frozen.targets
+    supply = list(supply)
+    lower = [_number(l) for l in frozen.lbound]
+    for u in range(n):
+        for arc in range(offsets[u], offsets[u+1]):
+            supply[u] -= lower[arc]
+            supply[targets[arc]] += lower[arc]
+    capacity = []
+    unbounded = ResidualNetwork(n)
+    for u in range(n):
+        for arc in range(offsets[u], offsets[u+1]):
+            ubound = _number(frozen.ubound[arc])
+            if ubound < lower[arc]:
+                raise ValueError("lbound greater than ubound")
+            capacity.append(ubound - lower[arc])
+            if ubound == float("inf"):
+                unbounded.add_arc(u, targets[arc], 1, 0,
+                                  _number(frozen.weight[arc]))
+    # only a negative cycle of arcs without ubound makes the cost
+    # unbounded
+    _potentials(unbounded)
+    # without such cycles, some optimal flux is made of paths carrying
+    # the supplies and of cycles through arcs with ubound, so no arc
+    # needs more than this bound
+    bound = 1 + sum(s for s in supply if s > 0) +\
+            sum(c for c in capacity if c != float("inf"))
+    source = n
+    sink = n + 1
+    net = ResidualNetwork(n + 2)
+    for u in range(n):
+        for arc in range(offsets[u], offsets[u+1]):
+            c = min(capacity[arc], bound)
+            w = _number(frozen.weight[arc])
+            if w < 0:
+                supply[u] -= c
+                supply[targets[arc]] += c
+                net.add_arc(u, targets[arc], 0, c, w)
+            else:
+                net.add_arc(u, targets[arc], c, 0, w)
+    required = sum(s for s in supply if s > 0)
+    for u in range(n):
+        if supply[u] > 0:
+            net.add_arc(source, u, supply[u])
+        elif supply[u] < 0:
+            net.add_arc(u, sink, -supply[u])
+    potential = _potentials(net)
+    head = net.head
+    capacity = net.capacity
+    cost = net.cost
+    sent = 0
+    while sent < required:
+        distance = [float("inf")] * net.n
+        father_arc = [-1] * net.n
+        distance[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distance[u]:
+                continue
+            for arc in net.adjacency[u]:
+                v = head[arc]
+                if capacity[arc] > 0:
+                    nd = d + cost[arc] + potential[u] - potential[v]
+                    if nd < distance[v]:
+                        distance[v] = nd
+                        father_arc[v] = arc
+                        heapq.heappush(heap, (nd, v))
+        if distance[sink] == float("inf"):
+            raise ValueError("Supplies can't be met")
+        for v in range(net.n):
+            if distance[v] != float("inf"):
+                potential[v] += distance[v]
+        pushed = required - sent
+        v = sink
+        while v != source:
+            arc = father_arc[v]
+            pushed = min(pushed, capacity[arc])
+            v = head[arc^1]
+        v = sink
+        while v != source:
+            arc = father_arc[v]
+            net.push(arc, pushed)
+            v = head[arc^1]
+        sent += pushed
+    flux = [lower[arc] + f for arc, f in enumerate(net.flux()[:m])]
+    total = sum(f * _number(w) for f, w in zip(flux, frozen.weight))
+    return total, flux
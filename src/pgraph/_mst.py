@@ -0,0 +1,128 @@
+#! /usr/bin/env python3
+
+# The functions work on the compressed sparse row arrays of the snapshot
+# of an undirected graph, where each edge appears as an arc from both
+# of its ends (sources, see arc_sources, gives the start of each arc),
+# and return the arcs of a minimum spanning forest
+
+from ._queues import PriorityQueue
+
+def arc_sources(offsets:"Sequence") -> list:
+    """Returns the list of the node each arc starts from
+    """
+    sources = []
+    for node in range(len(offsets) - 1):
+        sources.extend([node] * (offsets[node+1] - offsets[node]))
+    return sources
+
+def kruskal(offsets:"Sequence", sources:"Sequence", targets:"Sequence",
+            weight:"Sequence") -> list:
+    """Kruskal's algorithm: the edges are sorted once by weight, then
+       added unless a union-find forest (union by size, path halving)
+       finds their ends already connected
+    """
+    n = len(offsets) - 1
+    # each edge once, from its smaller end
+    arcs = [arc for arc in range(len(targets)) if sources[arc] < targets[arc]]
+    arcs.sort(key=weight.__getitem__)
+    parent = list(range(n))
+    size = [1] * n
+    forest = []
+    for arc in arcs:
+        a = sources[arc]
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        b = targets[arc]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+        forest.append(arc)
+        if len(forest) == n - 1:
+            break
+    return forest
+
+def prim(offsets:"Sequence", sources:"Sequence", targets:"Sequence",
+         weight:"Sequence") -> list:
+    """Prim's algorithm, growing a tree from each node not yet reached
+       and keeping the nodes at the border in an indexed binary heap
+       by the weight of their lightest arc from the tree
+    """
+    n = len(offsets) - 1
+    reached = bytearray(n)
+    # lightest known arc reaching each node of the border
+    best = [-1] * n
+    forest = []
+    for root in range(n):
+        if reached[root]:
+            continue
+        queue = PriorityQueue()
+        queue.put(root, 0)
+        while not queue.empty():
+            node = queue.get()
+            reached[node] = 1
+            if node != root:
+                forest.append(best[node])
+            for arc in range(offsets[node], offsets[node+1]):
+                target = targets[arc]
+                if reached[target]:
+                    continue
+                if best[target] < 0:
+                    best[target] = arc
+                    queue.put(target, weight[arc])
+                elif weight[arc] < weight[best[target]]:
+                    best[target] = arc
+                    queue.decrease_key(target, weight[arc])
+    return forest
+
+def boruvka(offsets:"Sequence", sources:"Sequence", targets:"Sequence",
+            weight:"Sequence") -> list:
+    """Boruvka's algorithm: in each round every tree of the forest adds
+       the lightest edge leaving it, which at least halves the number
+       of trees
+
+    Ties are broken by the ends of the edges, so that the edges chosen
+    in a round never close a cycle
+    """
+    n = len(offsets) - 1
+    arcs = [arc for arc in range(len(targets)) if sources[arc] < targets[arc]]
+    parent = list(range(n))
+    forest = []
+    def find(a):
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        return a
+    while True:
+        cheapest = {}
+        remaining = []
+        tree = [find(node) for node in range(n)]
+        for arc in arcs:
+            a = tree[sources[arc]]
+            b = tree[targets[arc]]
+            if a == b:
+                continue
+            remaining.append(arc)
+            key = (weight[arc], sources[arc], targets[arc])
+            for root in (a, b):
+                if root not in cheapest or key < cheapest[root][0]:
+                    cheapest[root] = (key, arc)
+        if not cheapest:
+            return forest
+        # the edges inside a tree are never needed again
+        arcs = remaining
+        for _, arc in cheapest.values():
+            a = find(sources[arc])
+            b = find(targets[arc])
+            if a != b:
+                parent[b] = a
+                forest.append(arc)
+
+ALGORITHMS = {
+    "kruskal": kruskal,
+    "prim": prim,
+    "boruvka": boruvka,
+}
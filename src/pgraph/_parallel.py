@@ -0,0 +1,115 @@
+#! /usr/bin/env python3
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from types import GeneratorType
+import itertools
+import os
+
+from ._csr import FrozenGraph
+from ._errors import NegativeCycle
+
+# snapshot attached by each worker process, see _attach
+_worker_graph = None
+_worker_memory = None
+
+def _attach(name:str) -> None:
+    """Worker initializer: maps the snapshot published in shared memory
+    """
+    global _worker_graph, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_graph = FrozenGraph.from_buffer(_worker_memory.buf)
+
+def _compact(frozen:"FrozenGraph", distance:list, father:list) -> tuple:
+    """Packs the result of a visit in two arrays
+
+    Unreached nodes get father -2 and distance 0, the source father -1
+    """
+    father = array("q", father)
+    for i, d in enumerate(distance):
+        if d == float("inf"):
+            father[i] = -2
+            distance[i] = 0
+    return (array(frozen.weight.format, distance), father)
+
+def _visit(frozen:"FrozenGraph", source:int, algorithm:str) -> tuple:
+    if algorithm == "dijkstra":
+        return _compact(frozen, *frozen._dijkstra(source))
+    else:
+        return _compact(frozen, *frozen._bellman(source))
+
+def _run(sources:list, algorithm:str) -> list:
+    """Worker task: visits the graph from each source
+    """
+    return [_visit(_worker_graph, s, algorithm) for s in sources]
+
+def _chunks(sources:list, size:int) -> GeneratorType:
+    for i in range(0, len(sources), size):
+        yield sources[i:i+size]
+
+def _to_labels(frozen:"FrozenGraph", distance:array, father:array) -> tuple:
+    labels = frozen.labels
+    distance_map = {}
+    father_map = {}
+    for i, f in enumerate(father):
+        if f != -2:
+            distance_map[labels[i]] = distance[i]
+            father_map[labels[i]] = labels[f] if f >= 0 else None
+    return distance_map, father_map
+
+def multi_source(frozen:"FrozenGraph", sources:list, workers:int=None,
+                 algorithm:str="dijkstra", chunksize:int=None) -> GeneratorType:
+    """Returns an iterator of (source, distance, father) for each source
+
+    distance and father map each node reached from source to its
+    distance and to its father in the visit; results are produced in
+    the order of sources, as soon as they are available. The snapshot
+    is published once in shared memory and mapped by every worker
+
+    Args:
+        workers:    Number of worker processes, by default one per CPU;
+                    with 1 the visits run in the calling process
+        algorithm:  Either "dijkstra" or "bellman"
+        chunksize:  Number of sources handed to a worker at a time
+
+    Raises:
+        KeyError:       a source wasn't found in the graph
+        ValueError:     algorithm isn't known
+        NegativeCycle:  a negative cycle is reachable from a source
+    """
+    if algorithm not in ("dijkstra", "bellman"):
+        raise ValueError("Unknown algorithm {}".format(algorithm))
+    ids = [frozen.index[s] for s in sources]
+    if workers == None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(ids) <= 1:
+        for source, i in zip(sources, ids):
+            yield (source,) + _to_labels(frozen,
+                                         *_visit(frozen, i, algorithm))
+        return
+    if chunksize == None:
+        chunksize = max(1, len(ids) // (workers * 4))
+    memory = shared_memory.SharedMemory(create=True, size=frozen.nbytes())
+    executor = None
+    try:
+        frozen.write_into(memory.buf)
+        executor = ProcessPoolExecutor(workers, initializer=_attach,
+                                       initargs=(memory.name,))
+        results = executor.map(_run, _chunks(ids, chunksize),
+                               itertools.repeat(algorithm))
+        remaining = iter(sources)
+        try:
+            for chunk in results:
+                for distance, father in chunk:
+                    yield (next(remaining),) +\
+                          _to_labels(frozen, distance, father)
+        except NegativeCycle as error:
+            # the snapshots of the workers have no labels
+            raise NegativeCycle([frozen.labels[i]
+                                 for i in error.cycle]) from None
+    finally:
+        if executor != None:
+            executor.shutdown(cancel_futures=True)
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,504 @@
+#! /usr/bin/env python3
+
+from abc import abstractmethod, ABCMeta
+from collections import deque
+from types import GeneratorType
+
+class EmptyException(Exception):
+    pass
+
+class Queue(metaclass=ABCMeta):
+    @abstractmethod
+    def __init__(self) -> None:
+        """constructor
+        """
+        pass
+
+    @abstractmethod
+    def put(self, item:"Comparable", value:int=None) -> None:
+        """Puts a new element in the queue
+
+        Args:
+            item:   The item to be put in the queue
+            value:  Optional. If != None, a value to be associated to
+                    the item to be used for any reason (eg, a priority
+                    queue)
+        """
+        pass
+
+    @abstractmethod
+    def get(self) -> "Comparable":
+        """Returns the first element in the queue, removing it from the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        pass
+
+    @abstractmethod
+    def empty(self) -> bool:
+        """Returns True iff the queue is empty
+        """
+        pass
+
+    @abstractmethod
+    def is_in(self, item:"Comparable") -> bool:
+        """Returns True iff item is in the queue
+        """
+        pass
+
+    def update(self, item:"Comparable", value:int=None) -> None:
+        """Updates the value associated to an item already in the queue
+
+        Queues that don't order their items by value ignore it
+        """
+        pass
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """Returns the size of the queue
+        """
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> GeneratorType:
+        pass
+
+class FifoQueue(Queue):
+    """Implementation of a Fifo queue
+
+    Optionally applies the SLF (Small Label First) and LLL (Large
+    Label Last) heuristics used by label correcting shortest path
+    algorithms, based on the values supplied with put and update:
+    with SLF, an item whose value is smaller than the one of the
+    first item is put at the front of the queue; with LLL, items
+    whose value is greater than the average of the queue are moved
+    to the back before returning the first one
+    """
+    def __init__(self, slf:bool=False, lll:bool=False) -> None:
+        """constructor
+        """
+        self.elements = deque()
+        self.count = {}
+        self.slf = slf
+        self.lll = lll
+        self.values = {}
+        self.total = 0
+
+    def put(self, item:"Hashable", value:int=None) -> None:
+        """Puts a new element in the queue
+        """
+        if self.slf or self.lll:
+            if item in self.values:
+                self.total -= self.values[item]
+            self.values[item] = value
+            self.total += value
+            if self.slf and self.elements and\
+               value < self.values[self.elements[0]]:
+                self.elements.appendleft(item)
+            else:
+                self.elements.append(item)
+        else:
+            self.elements.append(item)
+        self.count[item] = self.count.get(item, 0) + 1
+
+    def get(self) -> "Hashable":
+        """Returns the first element in the queue, removing it from the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        if not self.elements:
+            raise EmptyException
+        if self.lll:
+            average = self.total / len(self.elements)
+            for _ in range(len(self.elements) - 1):
+                if self.values[self.elements[0]] <= average:
+                    break
+                self.elements.rotate(-1)
+        retval = self.elements.popleft()
+        if self.count[retval] == 1:
+            del(self.count[retval])
+            if retval in self.values:
+                self.total -= self.values.pop(retval)
+        else:
+            self.count[retval] -= 1
+        return retval
+
+    def update(self, item:"Hashable", value:int=None) -> None:
+        """Updates the value associated to an item already in the queue
+
+        The position of the item only depends on the values when the
+        SLF or LLL heuristics are enabled
+        """
+        if item in self.values:
+            self.total += value - self.values[item]
+            self.values[item] = value
+
+    def empty(self) -> bool:
+        """Returns True iff the queue is empty
+        """
+        if self.elements:
+            return False
+        else:
+            return True
+
+    def is_in(self, item:"Hashable") -> bool:
+        """Returns True iff item is in the queue
+        """
+        return item in self.count
+
+    def qsize(self) -> int:
+        """Returns the size of the queue
+        """
+        return len(self.elements)
+
+    def __str__(self) -> None:
+        return str(list(self.elements))
+
+    def __iter__(self) -> GeneratorType:
+        for e in self.elements:
+            yield e
+
+
+class PriorityQueue(Queue):
+    """Implementation of a Priority queue
+
+    The first item is to be considered the one with the
+    lowest priority. The queue is an indexed binary heap: every item
+    appears at most once, and its position is tracked so that
+    membership checks take O(1) and priority changes O(log n).
+    Items with the same priority are returned in insertion order
+    """
+
+    def __init__(self) -> None:
+        """constructor
+        """
+        self.elements = []
+        self.position = {}
+        self.counter = 0
+
+    def put(self, item:"Hashable", value:int=None) -> None:
+        """Puts a new element in the queue
+
+        If item is already in the queue, its priority is updated
+
+        Args:
+            item:   The item to be put in the queue
+            value:  The priority of the item
+        """
+        if item in self.position:
+            self.update(item, value)
+            return
+        self.elements.append((value, self.counter, item))
+        self.counter += 1
+        self.position[item] = len(self.elements) - 1
+        self._sift_up(len(self.elements) - 1)
+
+    def get(self) -> "Hashable":
+        """Returns the first element in the queue, removing it from the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        if not self.elements:
+            raise EmptyException
+        last = self.elements.pop()
+        if not self.elements:
+            del(self.position[last[2]])
+            return last[2]
+        first = self.elements[0]
+        self.elements[0] = last
+        self.position[last[2]] = 0
+        del(self.position[first[2]])
+        self._sift_down(0)
+        return first[2]
+
+    def peek(self) -> "Hashable":
+        """Returns the first element in the queue, leaving it in the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        if not self.elements:
+            raise EmptyException
+        return self.elements[0][2]
+
+    def priority(self, item:"Hashable") -> int:
+        """Returns the current priority of item
+
+        Raises:
+            KeyError:   item wasn't in the queue
+        """
+        return self.elements[self.position[item]][0]
+
+    def decrease_key(self, item:"Hashable", value:int) -> None:
+        """Lowers the priority of item to value
+
+        Raises:
+            KeyError:   item wasn't in the queue
+            ValueError: value is greater than the current priority
+        """
+        i = self.position[item]
+        old_value, counter, _ = self.elements[i]
+        if value > old_value:
+            raise ValueError("{} is greater than the current "
+                             "priority {}".format(value, old_value))
+        self.elements[i] = (value, counter, item)
+        self._sift_up(i)
+
+    def update(self, item:"Hashable", value:int=None) -> None:
+        """Changes the priority of item to value
+
+        Raises:
+            KeyError:   item wasn't in the queue
+        """
+        i = self.position[item]
+        old_value, counter, _ = self.elements[i]
+        self.elements[i] = (value, counter, item)
+        if value < old_value:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def _sift_up(self, i:int) -> None:
+        elements = self.elements
+        position = self.position
+        entry = elements[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not entry < elements[parent]:
+                break
+            elements[i] = elements[parent]
+            position[elements[i][2]] = i
+            i = parent
+        elements[i] = entry
+        position[entry[2]] = i
+
+    def _sift_down(self, i:int) -> None:
+        elements = self.elements
+        position = self.position
+        size = len(elements)
+        entry = elements[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and elements[child+1] < elements[child]:
+                child += 1
+            if not elements[child] < entry:
+                break
+            elements[i] = elements[child]
+            position[elements[i][2]] = i
+            i = child
+        elements[i] = entry
+        position[entry[2]] = i
+
+    def empty(self) -> bool:
+        """Returns True iff the queue is empty
+        """
+        if self.elements:
+            return False
+        else:
+            return True
+
+    def is_in(self, item:"Hashable") -> bool:
+        """Returns True iff item is in the queue
+        """
+        return item in self.position
+
+    def qsize(self) -> int:
+        """Returns the size of the queue
+        """
+        return len(self.elements)
+
+    def __str__(self) -> None:
+        return str([e[2] for e in self.elements])
+
+    def __iter__(self) -> GeneratorType:
+        for e in self.elements:
+            yield (e[0], e[2])
+
+
+class _PairingNode():
+    """Node of a PairingHeap
+
+    prev is the parent for the leftmost child, the left sibling
+    otherwise
+    """
+    __slots__ = ("key", "item", "child", "sibling", "prev")
+
+    def __init__(self, key:tuple, item:"Hashable") -> None:
+        """constructor
+        """
+        self.key = key
+        self.item = item
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+
+class PairingHeap(Queue):
+    """Implementation of a Priority queue as a pairing heap
+
+    Same interface as PriorityQueue; insertions and decrease_key take
+    O(1), get takes O(log n) amortized
+    """
+
+    def __init__(self) -> None:
+        """constructor
+        """
+        self.root = None
+        self.nodes = {}
+        self.counter = 0
+
+    def put(self, item:"Hashable", value:int=None) -> None:
+        """Puts a new element in the queue
+
+        If item is already in the queue, its priority is updated
+
+        Args:
+            item:   The item to be put in the queue
+            value:  The priority of the item
+        """
+        if item in self.nodes:
+            self.update(item, value)
+            return
+        node = _PairingNode((value, self.counter), item)
+        self.counter += 1
+        self.nodes[item] = node
+        self.root = self._meld(self.root, node)
+
+    def get(self) -> "Hashable":
+        """Returns the first element in the queue, removing it from the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        if self.root == None:
+            raise EmptyException
+        root = self.root
+        self.root = self._merge_pairs(root.child)
+        del(self.nodes[root.item])
+        return root.item
+
+    def peek(self) -> "Hashable":
+        """Returns the first element in the queue, leaving it in the queue
+
+        Raises:
+            EmptyException: The queue was empty
+        """
+        if self.root == None:
+            raise EmptyException
+        return self.root.item
+
+    def priority(self, item:"Hashable") -> int:
+        """Returns the current priority of item
+
+        Raises:
+            KeyError:   item wasn't in the queue
+        """
+        return self.nodes[item].key[0]
+
+    def decrease_key(self, item:"Hashable", value:int) -> None:
+        """Lowers the priority of item to value
+
+        Raises:
+            KeyError:   item wasn't in the queue
+            ValueError: value is greater than the current priority
+        """
+        node = self.nodes[item]
+        if value > node.key[0]:
+            raise ValueError("{} is greater than the current "
+                             "priority {}".format(value, node.key[0]))
+        node.key = (value, node.key[1])
+        if node is not self.root:
+            self._cut(node)
+            self.root = self._meld(self.root, node)
+
+    def update(self, item:"Hashable", value:int=None) -> None:
+        """Changes the priority of item to value
+
+        Raises:
+            KeyError:   item wasn't in the queue
+        """
+        node = self.nodes[item]
+        if value <= node.key[0]:
+            self.decrease_key(item, value)
+            return
+        if node is self.root:
+            self.root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            self.root = self._meld(self.root, self._merge_pairs(node.child))
+        node.child = None
+        node.key = (value, node.key[1])
+        self.root = self._meld(self.root, node)
+
+    @staticmethod
+    def _meld(a:"_PairingNode", b:"_PairingNode") -> "_PairingNode":
+        if a == None:
+            return b
+        if b == None:
+            return a
+        if b.key < a.key:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child != None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    @staticmethod
+    def _cut(node:"_PairingNode") -> None:
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling != None:
+            node.sibling.prev = node.prev
+        node.prev = None
+        node.sibling = None
+
+    def _merge_pairs(self, first:"_PairingNode") -> "_PairingNode":
+        pairs = []
+        while first != None:
+            second = first.sibling
+            if second == None:
+                first.prev = None
+                pairs.append(first)
+                break
+            following = second.sibling
+            first.prev = first.sibling = None
+            second.prev = second.sibling = None
+            pairs.append(self._meld(first, second))
+            first = following
+        root = None
+        for tree in reversed(pairs):
+            root = self._meld(tree, root)
+        return root
+
+    def empty(self) -> bool:
+        """Returns True iff the queue is empty
+        """
+        return self.root == None
+
+    def is_in(self, item:"Hashable") -> bool:
+        """Returns True iff item is in the queue
+        """
+        return item in self.nodes
+
+    def qsize(self) -> int:
+        """Returns the size of the queue
+        """
+        return len(self.nodes)
+
+    def __str__(self) -> None:
+        return str(list(self.nodes))
+
+    def __iter__(self) -> GeneratorType:
+        for item, node in self.nodes.items():
+            yield (node.key[0], item)
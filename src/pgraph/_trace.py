@@ -0,0 +1,121 @@
+#! /usr/bin/env python3
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from types import GeneratorType
+import sys
+import time
+
+from ._queues import Queue
+
+class Tracer():
+    """Collects what happens inside an algorithm run
+
+    Algorithms accepting a tracer report to it the operations they
+    perform with count, the events worth recording with event (which
+    are counted too) and time their phases with phase; without a
+    tracer they make no calls at all. Events are passed to callback as
+    callback(name, fields) and written to file as JSON lines
+    """
+
+    def __init__(self, callback:"Callable"=None, file:"TextIO"=None) -> None:
+        """constructor
+
+        Args:
+            callback:   Optional. Called with the name and the fields
+                        of each event
+            file:       Optional. A text stream receiving each event as
+                        a JSON object on its own line
+        """
+        self.callback = callback
+        self.file = file
+        self.counters = Counter()
+        self.timings = defaultdict(float)
+
+    def count(self, name:str, amount:int=1) -> None:
+        """Adds amount to the counter name
+        """
+        self.counters[name] += amount
+
+    def event(self, name:str, **fields) -> None:
+        """Records an event, counting it under its name
+        """
+        self.counters[name] += 1
+        if self.callback != None:
+            self.callback(name, fields)
+        if self.file != None:
+            # json loads re, which importing pgraph must not load (see
+            # benchmarks/startup.py)
+            import json
+            self.file.write(json.dumps(dict(fields, event=name),
+                                       default=str) + "\n")
+
+    @contextmanager
+    def phase(self, name:str) -> GeneratorType:
+        """Context manager adding the time spent in it to the timing
+           of the phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def summary(self) -> dict:
+        """Returns the counters and the phase timings, in seconds
+        """
+        return {"counters": dict(self.counters),
+                "timings": dict(self.timings)}
+
+def phase(tracer:"Tracer", name:str) -> "ContextManager":
+    """Returns tracer.phase(name), or a context doing nothing when
+       tracer is None
+    """
+    return tracer.phase(name) if tracer != None else nullcontext()
+
+def print_event(name:str, fields:dict, stream:"TextIO"=None) -> None:
+    """Tracer callback printing each event on a line
+    """
+    print("{:<8} {}".format(name, " ".join("{}={}".format(k, v)
+                                           for k, v in fields.items())),
+          file=stream if stream != None else sys.stdout)
+
+class TracedQueue(Queue):
+    """Queue counting the operations done on another queue
+
+    Only used while tracing, so that the queues themselves don't pay
+    for the instrumentation
+    """
+
+    def __init__(self, queue:"Queue", tracer:"Tracer") -> None:
+        """constructor
+        """
+        self.queue = queue
+        self.tracer = tracer
+
+    def put(self, item:"Hashable", value:int=None) -> None:
+        self.tracer.count("queue_put")
+        self.queue.put(item, value)
+
+    def get(self) -> "Hashable":
+        self.tracer.count("queue_get")
+        return self.queue.get()
+
+    def update(self, item:"Hashable", value:int=None) -> None:
+        self.tracer.count("queue_update")
+        self.queue.update(item, value)
+
+    def empty(self) -> bool:
+        return self.queue.empty()
+
+    def is_in(self, item:"Hashable") -> bool:
+        return self.queue.is_in(item)
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    def __iter__(self) -> GeneratorType:
+        return iter(self.queue)
+
+    def __str__(self) -> str:
+        return str(self.queue)
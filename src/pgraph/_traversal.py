@@ -0,0 +1,121 @@
+#! /usr/bin/env python3
+
+from collections import deque
+from types import GeneratorType
+
+# returned by a visitor to end the traversal after the current node
+STOP = object()
+
+_REPORTS = ("nodes", "edges", "events")
+
+def _event(report:str, node:"Hashable", depth:int,
+           parent:"Hashable") -> object:
+    if report == "nodes":
+        return node
+    elif report == "edges":
+        return (parent, node)
+    return (node, depth, parent)
+
+def _check(starts:tuple, neighbours:"Callable", report:str) -> None:
+    if report not in _REPORTS:
+        raise ValueError("Unknown report {}".format(report))
+    for start in starts:
+        neighbours(start)
+
+def bfs(neighbours:"Callable", starts:tuple, depth_limit:int=None,
+        visitor:"Callable"=None, report:str="nodes") -> GeneratorType:
+    """Returns an iterator visiting the nodes reachable from starts in
+       breadth first order
+
+    The starts are at depth 0 and visited first. Each node reached is
+    passed to visitor as visitor(node, depth, parent), parent being
+    None for the starts: if it returns False the node is visited but
+    its neighbours aren't explored, if it returns STOP the traversal
+    ends after the node
+
+    Args:
+        neighbours:     A function returning an iterable of the nodes
+                        reachable from a node, raising KeyError for
+                        unknown nodes
+        depth_limit:    Optional. The neighbours of the nodes at this
+                        depth aren't explored
+        report:         What is produced for each node: "nodes" gives
+                        the node, "edges" the pair (parent, node) for
+                        all but the starts, "events" the tuple (node,
+                        depth, parent)
+
+    Raises:
+        KeyError:   a start wasn't found in the graph
+        ValueError: report isn't known
+    """
+    _check(starts, neighbours, report)
+    return _bfs(neighbours, starts, depth_limit, visitor, report)
+
+def _bfs(neighbours:"Callable", starts:tuple, depth_limit:int,
+         visitor:"Callable", report:str) -> GeneratorType:
+    seen = set(starts)
+    queue = deque((start, 0, None) for start in dict.fromkeys(starts))
+    while queue:
+        node, depth, parent = queue.popleft()
+        action = visitor(node, depth, parent) if visitor != None else None
+        if depth > 0 or report != "edges":
+            yield _event(report, node, depth, parent)
+        if action is STOP:
+            return
+        if action is False or depth == depth_limit:
+            continue
+        for neighbour in neighbours(node):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                queue.append((neighbour, depth + 1, node))
+
+def dfs(neighbours:"Callable", starts:tuple, depth_limit:int=None,
+        visitor:"Callable"=None, report:str="nodes") -> GeneratorType:
+    """Returns an iterator visiting the nodes reachable from starts in
+       depth first order
+
+    Nodes are produced when first reached (preorder); the starts are
+    explored one after the other. The stack of the visit is explicit,
+    so the depth of the graph isn't bound by the recursion limit. The
+    arguments are the same as bfs
+
+    Raises:
+        KeyError:   a start wasn't found in the graph
+        ValueError: report isn't known
+    """
+    _check(starts, neighbours, report)
+    return _dfs(neighbours, starts, depth_limit, visitor, report)
+
+def _dfs(neighbours:"Callable", starts:tuple, depth_limit:int,
+         visitor:"Callable", report:str) -> GeneratorType:
+    seen = set()
+    for start in starts:
+        if start in seen:
+            continue
+        seen.add(start)
+        action = visitor(start, 0, None) if visitor != None else None
+        if report != "edges":
+            yield _event(report, start, 0, None)
+        if action is STOP:
+            return
+        if action is False or depth_limit == 0:
+            continue
+        # each entry holds a node and the iterator of its neighbours
+        stack = [(start, iter(neighbours(start)))]
+        while stack:
+            parent, children = stack[-1]
+            for node in children:
+                if node not in seen:
+                    break
+            else:
+                stack.pop()
+                continue
+            seen.add(node)
+            depth = len(stack)
+            action = visitor(node, depth, parent) if visitor != None\
+                                                  else None
+            yield _event(report, node, depth, parent)
+            if action is STOP:
+                return
+            if action is not False and depth != depth_limit:
+                stack.append((node, iter(neighbours(node))))
@@ -0,0 +1,1858 @@
+#! /usr/bin/env python3
+
+from collections.abc import Hashable
+from types import GeneratorType
+import sys
+
+import itertools
+
+# _parallel, _binary, _dot and re are imported where they are used,
+# since most programs don't need them and they are slow to import
+from ._queues import Queue, FifoQueue, PriorityQueue, PairingHeap
+from ._csr import FrozenGraph
+from ._errors import NoConnection, NegativeCycle
+from ._cache import LRUCache
+from ._dynamic import DynamicShortestPath
+from ._traversal import bfs, dfs
+from ._components import condensation_arcs, group
+from ._trace import Tracer, TracedQueue, print_event, phase
+
+class Edge():
+    """Edge class
+    """
+
+    def __init__(self, end_label:object, weight:int, lbound:int,
+                       ubound:int, flux:int, owner:object=None) -> None:
+        """constructor
+
+        Args:
+            owner:  The token of the graph allowed to change the edge
+                    in place, see Graph.copy
+        """
+        self.owner = owner
+        self.end_label = end_label
+        self.weight = weight
+        self.lbound = lbound
+        self.ubound = ubound
+        self.flux = flux
+
+    def get_weight(self:"Hashable") -> int:
+        """Returns the current weight 
+        """
+        return self.weight
+
+    def set_weight(self, weight) -> None:
+        """Sets the current weight 
+        """
+        self.weight = weight
+
+    def get_lbound(self) -> int:
+        """Returns the current lbound 
+        """
+        return self.lbound
+
+    def set_lbound(self, lbound) -> None:
+        """Sets the current lbound 
+        """
+        self.lbound = lbound
+
+    def get_ubound(self) -> int:
+        """Returns the current ubound 
+        """
+        return self.ubound
+
+    def set_ubound(self, ubound) -> None:
+        """Sets the current ubound 
+        """
+        self.ubound = ubound
+
+    def get_flux(self) -> int:
+        """Returns the current flux 
+        """
+        return self.flux
+
+    def set_flux(self, flux) -> None:
+        """Sets the current flux 
+        """
+        self.flux = flux
+
+    def copy(self) -> "Edge":
+        """Copies the current edge
+        """
+        return Edge(self.end_label, self.weight, self.lbound,
+                        self.ubound, self.flux)
+
+    def __str__(self):
+        return self.format(self.end_label)
+
+    def format(self, end_label:"Hashable") -> str:
+        """Returns the edge as a string leading to end_label
+
+        The edges of undirected graphs are shared by their two ends,
+        while end_label only records one of them
+        """
+        metadata = []
+        if self.weight != None:
+            metadata.append("$" + str(self.weight))
+        if self.flux != None:
+            metadata.append("~" + str(self.flux))
+        if self.lbound != None:
+            metadata.append("b" + str(self.lbound))
+        if self.ubound != None:
+            metadata.append("B" + str(self.ubound))
+
+        metadata = ";".join(metadata)
+        if metadata:
+            metadata = "(" + metadata + ")"
+
+        return "{}{}".format(metadata, str(end_label))
+
+
+class Node():
+    """Node class
+    """
+
+    def __init__(self, label:object, value:int, owner:object=None) -> None:
+        """constructor
+
+        Args:
+            owner:  The token of the graph allowed to change the node
+                    in place, see Graph.copy
+        """
+        self.owner = owner
+        self.label = label
+        self.value = value
+        self.connections = {}
+        self.incoming = {}
+
+    def connect(self, end_label:"Hashable", weight:int, lbound:int,
+                      ubound:int, flux:int) -> "Edge":
+        """Connect the node to another one, returning the new edge"""
+        edge = Edge(end_label, weight, lbound, ubound, flux, self.owner)
+        self.connections[end_label] = edge
+        return edge
+
+    def remove_connection(self, end_label:"Hashable") -> None:
+        """Remove a connection
+
+        Raises:
+            KeyError:   end_label wasn't found in the graph
+        """
+        del(self.connections[end_label])
+
+    def add_incoming(self, start_label:"Hashable", edge:"Edge") -> None:
+        """Records that edge connects start_label to the current node
+        """
+        self.incoming[start_label] = edge
+
+    def share(self, start_label:"Hashable", edge:"Edge") -> None:
+        """Connects the node to start_label through the edge of an
+           undirected graph, already held by start_label
+        """
+        self.connections[start_label] = edge
+
+    def remove_incoming(self, start_label:"Hashable") -> None:
+        """Forgets the edge connecting start_label to the current node
+
+        Raises:
+            KeyError:   start_label wasn't connected to the current node
+        """
+        del(self.incoming[start_label])
+
+    def is_connected(self, end_label:"Hashable") -> bool:
+        """Returns True iff the node is connected to end_label
+        """
+        return end_label in self.connections
+
+    def forward_star(self) -> GeneratorType:
+        """Returns an iterator of the forward star of the current node
+        """
+        for node in self.connections:
+            yield node
+
+    def backward_star(self) -> GeneratorType:
+        """Returns an iterator of the nodes connected to the current node
+        """
+        for node in self.incoming:
+            yield node
+
+    def get_value(self) -> int:
+        """Returns the current value of the node
+        """
+        return self.value
+
+    def set_value(self, value:int) -> None:
+        """Sets the current value of the node
+        """
+        self.value = value
+
+    def get_weight(self, end_label:"Hashable") -> int:
+        """Returns the current weight to end_label
+
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            return self.connections[end_label].get_weight()
+        except KeyError:
+            raise NoConnection
+
+    def set_weight(self, end_label, weight) -> None:
+        """Sets the current weight to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            self.connections[end_label].set_weight(weight)
+        except KeyError:
+            raise NoConnection
+
+    def get_lbound(self, end_label) -> int:
+        """Returns the current lbound to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            return self.connections[end_label].get_lbound()
+        except KeyError:
+            raise NoConnection
+
+    def set_lbound(self, end_label, lbound) -> None:
+        """Sets the current lbound to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            self.connections[end_label].set_lbound(lbound)
+        except KeyError:
+            raise NoConnection
+
+    def get_ubound(self, end_label) -> int:
+        """Returns the current ubound to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            return self.connections[end_label].get_ubound()
+        except KeyError:
+            raise NoConnection
+
+    def set_ubound(self, end_label, ubound) -> None:
+        """Sets the current ubound to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            self.connections[end_label].set_ubound(ubound)
+        except KeyError:
+            raise NoConnection
+
+    def get_flux(self, end_label) -> int:
+        """Returns the current flux to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            return self.connections[end_label].get_flux()
+        except KeyError:
+            raise NoConnection
+
+    def set_flux(self, end_label, flux) -> None:
+        """Sets the current flux to end_label
+        
+        Raises:
+            NoConnection:   end_label wasn't found
+                            in the connections
+        """
+        try:
+            self.connections[end_label].set_flux(flux)
+        except KeyError:
+            raise NoConnection
+
+    def copy(self, edges:dict=None) -> "Node":
+        """Copies the current node
+
+        Only the outgoing connections are copied: the incoming index
+        refers to edges owned by other nodes, so it has to be rebuilt
+        by the graph owning the copy
+
+        Args:
+            edges:  Optional. Maps the id of the edges already copied
+                    to their copy, so that the edges of an undirected
+                    graph, shared by their two ends, are copied once
+        """
+        new_node = Node(self.label, self.value)
+        for key, edge in self.connections.items():
+            if edges == None:
+                new_node.connections[key] = edge.copy()
+                continue
+            new_edge = edges.get(id(edge))
+            if new_edge == None:
+                new_edge = edges[id(edge)] = edge.copy()
+            new_node.connections[key] = new_edge
+        return new_node
+
+    def copy_on_write(self, owner:object) -> "Node":
+        """Copies the current node for the graph whose token is owner
+
+        The copy shares the edges of the node, which have to be copied
+        in turn before being changed
+        """
+        new_node = Node(self.label, self.value, owner)
+        new_node.connections = self.connections.copy()
+        new_node.incoming = self.incoming.copy()
+        return new_node
+
+    def __str__(self):
+        def comparison_function(item):
+            return _label_key(item[0])
+        if self.value != None:
+            value="({}) ".format(self.value)
+        else:
+            value = ""
+        return "{}{} -> {}".format(
+            value,
+            str(self.label),
+            ", ".join((edge.format(end_label) for end_label, edge in
+                       sorted(self.connections.items(),
+                       key=comparison_function)))
+            )
+
+class Graph():
+    """Graph class
+    """
+
+    def __init__(self, directed=True, cache_size:int=0) -> None:
+        """constructor
+
+        Args:
+            cache_size: Number of shortest path trees to be kept by
+                        dijkstra and bellman, see set_cache_size
+        """
+        self.node_map = {}
+        self.directed = directed
+        self.version = 0
+        self._path_cache = LRUCache(cache_size)
+        # version of the graph the entries of the path cache are for
+        self._cache_version = 0
+        self._frozen = None
+        self._listeners = []
+        # nodes and edges with this owner can be changed in place, the
+        # others are shared with copies of the graph
+        self._token = object()
+        # sorted labels, rebuilt by list_nodes after nodes are added
+        self._node_order = None
+
+    def _mutated(self, event:str, *args) -> None:
+        """Records a change of the graph, invalidating cached results
+        and notifying the listeners
+        """
+        self.version += 1
+        for listener in self._listeners:
+            listener(event, *args)
+
+    def subscribe(self, listener:"Callable") -> None:
+        """Calls listener after every change of the graph
+
+        listener gets the name of the method that made the change
+        followed by the labels involved: the node for add_node and
+        set_node_value, the start and end of the connection for the
+        others
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener:"Callable") -> None:
+        """Stops calling listener after the changes of the graph
+
+        Raises:
+            ValueError: listener wasn't subscribed
+        """
+        self._listeners.remove(listener)
+
+    def set_cache_size(self, cache_size:int) -> None:
+        """Sets the number of shortest path trees to be cached
+
+        dijkstra and bellman keep their results, keyed by source and
+        algorithm, so that repeating a query on an unchanged graph
+        returns the same result Graph; the cache is emptied on the
+        first query after the graph changes. The
+        result must not be changed by the caller: if it is, it's
+        computed again on the following query. With 0 nothing is
+        cached
+        """
+        self._path_cache.resize(cache_size)
+
+    def cache_info(self) -> "CacheInfo":
+        """Returns hits, misses, maxsize and currsize of the path cache
+        """
+        return self._path_cache.info()
+
+    def cache_clear(self) -> None:
+        """Empties the path cache and resets its statistics
+        """
+        self._path_cache.clear()
+
+    def _own(self, label:"Hashable") -> "Node":
+        """Returns the node label, copying it first if it is shared with
+           another graph
+
+        Raises:
+            KeyError:   label wasn't found in the graph
+        """
+        node = self.node_map[label]
+        if node.owner is not self._token:
+            node = node.copy_on_write(self._token)
+            self.node_map[label] = node
+        return node
+
+    def _own_edge(self, start_label:"Hashable",
+                        end_label:"Hashable") -> "Node":
+        """Returns the node start_label, copying it and its edge to
+           end_label first if they are shared with another graph
+
+        Raises:
+            KeyError:   start_label wasn't found in the graph
+        """
+        node = self._own(start_label)
+        edge = node.connections.get(end_label)
+        if edge != None and edge.owner is not self._token:
+            edge = edge.copy()
+            edge.owner = self._token
+            node.connections[end_label] = edge
+            if self.directed:
+                self._own(end_label).incoming[start_label] = edge
+            elif end_label != start_label:
+                self._own(end_label).connections[start_label] = edge
+        return node
+
+    def add_node(self, label:"Hashable", value:int=None) -> None:
+        """Adds a node to the graph
+
+        If label is already in the graph, update its value iff it was None,
+        and a non-None value is supplied
+        """
+        if label not in self.node_map:
+            self.node_map[label] = Node(label, value, self._token)
+            self._node_order = None
+            self._mutated("add_node", label)
+        elif value != None and self.get_node_value(label) == None:
+            self.set_node_value(label, value)
+
+    def add_connection(self, start_label:"Hashable", end_label:"Hashable",
+                             weight:int=None, lbound:int=None,
+                             ubound:int=None, flux:int=None) -> None:
+        """Adds a connection to the graph
+
+        In undirected graphs the edge is shared by the connections of
+        both ends, so it can be read and changed from either of them
+        """
+        self.add_node(start_label)
+        self.add_node(end_label)
+        edge = self._own(start_label).connect(end_label, weight, lbound,
+                                              ubound, flux)
+        if self.directed:
+            self._own(end_label).add_incoming(start_label, edge)
+        elif end_label != start_label:
+            self._own(end_label).share(start_label, edge)
+        self._mutated("add_connection", start_label, end_label)
+
+    def add_nodes_from(self, nodes:"Iterable or Mapping") -> None:
+        """Adds the nodes in a single pass, as add_node does
+
+        The listeners are notified only when there are any; the
+        version changes only when a node is added or gets a value
+
+        Args:
+            nodes:  Either an iterable of labels, possibly a generator,
+                    or a mapping from the labels to their values
+        """
+        node_map = self.node_map
+        listeners = self._listeners
+        token = self._token
+        if hasattr(nodes, "items"):
+            items = nodes.items()
+        else:
+            items = zip(nodes, itertools.repeat(None))
+        changed = False
+        for label, value in items:
+            node = node_map.get(label)
+            if node == None:
+                node_map[label] = Node(label, value, token)
+                self._node_order = None
+                changed = True
+                if listeners:
+                    self._mutated("add_node", label)
+            elif value != None and node.value == None:
+                self._own(label).value = value
+                changed = True
+                if listeners:
+                    self._mutated("set_node_value", label)
+        if changed:
+            self.version += 1
+
+    def add_edges_from(self, edges:"Iterable") -> None:
+        """Adds the edges in a single pass, as add_connection does
+
+        The listeners are notified only when there are any
+
+        Args:
+            edges:  An iterable, possibly a generator, of tuples (start,
+                    end, weight, lbound, ubound, flux); the attributes
+                    can be left out from the end and default to None.
+                    The rows of a NumPy array are converted to Python
+                    numbers
+
+        Raises:
+            ValueError: an edge has less than 2 or more than 6 items
+        """
+        node_map = self.node_map
+        listeners = self._listeners
+        directed = self.directed
+        token = self._token
+        changed = False
+        for edge in edges:
+            if type(edge) is not tuple:
+                edge = tuple(edge.tolist() if hasattr(edge, "tolist")
+                             else edge)
+            if len(edge) != 6:
+                if not 2 <= len(edge) < 6:
+                    raise ValueError("Invalid edge {!r}".format(edge))
+                edge += (None,) * (6 - len(edge))
+            start, end, weight, lbound, ubound, flux = edge
+            for label in (start, end):
+                if label not in node_map:
+                    node_map[label] = Node(label, None, token)
+                    self._node_order = None
+                    if listeners:
+                        self._mutated("add_node", label)
+            node = node_map[start]
+            if node.owner is not token:
+                node = self._own(start)
+            edge = node.connect(end, weight, lbound, ubound, flux)
+            node = node_map[end]
+            if node.owner is not token:
+                node = self._own(end)
+            if directed:
+                node.add_incoming(start, edge)
+            elif end != start:
+                node.share(start, edge)
+            changed = True
+            if listeners:
+                self._mutated("add_connection", start, end)
+        if changed:
+            self.version += 1
+
+    def remove_connection(self, start_label:"Hashable",
+                          end_label:"Hashable") -> None:
+        """Remove a connection from the graph
+
+        Raises:
+            KeyError:   either start_label or end_label weren't found
+                        in the graph
+        """
+        self._own(start_label).remove_connection(end_label)
+        if self.directed:
+            self._own(end_label).remove_incoming(start_label)
+        elif end_label != start_label:
+            self._own(end_label).remove_connection(start_label)
+        self._mutated("remove_connection", start_label, end_label)
+
+    def is_connected(self, start_label:"Hashable", end_label:"Hashable") -> bool:
+        """Returns True iff start_label -> end_label
+        """
+        try:
+            return self.node_map[start_label].is_connected(end_label)
+        except KeyError:
+            return False
+
+    def list_nodes(self, sort:bool=True) -> "Iterator":
+        """Returns an iterator of the nodes currently in the graph
+
+        The sorted order is computed once and kept until a node is
+        added; labels of different types are sorted numbers first,
+        then strings, then the other types by name
+
+        Args:
+            sort:   If False the nodes are given in insertion order
+                    without sorting; the graph must not get new nodes
+                    during the iteration
+        """
+        if not sort:
+            return iter(self.node_map)
+        if self._node_order == None:
+            self._node_order = _sorted_labels(self.node_map)
+        return iter(self._node_order)
+
+    def forward_star(self, start_label:"Hashable") -> GeneratorType:
+        """Returns an iterator of the nodes reachable from start_label
+
+        Raises:
+            KeyError:   start_label wasn't found in the graph
+        """
+        return self.node_map[start_label].forward_star()
+
+    def backward_star(self, end_label:"Hashable") -> GeneratorType:
+        """Returns an iterator of the nodes from which end_label can be reached
+
+        Raises:
+            KeyError:   end_label wasn't found in the graph
+        """
+        if self.directed:
+            return self.node_map[end_label].backward_star()
+        return self.node_map[end_label].forward_star()
+
+    def flux_forward_star(self, start_label:"Hashable") -> GeneratorType:
+        """Returns an iterator of the nodes of the residual graph
+           reachable from start_label
+
+        A node is considered reachable in the residual graph if it's
+        connected to an already reachable node by an edge with flux
+        strictly less than capacity, or if it is connected to a node
+        with flux strictly greater than 0
+
+        Raises:
+            KeyError:   start_label wasn't found in the graph
+        """
+        fs_set = set()
+        for node in self.forward_star(start_label):
+            if self.get_flux(start_label, node) <\
+               self.get_ubound(start_label, node):
+                fs_set.add(node)
+        for node in self.backward_star(start_label):
+            if self.get_flux(node, start_label) > 0:
+                fs_set.add(node)
+        for node in fs_set:
+            yield node
+
+    def get_node_value(self, label:"Hashable") -> int:
+        """Returns the value of the node label
+        
+        Raises:
+            KeyError:   label wasn't found in the graph
+        """
+        return self.node_map[label].get_value()
+
+    def set_node_value(self, label:"Hashable", value:int) -> None:
+        """Sets the value of the node label
+
+        Raises:
+            KeyError:   label wasn't found in the graph
+        """
+        self._own(label).set_value(value)
+        self._mutated("set_node_value", label)
+
+    def get_weight(self, start_label:"Hashable", end_label:"Hashable") -> int:
+        """Returns the current weight from start_label to end_label
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connnected to start_label
+                        
+        """
+        return self.node_map[start_label].get_weight(end_label)
+
+    def set_weight(self, start_label:"Hashable", end_label, weight) -> None:
+        """Sets the current weight from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connnected to start_label
+        """
+        self._own_edge(start_label, end_label).set_weight(end_label, weight)
+        self._mutated("set_weight", start_label, end_label)
+
+    def get_lbound(self, start_label, end_label) -> int:
+        """Returns the current lbound from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        return self.node_map[start_label].get_lbound(end_label)
+
+    def set_lbound(self, start_label, end_label, lbound) -> None:
+        """Sets the current lbound from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        self._own_edge(start_label, end_label).set_lbound(end_label, lbound)
+        self._mutated("set_lbound", start_label, end_label)
+
+    def get_ubound(self, start_label, end_label) -> int:
+        """Returns the current ubound from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        return self.node_map[start_label].get_ubound(end_label)
+
+    def set_ubound(self, start_label, end_label, ubound) -> None:
+        """Sets the current ubound from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        self._own_edge(start_label, end_label).set_ubound(end_label, ubound)
+        self._mutated("set_ubound", start_label, end_label)
+
+    def get_flux(self, start_label, end_label) -> int:
+        """Returns the current flux from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        return self.node_map[start_label].get_flux(end_label)
+
+    def set_flux(self, start_label, end_label, flux) -> None:
+        """Sets the current flux from start_label to end_label
+        
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            NoConnection:   end_label wasn't connected to start_label
+        """
+        self._own_edge(start_label, end_label).set_flux(end_label, flux)
+        self._mutated("set_flux", start_label, end_label)
+
+    def _shortest_path(self, start_node:"Hashable", queue:Queue,
+                             tracer:"Tracer"=None) -> "Graph":
+        """Visits the graph from start_node in the order given by queue
+
+        With a tracer, the queue operations, the pops, the relaxations
+        and the phases are reported to it through hooks bound before
+        the visit; without one the hooks do nothing
+        """
+        popped = relaxed = cycled = _ignore
+        if tracer != None:
+            queue = TracedQueue(queue, tracer)
+            node_map = self.node_map
+            def popped(node, distance):
+                tracer.event("pop", node=node, distance=distance,
+                             queued=queue.qsize())
+                tracer.count("scan", len(node_map[node].connections))
+            def relaxed(node, neighbour, distance, previous):
+                tracer.event("relax", start=node, end=neighbour,
+                             distance=distance, previous=previous)
+            def cycled(cycle):
+                tracer.event("negative_cycle", cycle=cycle)
+
+        with phase(tracer, "initialise"):
+            father = {}
+            distance = {}
+            for node in self.list_nodes(sort=False):
+                distance[node] = float("inf")
+                father[node] = None
+            distance[start_node] = 0
+            father[start_node] = None
+            # number of edges of the path leading to each node: a path
+            # with as many edges as nodes means a negative cycle
+            length = {start_node: 0}
+            cycle_check = len(self.node_map)
+            queue.put(start_node, distance[start_node])
+
+        with phase(tracer, "visit"):
+            while not queue.empty():
+                node = queue.get()
+                popped(node, distance[node])
+                for neighbour in self.forward_star(node):
+                    connection_weight = self.get_weight(node, neighbour)
+                    if not connection_weight:
+                        connection_weight = 0
+                    new_distance = distance[node] + connection_weight
+                    if new_distance < distance[neighbour]:
+                        relaxed(node, neighbour, new_distance,
+                                distance[neighbour])
+                        distance[neighbour] = new_distance
+                        father[neighbour] = node
+                        length[neighbour] = length[node] + 1
+                        if length[neighbour] >= cycle_check:
+                            cycle = _father_cycle(father, neighbour)
+                            if cycle != None:
+                                cycled(cycle)
+                                raise NegativeCycle(cycle)
+                            cycle_check *= 2
+                        if queue.is_in(neighbour):
+                            queue.update(neighbour, distance[neighbour])
+                        else:
+                            queue.put(neighbour, distance[neighbour])
+
+        with phase(tracer, "result"):
+            return self._path_result(start_node, distance, father)
+
+    def _path_result(self, start_node:"Hashable", distance:dict,
+                           father:dict) -> "Graph":
+        result = Graph()
+        result.add_node(start_node,value=0)
+        for node in self.list_nodes(sort=False):
+            if father.get(node) != None:
+                result.add_connection(father[node], node)
+                result.set_node_value(node, distance[node])
+
+        return result
+
+    def _cached_path(self, start_label:"Hashable", algorithm:tuple,
+                           queue:Queue, verbose:bool,
+                           tracer:"Tracer") -> "Graph":
+        if verbose and tracer == None:
+            tracer = Tracer(print_event)
+        if tracer != None or self._path_cache.maxsize <= 0:
+            return self._shortest_path(start_label, queue, tracer)
+        if self._cache_version != self.version:
+            # the entries of older versions can't be hit any more
+            self._path_cache.purge()
+            self._cache_version = self.version
+        key = (start_label, algorithm)
+        cached = self._path_cache.get(
+            key, validate=lambda c: c[0].version == c[1])
+        if cached != None:
+            return cached[0]
+        result = self._shortest_path(start_label, queue)
+        self._path_cache.put(key, (result, result.version))
+        return result
+
+    def _dag_visit(self, start_label:"Hashable", algorithm:str, own:str,
+                         tracer:"Tracer") -> "Graph":
+        """Returns the visit of dag_shortest_path when algorithm asks
+           for it, None when the visit is left to the algorithm own
+
+        Raises:
+            ValueError:     algorithm isn't own, "dag" or "auto"
+            CyclicGraph:    algorithm is "dag" and the graph has a cycle
+        """
+        if algorithm == "auto":
+            algorithm = "dag" if self.freeze().is_dag() else own
+        if algorithm == own:
+            return None
+        if algorithm != "dag":
+            raise ValueError("Unknown algorithm {}".format(algorithm))
+        with phase(tracer, "visit"):
+            return self.dag_shortest_path(start_label)
+
+    def dijkstra(self, start_label:"Hashable", verbose:bool=False,
+                       heap:str="binary", tracer:"Tracer"=None,
+                       algorithm:str="dijkstra") -> "Graph":
+        """Returns the graph of the visit starting from start_label
+
+        Dijkstra's algorithm is used for the visit
+
+        Args:
+            verbose:    Print the events of the visit, see tracer
+            heap:       The priority queue to be used, either "binary"
+                        (indexed binary heap) or "pairing" (pairing heap)
+            tracer:     Optional. A Tracer receiving the pops and the
+                        relaxations as events, the counts of the queue
+                        operations and the timings of the phases; traced
+                        visits bypass the cache
+            algorithm:  "dijkstra", "dag" (see dag_shortest_path, only
+                        the visit is timed by tracer) or "auto", which
+                        picks "dag" when the graph is directed and
+                        acyclic, as shortest_path does
+
+        Raises:
+            ValueError:     heap or algorithm aren't known
+            NegativeCycle:  a negative cycle is reachable from start_label
+            CyclicGraph:    algorithm is "dag" and the graph has a cycle
+        """
+        result = self._dag_visit(start_label, algorithm, "dijkstra", tracer)
+        if result != None:
+            return result
+        if heap == "binary":
+            queue = PriorityQueue()
+        elif heap == "pairing":
+            queue = PairingHeap()
+        else:
+            raise ValueError("Unknown heap {}".format(heap))
+        return self._cached_path(start_label, ("dijkstra", heap), queue,
+                                 verbose, tracer)
+
+    def bellman(self, start_label:"Hashable", verbose:bool=False,
+                      slf:bool=False, lll:bool=False,
+                      tracer:"Tracer"=None,
+                      algorithm:str="bellman") -> "Graph":
+        """Returns the graph of the visit starting from start_label
+
+        Bellman's algorithm is used for the visit, in its queue based
+        (SPFA) form
+
+        Args:
+            verbose:    Print the events of the visit, see tracer
+            slf:        Use the Small Label First queue heuristic
+            lll:        Use the Large Label Last queue heuristic
+            tracer:     Optional. A Tracer, as in dijkstra
+            algorithm:  "bellman", "dag" or "auto", as in dijkstra
+
+        Raises:
+            ValueError:     algorithm isn't known
+            NegativeCycle:  a negative cycle is reachable from start_label
+            CyclicGraph:    algorithm is "dag" and the graph has a cycle
+        """
+        result = self._dag_visit(start_label, algorithm, "bellman", tracer)
+        if result != None:
+            return result
+        queue = FifoQueue(slf, lll)
+        return self._cached_path(start_label, ("bellman", slf, lll), queue,
+                                 verbose, tracer)
+
+    def _neighbours(self) -> "Callable":
+        """Returns a function giving the nodes reachable from a node
+        """
+        node_map = self.node_map
+        return lambda label: node_map[label].connections
+
+    def bfs(self, *start_labels:"Hashable", depth_limit:int=None,
+                  visitor:"Callable"=None, report:str="nodes") -> GeneratorType:
+        """Returns an iterator of the nodes reachable from start_labels,
+           in breadth first order
+
+        The visit is lazy: it goes on only as far as the iterator is
+        consumed. The start nodes are at depth 0. Each node reached is
+        passed to visitor as visitor(node, depth, parent), parent being
+        None for the start nodes: returning False prunes the visit at
+        the node, returning STOP ends it after the node
+
+        Args:
+            depth_limit:    Optional. The visit doesn't go deeper
+            report:         "nodes" to get the nodes, "edges" to get
+                            the pairs (parent, node) of the visit tree,
+                            "events" to get tuples (node, depth, parent)
+
+        Raises:
+            KeyError:   a start label wasn't found in the graph
+            ValueError: report isn't known
+        """
+        return bfs(self._neighbours(), start_labels, depth_limit, visitor,
+                   report)
+
+    def dfs(self, *start_labels:"Hashable", depth_limit:int=None,
+                  visitor:"Callable"=None, report:str="nodes") -> GeneratorType:
+        """Returns an iterator of the nodes reachable from start_labels,
+           in depth first order
+
+        Nodes are given when first reached; the visit keeps an
+        explicit stack, so it isn't limited by the recursion limit.
+        The arguments are the same as bfs
+
+        Raises:
+            KeyError:   a start label wasn't found in the graph
+            ValueError: report isn't known
+        """
+        return dfs(self._neighbours(), start_labels, depth_limit, visitor,
+                   report)
+
+    def is_reachable(self, start_label:"Hashable",
+                           end_label:"Hashable") -> bool:
+        """Returns True iff end_label can be reached from start_label
+
+        The visit stops as soon as end_label is found
+
+        Raises:
+            KeyError:   start_label wasn't found in the graph
+        """
+        for label in self.bfs(start_label):
+            if label == end_label:
+                return True
+        return False
+
+    def strongly_connected_components(self) -> list:
+        """Returns the strongly connected components of the graph
+
+        Tarjan's algorithm is run on the snapshot of the graph (see
+        freeze) with an explicit stack, in linear time
+
+        Returns:
+            A list of components, each one the list of its nodes, in
+            topological order: no edge goes from a component to a
+            previous one
+
+        Raises:
+            ValueError: the graph isn't directed
+        """
+        return self.freeze().strongly_connected_components()
+
+    def connected_components(self) -> list:
+        """Returns the connected components of the graph
+
+        A union-find forest is built from the edges of the snapshot of
+        the graph (see freeze), in nearly linear time; for directed
+        graphs the direction of the edges is ignored, which gives the
+        weakly connected components
+
+        Returns:
+            A list of components, each one the list of its nodes
+        """
+        return self.freeze().connected_components()
+
+    def condensation(self) -> tuple:
+        """Returns the graph of the strongly connected components
+
+        Returns:
+            A tuple (dag, components), where components is the list
+            given by strongly_connected_components and dag a directed
+            acyclic Graph on the indexes of components, with an edge
+            from a component to another whenever an edge of the graph
+            joins them
+
+        Raises:
+            ValueError: the graph isn't directed
+        """
+        frozen = self.freeze()
+        count, component = frozen._strong_components()
+        dag = Graph()
+        dag.add_nodes_from(range(count))
+        dag.add_edges_from(condensation_arcs(frozen.offsets, frozen.targets,
+                                             component))
+        return dag, group(frozen.labels, count, component)
+
+    def topological_order(self) -> list:
+        """Returns the nodes sorted so that every edge goes from a node
+           to a following one
+
+        Kahn's algorithm is run on the snapshot of the graph (see
+        freeze) in linear time, and its result kept with the snapshot
+
+        Raises:
+            ValueError:     the graph isn't directed
+            CyclicGraph:    the graph has a cycle, given by the cycle
+                            attribute of the exception
+        """
+        return self.freeze().topological_order()
+
+    def dag_shortest_path(self, start_label:"Hashable") -> "Graph":
+        """Returns the graph of the visit starting from start_label, as
+           dijkstra does, for a directed acyclic graph
+
+        Each edge is relaxed once, in topological order (see
+        topological_order), so the visit takes linear time and negative
+        weights are allowed
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            ValueError:     the graph isn't directed
+            CyclicGraph:    the graph has a cycle
+        """
+        distance, father = self.freeze().dag_shortest_path(start_label)
+        return self._path_result(start_label, distance, father)
+
+    def dag_longest_path(self, start_label:"Hashable") -> "Graph":
+        """Returns the graph of the longest paths starting from
+           start_label, for a directed acyclic graph
+
+        The node values are the lengths of the longest paths; see
+        dag_shortest_path
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            ValueError:     the graph isn't directed
+            CyclicGraph:    the graph has a cycle
+        """
+        distance, father = self.freeze().dag_longest_path(start_label)
+        return self._path_result(start_label, distance, father)
+
+    def minimum_spanning_tree(self, algorithm:str="kruskal",
+                                    edge_list:bool=False) -> "Graph":
+        """Returns a minimum spanning forest of the graph, with a tree
+           for each connected component
+
+        The forest is computed on the snapshot of the graph (see
+        freeze) in O(E log V) time; missing weights count as 0
+
+        Args:
+            algorithm:  "kruskal" (edges sorted by weight and union-find),
+                        "prim" (indexed binary heap, see PriorityQueue)
+                        or "boruvka" (lightest edge leaving each tree, in
+                        rounds)
+            edge_list:  Return the list of the edges of the forest, as
+                        tuples (start, end, weight), instead of a Graph
+
+        Returns:
+            An undirected Graph with the nodes of the graph and the
+            edges of the forest, or the list of these edges
+
+        Raises:
+            ValueError: algorithm isn't known or the graph is directed
+        """
+        edges = self.freeze().minimum_spanning_tree(algorithm)
+        if edge_list:
+            return edges
+        forest = Graph(False)
+        forest.add_nodes_from({label: node.value for label, node
+                               in self.node_map.items()})
+        forest.add_edges_from(edges)
+        return forest
+
+    def dynamic_shortest_path(self, start_label:"Hashable",
+                                    algorithm:str="dijkstra"
+                                    ) -> "DynamicShortestPath":
+        """Returns the shortest path tree from start_label, kept up to date
+           as the graph changes
+
+        Only the part of the tree affected by each change is computed
+        again; call close on the result to stop following the graph
+
+        Raises:
+            KeyError:       start_label wasn't found in the graph
+            ValueError:     algorithm isn't known
+            NegativeCycle:  a negative cycle is reachable from start_label
+        """
+        return DynamicShortestPath(self, start_label, algorithm)
+
+    def shortest_path(self, source:"Hashable", target:"Hashable",
+                            heuristic:"Callable"=None,
+                            bidirectional:bool=False,
+                            algorithm:str="dijkstra") -> tuple:
+        """Returns the shortest path from source to target
+
+        With Dijkstra's algorithm the search stops as soon as target is
+        settled, so only the part of the graph closer to source than
+        target is visited; weights are assumed to be non negative.
+
+        Args:
+            heuristic:      Optional. A function returning, for a node,
+                            a lower bound of its distance to target;
+                            the search becomes A*
+            bidirectional:  Search from both ends at the same time; it
+                            can't be combined with heuristic
+            algorithm:      "dijkstra", "dag" (edges relaxed in
+                            topological order, see dag_shortest_path,
+                            for directed acyclic graphs with weights of
+                            any sign) or "auto", which picks "dag" when
+                            the graph is acyclic and neither heuristic
+                            nor bidirectional are given; checking takes
+                            linear time, once per version of the graph
+
+        Returns:
+            A tuple (distance, path), where path is the list of the
+            nodes from source to target
+
+        Raises:
+            KeyError:       either source or target weren't found
+                            in the graph
+            NoConnection:   target can't be reached from source
+            ValueError:     both heuristic and bidirectional were given,
+                            or either with "dag", or algorithm isn't
+                            known
+            CyclicGraph:    algorithm is "dag" and the graph has a cycle
+        """
+        if target not in self.node_map:
+            raise KeyError(target)
+        if algorithm == "auto":
+            if heuristic == None and not bidirectional and\
+               self.freeze().is_dag():
+                algorithm = "dag"
+            else:
+                algorithm = "dijkstra"
+        if algorithm == "dag":
+            if heuristic != None or bidirectional:
+                raise ValueError("The DAG algorithm can't use a heuristic "
+                                 "or search bidirectionally")
+            distance, father = self.freeze().dag_shortest_path(source)
+            if target not in distance:
+                raise NoConnection("No path {} -> {}".format(source, target))
+            return (distance[target], _father_path(father, target)[::-1])
+        elif algorithm != "dijkstra":
+            raise ValueError("Unknown algorithm {}".format(algorithm))
+        if bidirectional:
+            if heuristic != None:
+                raise ValueError("A* can't be run bidirectionally")
+            return self._bidirectional_path(source, target)
+        if heuristic == None:
+            heuristic = lambda node: 0
+        distance = {source: 0}
+        father = {source: None}
+        queue = PriorityQueue()
+        queue.put(source, heuristic(source))
+        while not queue.empty():
+            node = queue.get()
+            if node == target:
+                return (distance[node], _father_path(father, node)[::-1])
+            for neighbour in self.forward_star(node):
+                connection_weight = self.get_weight(node, neighbour)
+                if not connection_weight:
+                    connection_weight = 0
+                new_distance = distance[node] + connection_weight
+                if new_distance < distance.get(neighbour, float("inf")):
+                    distance[neighbour] = new_distance
+                    father[neighbour] = node
+                    queue.put(neighbour, new_distance + heuristic(neighbour))
+        raise NoConnection("No path {} -> {}".format(source, target))
+
+    def _bidirectional_path(self, source:"Hashable",
+                                  target:"Hashable") -> tuple:
+        # index 0 is the search from source, index 1 the one from target
+        distance = ({source: 0}, {target: 0})
+        father = ({source: None}, {target: None})
+        settled = (set(), set())
+        queues = (PriorityQueue(), PriorityQueue())
+        queues[0].put(source, 0)
+        queues[1].put(target, 0)
+        best = float("inf")
+        meeting = None
+        if source == target:
+            best, meeting = 0, source
+        while not queues[0].empty() and not queues[1].empty():
+            top = (queues[0].priority(queues[0].peek()) +
+                   queues[1].priority(queues[1].peek()))
+            if top >= best:
+                break
+            side = 0 if queues[0].qsize() <= queues[1].qsize() else 1
+            node = queues[side].get()
+            settled[side].add(node)
+            if side == 0:
+                star = self.forward_star(node)
+            else:
+                star = self.backward_star(node)
+            for neighbour in star:
+                if side == 0:
+                    connection_weight = self.get_weight(node, neighbour)
+                else:
+                    connection_weight = self.get_weight(neighbour, node)
+                if not connection_weight:
+                    connection_weight = 0
+                new_distance = distance[side][node] + connection_weight
+                if neighbour in settled[side]:
+                    continue
+                if new_distance < distance[side].get(neighbour,
+                                                     float("inf")):
+                    distance[side][neighbour] = new_distance
+                    father[side][neighbour] = node
+                    queues[side].put(neighbour, new_distance)
+                if neighbour in distance[1-side]:
+                    total = distance[side][neighbour] +\
+                            distance[1-side][neighbour]
+                    if total < best:
+                        best, meeting = total, neighbour
+        if meeting == None:
+            raise NoConnection("No path {} -> {}".format(source, target))
+        path = _father_path(father[0], meeting)[::-1] +\
+               _father_path(father[1], meeting)[1:]
+        return (best, path)
+
+    def multi_source_shortest_paths(self, sources:"Iterable",
+                                          workers:int=None,
+                                          algorithm:str="dijkstra"
+                                          ) -> GeneratorType:
+        """Returns an iterator of the visits starting from each source
+
+        The visits are spread over a pool of worker processes, which
+        share a single snapshot of the graph (see freeze). Each item
+        is a tuple (source, distance, father), where distance and
+        father map every node reached from source to its distance and
+        to its father in the visit, the source having father None
+
+        Args:
+            workers:    Number of worker processes, by default one per
+                        CPU; with 1 no process is started
+            algorithm:  Either "dijkstra" or "bellman"
+
+        Raises:
+            KeyError:       a source wasn't found in the graph
+            ValueError:     algorithm isn't known
+            NegativeCycle:  a negative cycle is reachable from a source
+        """
+        from ._parallel import multi_source
+        return multi_source(self.freeze(), list(sources), workers,
+                            algorithm)
+
+    def all_pairs_shortest_paths(self, workers:int=None,
+                                       algorithm:str="dijkstra") -> dict:
+        """Returns the distances between every pair of nodes
+
+        The result maps each node to the map of the distances of the
+        nodes reachable from it; see multi_source_shortest_paths
+        """
+        return {source: distance for source, distance, _ in
+                self.multi_source_shortest_paths(self.node_map.keys(),
+                                                 workers, algorithm)}
+
+    def _dot_nodes(self) -> GeneratorType:
+        """Returns an iterator of the (label, value) of the nodes needing
+           a node statement: the ones with a value and the isolated ones
+        """
+        for label in self.list_nodes():
+            node = self.node_map[label]
+            if node.value != None or\
+               not (node.connections or node.incoming):
+                yield label, node.value
+
+    def _dot_edges(self) -> GeneratorType:
+        # undirected edges are written from the end listed first
+        done = set()
+        for label in self.list_nodes():
+            for end_label, edge in self.node_map[label].connections.items():
+                if end_label not in done:
+                    yield (label, end_label, edge.weight, edge.lbound,
+                           edge.ubound, edge.flux)
+            if not self.directed:
+                done.add(label)
+
+    def write_dot(self, file:"str or IO", chunk_size:int=1<<16) -> None:
+        """Writes the graph in the Graphviz DOT format
+
+        The weight of an edge is written as its label, the other
+        attributes as lbound, ubound and flux, the node values as
+        value; the file can be read back with parse_dot. The output is
+        written chunk_size characters at a time
+
+        Args:
+            file:   Either a file name or a text or binary stream
+        """
+        if isinstance(file, str):
+            with open(file, "w", encoding="utf-8") as f:
+                self.write_dot(f, chunk_size)
+            return
+        from ._dot import dump_dot
+        dump_dot(self.directed, self._dot_nodes(), self._dot_edges(), file,
+                 chunk_size)
+
+    def create_img(self, name_file:str, format:str="jpg",
+                         wait:bool=True) -> "Future":
+        """Renders the graph to the file name_file with Graphviz dot
+
+        Args:
+            format: The output format passed to dot
+            wait:   If False the graph is rendered in a background
+                    thread from a snapshot (see freeze), so the graph
+                    can be changed meanwhile
+
+        Returns:
+            None, or a Future completed when the file has been written
+            if wait is False
+
+        Raises:
+            FileNotFoundError:              dot wasn't found
+            subprocess.CalledProcessError:  dot failed
+        """
+        from ._dot import render_dot, render_dot_async
+        if wait:
+            render_dot(self.directed, self._dot_nodes(), self._dot_edges(),
+                       name_file, format)
+            return None
+        frozen = self.freeze()
+        return render_dot_async(self.directed, frozen._dot_nodes(),
+                                frozen._edges(), name_file, format)
+
+    def residual_graph(self) -> "Graph":
+        """Create the residual graph of the current flow
+        """
+        def _to_be_inserted(rg, s, e, w):
+            return (not rg.is_connected(s,e)) or (rg.get_weight != None and
+                                                  rg.get_weight(s,e) < w)
+
+        residual_g = Graph()
+        for node in self.list_nodes():
+            for end_node in self.forward_star(node):
+                w = self.get_weight(node, end_node)
+                if _to_be_inserted(residual_g, node, end_node, w):
+                    residual_ubound = self.get_ubound(node, end_node) -\
+                                      self.get_flux(node, end_node)
+                    if residual_ubound > 0:
+                        residual_g.add_connection(
+                            node, end_node,
+                            ubound=residual_ubound,
+                            weight=w
+                            )
+                if w != None:
+                    w = w * (-1)
+                if _to_be_inserted(residual_g, end_node, node, w):
+                    residual_ubound = self.get_flux(node, end_node)
+                    if residual_ubound > 0:
+                        residual_g.add_connection(
+                            end_node, node,
+                            ubound=residual_ubound,
+                            weight=w
+                            )
+        return residual_g
+
+    def max_flux(self, start:"Hashable", end:"Hashable",
+                       algorithm:str="dinic", tracer:"Tracer"=None) -> int:
+        """Turns the current flux into a maximum flux from start to end
+
+        The flux is computed on a residual network built from the
+        snapshot of the graph (see freeze), then written back to the
+        edges whose flux changed. Edges without ubound are considered
+        of infinite capacity
+
+        Args:
+            algorithm:  The max flux engine: "dinic" (level graphs and
+                        blocking flows), "push_relabel" (highest label
+                        with gap heuristic) or "edmonds_karp" (shortest
+                        augmenting paths)
+            tracer:     Optional. A Tracer timing the snapshot, the
+                        engine and the write back, and receiving the
+                        events of the engine
+
+        Returns:
+            The value of the flux, i.e. the total flux leaving start
+
+        Raises:
+            KeyError:   either start or end weren't found in the graph
+            ValueError: algorithm isn't known, the graph isn't directed
+                        or the flux is unbounded
+        """
+        with phase(tracer, "freeze"):
+            frozen = self.freeze()
+        value, flux = frozen.max_flux(start, end, algorithm, tracer)
+        with phase(tracer, "write back"):
+            self._write_flux(flux)
+        return value
+
+    def min_cost_flow(self, supplies:dict) -> int:
+        """Sets the flux to a minimum cost flux meeting the supplies
+
+        Weights are the costs per unit of flux, and the flux of each
+        edge is kept between lbound and ubound (0 and infinity when
+        missing); the current flux is ignored. Lower bounds are
+        removed with the standard transformation and edges of negative
+        cost saturated, then successive shortest paths with Johnson
+        potentials are used
+
+        Args:
+            supplies:   Maps nodes to their supply, positive for
+                        sources and negative for sinks; missing nodes
+                        have 0
+
+        Returns:
+            The total cost of the flux
+
+        Raises:
+            KeyError:   a node of supplies wasn't found in the graph
+            ValueError: the supplies don't balance or can't be met, the
+                        bounds are inconsistent, there is a cycle of
+                        negative cost without ubound on any edge or the
+                        graph isn't directed
+        """
+        cost, flux = self.freeze().min_cost_flow(supplies)
+        self._write_flux(flux)
+        return cost
+
+    def _write_flux(self, flux:list) -> None:
+        """Sets the flux of each edge from a list parallel to the arcs
+           of the snapshot, skipping the unchanged ones
+
+        Edges without flux get 0, so that every edge has one afterwards
+        """
+        arc = 0
+        for label, node in list(self.node_map.items()):
+            for end_label, edge in list(node.connections.items()):
+                if edge.flux == None or flux[arc] != edge.flux:
+                    self.set_flux(label, end_label, flux[arc])
+                arc += 1
+
+    def copy(self, flatten:bool=False) -> "Graph":
+        """Copy current graph
+
+        The copy is made on write: the two graphs share their nodes
+        and edges, and each one copies a node or an edge only when
+        changing it, so the changes take memory proportional to their
+        size. Copying itself copies the dict of the nodes, a reference
+        per node, and doesn't depend on the changes made afterwards; an
+        overlay looking the nodes up in its parent would avoid that
+        copy, at the price of slower lookups on every access
+
+        Args:
+            flatten:    Copy every node and edge right away, as flatten
+                        does
+        """
+        new_graph = Graph(self.directed, self._path_cache.maxsize)
+        new_graph._node_order = self._node_order
+        if flatten:
+            token = new_graph._token
+            edges = {}
+            for label in self.node_map.keys():
+                node = self.node_map[label].copy(edges)
+                node.owner = token
+                for edge in node.connections.values():
+                    edge.owner = token
+                new_graph.node_map[label] = node
+            if self.directed:
+                for label, node in new_graph.node_map.items():
+                    for end_label, edge in node.connections.items():
+                        new_graph.node_map[end_label].add_incoming(label,
+                                                                   edge)
+            return new_graph
+        new_graph.node_map = self.node_map.copy()
+        # the shared nodes belong to neither graph from now on
+        self._token = object()
+        if self._frozen != None and self._frozen[0] == self.version:
+            new_graph._frozen = (new_graph.version, self._frozen[1])
+        return new_graph
+
+    def flatten(self) -> None:
+        """Copies the nodes and edges still shared with other graphs by
+           copy, so that the graph no longer depends on them
+        """
+        for label in list(self.node_map.keys()):
+            for end_label in list(self._own(label).connections.keys()):
+                self._own_edge(label, end_label)
+
+    def freeze(self) -> "FrozenGraph":
+        """Returns an immutable compressed sparse row snapshot of the graph
+
+        The snapshot doesn't follow later changes to the graph; it is
+        reused by the following calls until the graph changes
+        """
+        if self._frozen == None or self._frozen[0] != self.version:
+            self._frozen = (self.version, FrozenGraph.from_graph(self))
+        return self._frozen[1]
+
+    def save_binary(self, path:str) -> None:
+        """Writes the graph to the file path in a compact binary format
+
+        The file holds the arrays of the snapshot of the graph (see
+        freeze) and can be read back with load_binary. Labels and node
+        values must be None, int, float or str
+
+        Raises:
+            TypeError:  a label, value or edge attribute can't be stored
+        """
+        from ._binary import write_binary
+        write_binary(self.freeze(), path)
+
+    def __str__(self):
+        graph_list = []
+        for node in self.list_nodes():
+            graph_list.append(str(self.node_map[node]))
+        return "\n".join(graph_list) 
+
+def _label_key(label:"Hashable") -> tuple:
+    """Sort key putting numbers first, then strings, then the other
+       labels grouped by type
+    """
+    if isinstance(label, (int, float)):
+        return (0, "", label)
+    if isinstance(label, str):
+        return (1, "", label)
+    return (2, type(label).__name__, label)
+
+def _sorted_labels(labels:"Iterable") -> list:
+    """Returns the labels sorted, by _label_key if they can't be
+       compared to each other
+    """
+    try:
+        return sorted(labels)
+    except TypeError:
+        return sorted(labels, key=_label_key)
+
+def _father_path(father:dict, node:"Hashable") -> list:
+    """Returns the list of the nodes from node up to the root of the
+       father map
+    """
+    path = [node]
+    while father[node] != None:
+        node = father[node]
+        path.append(node)
+    return path
+
+def _ignore(*args) -> None:
+    """Hook of the untraced visits
+    """
+
+def _father_cycle(father:dict, start:"Hashable") -> list:
+    """Returns a cycle of the father map, None if there are none
+
+    The father chain of start is tried first, then the whole map
+    """
+    state = {}
+    for origin in itertools.chain([start], father):
+        node = origin
+        path = []
+        while node != None and node not in state:
+            state[node] = origin
+            path.append(node)
+            node = father[node]
+        if node != None and state[node] == origin:
+            cycle = path[path.index(node):]
+            return cycle[::-1]
+    return None
+
+# compiled by _compile_regexes on the first parse
+_STATEMENT_REGEX = None
+_ATTRIBUTE_REGEX = None
+_ATTRIBUTE_INDEX = {"$": 0, "b": 1, "B": 2, "~": 3}
+
+def _parse_label(label:str) -> "Hashable":
+    try:
+        return int(label)
+    except ValueError:
+        return label
+
+def _compile_regexes() -> None:
+    global _STATEMENT_REGEX, _ATTRIBUTE_REGEX
+    import re
+    # the attributes come either after the end label or, as written by
+    # Edge.format, in parentheses before it
+    _STATEMENT_REGEX = re.compile(r"(\w+).*?->\s*(\([^)]*\))?.*?(\w+)(.*)",
+                                  re.DOTALL)
+    _ATTRIBUTE_REGEX = re.compile(r"([$bB~])(-?\d+)")
+
+def _parse_statement(statement:str) -> tuple:
+    """Parses a single statement, returning None if it isn't an edge
+
+    The regexes must have been compiled, see _compile_regexes
+    """
+    match = _STATEMENT_REGEX.search(statement)
+    if not match:
+        return None
+    start, before, end, rest = match.groups()
+    if before != None:
+        rest = before + rest
+    attributes = [None, None, None, None]
+    for name, value in _ATTRIBUTE_REGEX.findall(rest):
+        i = _ATTRIBUTE_INDEX[name]
+        if attributes[i] == None:
+            attributes[i] = int(value)
+    weight, lbound, ubound, flux = attributes
+    if flux == None and ubound != None:
+        flux = 0
+    return (_parse_label(start), _parse_label(end),
+            weight, lbound, ubound, flux)
+
+def iter_edges(file:"str or TextIO", chunk_size:int=1<<16) -> GeneratorType:
+    """Returns an iterator of the edges in file, without loading it whole
+
+    file is either a file name or a text stream in the format of
+    test.data: statements separated by ';', each one an edge
+    "start -> end", optionally followed by its attributes ($weight,
+    blbound, Bubound, ~flux); the flux defaults to 0 when an ubound
+    is given. The edges written by Edge.format, "start -> (attributes
+    separated by ';')end", are read too. The file is read chunk_size characters at a time and
+    each statement is scanned once.
+
+    Returns:
+        An iterator of tuples (start, end, weight, lbound, ubound, flux),
+        missing attributes being None
+
+    Raises:
+        FileNotFoundError:  no file called file was found
+    """
+    if isinstance(file, str):
+        with open(file) as f:
+            yield from iter_edges(f, chunk_size)
+        return
+    if _STATEMENT_REGEX == None:
+        _compile_regexes()
+    pending = ""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        pieces = (pending + chunk).split(";")
+        pending = pieces.pop()
+        statement = None
+        for piece in pieces:
+            statement = piece if statement == None else statement + ";" + piece
+            # a ';' within parentheses separates attributes
+            if statement.count("(") > statement.count(")"):
+                continue
+            edge = _parse_statement(statement)
+            if edge != None:
+                yield edge
+            statement = None
+        if statement != None:
+            pending = statement + ";" + pending
+    edge = _parse_statement(pending)
+    if edge != None:
+        yield edge
+
+def load_binary(path:str, frozen:bool=False) -> "Graph":
+    """Loads a graph written by Graph.save_binary
+
+    The file is memory mapped, so processes loading the same file
+    share its pages
+
+    Args:
+        frozen: Return the read-only snapshot over the mapped file,
+                without building a Graph
+
+    Raises:
+        FileNotFoundError:  no file called path was found
+        ValueError:         path isn't a binary graph
+    """
+    from ._binary import read_binary
+    snapshot = read_binary(path)
+    if frozen:
+        return snapshot
+    return snapshot.thaw()
+
+def parse_dot(file:"str or TextIO", chunk_size:int=1<<16) -> "Graph":
+    """Parses a graph from a Graphviz DOT file, as written by write_dot
+
+    file is either a file name or a text stream, read chunk_size
+    characters at a time. digraph files give directed graphs, graph
+    files undirected ones. The weight of an edge is taken from its
+    weight attribute or from a numeric label, the other attributes
+    from lbound, ubound and flux; node values from value. Unquoted
+    numeric IDs are read as numbers
+
+    Raises:
+        FileNotFoundError:  no file called file was found
+        ValueError:         file isn't a valid DOT file
+    """
+    from ._dot import iter_dot, edge_fields, node_value
+    statements = iter_dot(file, chunk_size)
+    kind, directed = next(statements)
+    g = Graph(directed)
+    def edges():
+        for statement in statements:
+            if statement[0] == "edge":
+                _, start, end, attributes = statement
+                yield (start, end) + edge_fields(attributes)
+            else:
+                _, label, attributes = statement
+                g.add_node(label, node_value(attributes))
+    g.add_edges_from(edges())
+    return g
+
+def parse_graph(file_name:str) -> "Graph":
+    """Parses a graph from the file file_name
+
+    An example of the graph format is in the file test.data; see
+    iter_edges
+
+    Raises:
+        FileNotFoundError:  no file called file_name was found
+    """
+    g = Graph()
+    g.add_edges_from(iter_edges(file_name))
+    return g
+
+def _run_file(path:str, mode:str, source:"Hashable", dest:"Hashable",
+              algorithm:str, verbose:bool) -> None:
+    """Runs the command line on the graph file path, printing the
+       results, outside batch mode
+    """
+    try:
+        g = parse_graph(path)
+    except FileNotFoundError:
+        print("ERROR: File {} not found".format(path))
+        return
+    if mode == "path":
+        print("Shortest path algorithm")
+        print(g)
+        if source == None:
+            source = 1
+            print("Source not specified, assuming 1")
+        if algorithm in (None, "dijkstra"):
+            print("Dijkstra:")
+            print(g.dijkstra(source, verbose))
+        if algorithm in (None, "bellman"):
+            print("Bellman:")
+            print(g.bellman(source, verbose))
+    elif mode == "flux":
+        print("Max flux algorithm")
+        print(g)
+        if source == None or dest == None:
+            print("Source or dest not specified from {}".format(path))
+            return
+        g_flux = g.copy()
+        g_flux.max_flux(source, dest, algorithm or "dinic")
+        print(g_flux)
+
+def main(argv:list=None) -> int:
+    """Runs the pgraph command line on argv, sys.argv[1:] by default
+
+    Each graph file is processed, in order, with the options given
+    before it: -p (shortest paths, the default) or -f
+    (max flux) select the mode, -s and -d the source and the dest,
+    -a the algorithm and -q turns off the verbose output. With -b the
+    files and directories are instead processed together at the end
+    by a pool of -j worker processes, writing JSON lines to stdout or
+    to the file given with -o (see _batch.run_batch)
+
+    The algorithms given with -a are checked against the mode of the
+    files they apply to before any file is processed
+
+    Returns:
+        The exit status: 2 if an algorithm isn't known, 1 if a file
+        failed in batch mode, else 0
+    """
+    if argv == None:
+        argv = sys.argv[1:]
+    mode = "path"
+    # the option waiting for its value, if any
+    option = None
+    source = None
+    dest = None
+    algorithm = None
+    verbose = True
+    batch = False
+    workers = None
+    output = None
+    files = []
+    # the graph files outside batch mode, with the options given
+    # before each one
+    jobs = []
+    for a in argv:
+        if option == "-s":
+            source = _parse_label(a)
+        elif option == "-d":
+            dest = _parse_label(a)
+        elif option == "-a":
+            algorithm = a
+        elif option == "-j":
+            workers = int(a)
+        elif option == "-o":
+            output = a
+        elif a in ("-s", "-d", "-a", "-j", "-o"):
+            option = a
+            continue
+        elif a == "-p":
+            mode = "path"
+        elif a == "-f":
+            mode = "flux"
+        elif a == "-q":
+            verbose = False
+        elif a == "-b":
+            batch = True
+        elif batch:
+            files.append(a)
+        else:
+            jobs.append((a, mode, source, dest, algorithm, verbose))
+        option = None
+
+    checks = {(job[1], job[4]) for job in jobs if job[4] != None}
+    if batch and algorithm != None:
+        checks.add((mode, algorithm))
+    if checks:
+        from ._batch import PATH_ALGORITHMS, FLUX_ALGORITHMS
+    for check_mode, check_algorithm in sorted(checks):
+        known = PATH_ALGORITHMS if check_mode == "path" else FLUX_ALGORITHMS
+        if check_algorithm not in known:
+            print("ERROR: Unknown {} algorithm {}, expected one of {}".format(
+                  check_mode, check_algorithm, ", ".join(known)))
+            return 2
+    for job in jobs:
+        _run_file(*job)
+    if batch:
+        from ._batch import run_batch, PATH_ALGORITHMS
+        if algorithm != None:
+            algorithms = (algorithm,)
+        else:
+            algorithms = PATH_ALGORITHMS if mode == "path" else ("dinic",)
+        out = open(output, "w") if output != None else sys.stdout
+        try:
+            failed = run_batch(files, out, mode, algorithms,
+                               source if source != None else 1, dest,
+                               workers)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 1 if failed else 0
+    return 0
@@ -0,0 +1,29 @@
+import pytest
+
+from pgraph.graph import Graph, load_binary
+
+def test_round_trip_keeps_mixed_int_and_float_attributes(tmp_path):
+    graph = Graph(directed=True)
+    graph.add_connection(1, 2, weight=3, ubound=10)
+    graph.add_connection(2, 3, weight=2.5, lbound=1, flux=7)
+    graph.add_connection(3, 1, weight=4, lbound=1.5, flux=2**62 + 1)
+    graph.add_connection(1, 3)
+    path = str(tmp_path / "graph.bin")
+    graph.save_binary(path)
+    loaded = load_binary(path)
+    for start, end, attributes in (
+            (1, 2, (3, None, 10, None)),
+            (2, 3, (2.5, 1, None, 7)),
+            (3, 1, (4, 1.5, None, 2**62 + 1)),
+            (1, 3, (None, None, None, None))):
+        values = (loaded.get_weight(start, end), loaded.get_lbound(start, end),
+                  loaded.get_ubound(start, end), loaded.get_flux(start, end))
+        assert values == attributes
+        assert [type(v) for v in values] == [type(v) for v in attributes]
+
+def test_integers_too_large_for_floats_are_refused(tmp_path):
+    graph = Graph(directed=True)
+    graph.add_connection(1, 2, weight=2**63 + 1)
+    graph.add_connection(2, 3, weight=2.5)
+    with pytest.raises(TypeError):
+        graph.save_binary(str(tmp_path / "graph.bin"))
@@ -0,0 +1,69 @@
+import pytest
+
+from pgraph.graph import Graph
+
+def small_graph(cache_size=128):
+    graph = Graph(directed=True, cache_size=cache_size)
+    graph.add_connection(1, 2, 2)
+    graph.add_connection(2, 3, 1)
+    graph.add_connection(1, 3, 5)
+    return graph
+
+def test_repeated_query_is_a_hit():
+    graph = small_graph()
+    tree = graph.dijkstra(1)
+    assert graph.dijkstra(1) is tree
+    info = graph.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+    assert graph.bellman(1) is not tree
+    assert graph.cache_info().misses == 2
+
+@pytest.mark.parametrize("mutate", [
+    lambda g: g.set_weight(1, 3, 1),
+    lambda g: g.set_flux(1, 2, 0),
+    lambda g: g.add_node(4),
+    lambda g: g.add_connection(3, 4, 1),
+    lambda g: g.remove_connection(1, 3),
+])
+def test_mutators_invalidate(mutate):
+    graph = small_graph()
+    tree = graph.dijkstra(1)
+    mutate(graph)
+    assert graph.dijkstra(1) is not tree
+    info = graph.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 2, 1)
+
+def test_stale_entries_are_dropped():
+    graph = small_graph()
+    graph.dijkstra(1)
+    graph.dijkstra(2)
+    graph.set_weight(1, 2, 3)
+    graph.dijkstra(1)
+    assert graph.cache_info().currsize == 1
+
+def test_lru_eviction():
+    graph = small_graph(cache_size=2)
+    trees = {source: graph.dijkstra(source) for source in (1, 2)}
+    assert graph.dijkstra(1) is trees[1]
+    graph.dijkstra(3)
+    # 2 was the least recently used
+    assert graph.cache_info().currsize == 2
+    assert graph.dijkstra(1) is trees[1]
+    assert graph.dijkstra(2) is not trees[2]
+
+def test_cache_size_zero():
+    graph = small_graph()
+    graph.dijkstra(1)
+    graph.set_cache_size(0)
+    assert graph.cache_info().currsize == 0
+    assert graph.dijkstra(1) is not graph.dijkstra(1)
+    assert graph.cache_info().currsize == 0
+
+def test_mutated_result_is_recomputed():
+    graph = small_graph()
+    tree = graph.dijkstra(1)
+    tree.set_node_value(3, 100)
+    again = graph.dijkstra(1)
+    assert again is not tree
+    assert again.get_node_value(3) == 3
+    assert graph.dijkstra(1) is again
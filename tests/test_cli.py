@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from pgraph.graph import main
+from pgraph._batch import run_batch
+
+GRAPH = "1 -> 2 ($2); 1 -> 3 ($5);\n2 -> 3 ($1);\n"
+
+def write(path, text=GRAPH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+def test_path_mode(tmp_path, capsys):
+    assert main(["-q", "-a", "dijkstra", write(tmp_path / "g.data")]) == 0
+    out = capsys.readouterr().out
+    assert "Dijkstra:" in out and "Bellman:" not in out
+
+@pytest.mark.parametrize("argv", [["-a", "bogus"], ["-f", "-s", "1", "-d", "3",
+                                                   "-a", "bogus"],
+                                  ["-a", "dinic"], ["-f", "-a", "bellman"],
+                                  ["-b", "-a", "bogus"],
+                                  ["-b", "-f", "-a", "dijkstra"]])
+def test_unknown_algorithm(tmp_path, capsys, argv):
+    assert main(["-q"] + argv + [write(tmp_path / "g.data")]) == 2
+    out = capsys.readouterr().out
+    assert out.startswith("ERROR: Unknown")
+    assert "algorithm" in out and "Traceback" not in out
+    assert out.count("\n") == 1
+
+def test_algorithm_checked_against_mode_of_each_file(tmp_path, capsys):
+    path = write(tmp_path / "g.data")
+    argv = ["-q", "-a", "dinic", "-f", "-s", "1", "-d", "3", path, "-p", path]
+    assert main(argv) == 2
+    assert "Max flux" not in capsys.readouterr().out
+
+def test_batch_writes_json_lines_in_input_order(tmp_path):
+    paths = [write(tmp_path / "dir" / "b.data"),
+             write(tmp_path / "dir" / "sub" / "a.gv",
+                   "digraph { 1 -> 2 [label=4] }"),
+             write(tmp_path / "dir" / "a.data", "1 -> 3 ($7);\n"),
+             write(tmp_path / "dir" / "notes.txt", "not a graph")]
+    single = write(tmp_path / "z.data")
+    output = tmp_path / "out.jsonl"
+    assert main(["-q", "-b", "-j", "2", "-o", str(output),
+                 single, str(tmp_path / "dir")]) == 0
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [r["file"] for r in results] == [single, paths[2], paths[0],
+                                            paths[1]]
+    assert results[1]["dijkstra"]["distance"] == {"1": 0, "3": 7}
+    assert results[3]["bellman"]["distance"] == {"1": 0, "2": 4}
+    for result in results:
+        assert result["dijkstra"] == result["bellman"]
+
+def test_batch_reports_errors(tmp_path, capsys):
+    good = write(tmp_path / "good.data")
+    missing = str(tmp_path / "missing.data")
+    assert main(["-q", "-b", "-j", "1", good, missing]) == 1
+    results = [json.loads(line)
+               for line in capsys.readouterr().out.splitlines()]
+    assert [r["file"] for r in results] == [good, missing]
+    assert "error" not in results[0]
+    assert results[1]["error"].startswith("FileNotFoundError")
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(tmp_path, workers):
+    paths = [write(tmp_path / "{}.data".format(i),
+                   "1 -> 2 (B1);\n2 -> 3 (B1);\n1 -> 3 (B{});\n".format(i))
+             for i in range(5)]
+    output = io.StringIO()
+    assert run_batch(paths + [str(tmp_path / "missing.data")], output,
+                     "flux", ("dinic",), 1, 3, workers) == 1
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r["file"] for r in results[:-1]] == paths
+    assert [r["dinic"] for r in results[:-1]] == [1, 2, 3, 4, 5]
+    assert "error" in results[-1]
+    with pytest.raises(ValueError):
+        run_batch(paths, output, "path", ("dinic",))
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from pgraph.graph import Graph
+
+def random_graph(seed, n=30, m=45, directed=True):
+    rng = random.Random(seed)
+    graph = Graph(directed)
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from((rng.randrange(n), rng.randrange(n))
+                         for _ in range(m))
+    return graph
+
+def reachable(graph, start):
+    return set(graph.bfs(start))
+
+def test_strongly_connected_components():
+    graph = Graph(directed=True)
+    graph.add_edges_from([(1, 2), (2, 3), (3, 1), (3, 4), (4, 5), (5, 4),
+                          (6, 6)])
+    components = graph.strongly_connected_components()
+    assert sorted(sorted(c) for c in components) == [[1, 2, 3], [4, 5], [6]]
+    position = {node: i for i, c in enumerate(components) for node in c}
+    assert position[1] < position[4]
+
+def test_strongly_connected_components_random():
+    for seed in range(5):
+        graph = random_graph(seed)
+        components = graph.strongly_connected_components()
+        assert sorted(n for c in components for n in c) == list(range(30))
+        position = {node: i for i, c in enumerate(components)
+                    for node in c}
+        reach = {node: reachable(graph, node) for node in range(30)}
+        for a in range(30):
+            for b in range(30):
+                together = a in reach[b] and b in reach[a]
+                assert (position[a] == position[b]) == together
+            for b in graph.forward_star(a):
+                assert position[a] <= position[b]
+
+def test_strongly_connected_components_on_long_path():
+    graph = Graph(directed=True)
+    graph.add_edges_from((i, i + 1) for i in range(20000))
+    graph.add_connection(20000, 0)
+    assert len(graph.strongly_connected_components()) == 1
+
+def test_condensation():
+    graph = random_graph(3)
+    dag, components = graph.condensation()
+    assert components == graph.strongly_connected_components()
+    assert sorted(dag.list_nodes()) == list(range(len(components)))
+    position = {node: i for i, c in enumerate(components) for node in c}
+    arcs = {(position[a], position[b]) for a in graph.list_nodes()
+            for b in graph.forward_star(a) if position[a] != position[b]}
+    assert {(a, b) for a in dag.list_nodes()
+            for b in dag.forward_star(a)} == arcs
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_connected_components(directed):
+    for seed in range(5):
+        graph = random_graph(seed, directed=directed)
+        undirected = Graph(directed=False)
+        undirected.add_nodes_from(graph.list_nodes())
+        undirected.add_edges_from((a, b) for a in graph.list_nodes()
+                                  for b in graph.forward_star(a))
+        components = graph.connected_components()
+        assert sorted(n for c in components for n in c) == list(range(30))
+        for component in components:
+            assert reachable(undirected, component[0]) == set(component)
+
+def test_strong_components_need_a_directed_graph():
+    graph = Graph(directed=False)
+    graph.add_connection(1, 2)
+    with pytest.raises(ValueError):
+        graph.strongly_connected_components()
+    with pytest.raises(ValueError):
+        graph.condensation()
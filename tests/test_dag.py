@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from pgraph._errors import CyclicGraph, NoConnection
+from pgraph.graph import Graph
+
+def random_dag(seed, n=30, m=90, sign=1):
+    """Random DAG whose edges go from smaller to larger nodes, with
+       weights of both signs, multiplied by sign
+    """
+    rng = random.Random(seed)
+    order = list(range(n))
+    rng.shuffle(order)
+    graph = Graph(directed=True)
+    graph.add_nodes_from(order)
+    for _ in range(m):
+        start, end = sorted(rng.sample(range(n), 2))
+        graph.add_connection(start, end, sign * rng.randint(-10, 10))
+    return graph
+
+def distances(tree):
+    return {node: tree.get_node_value(node) for node in tree.list_nodes()}
+
+def test_topological_order():
+    for seed in range(5):
+        graph = random_dag(seed)
+        order = graph.topological_order()
+        assert sorted(order) == list(range(30))
+        position = {node: i for i, node in enumerate(order)}
+        for start in graph.list_nodes():
+            for end in graph.forward_star(start):
+                assert position[start] < position[end]
+
+def test_cycle_is_reported():
+    graph = random_dag(0)
+    graph.add_connection(29, 0)
+    graph.add_connection(0, 29)
+    with pytest.raises(CyclicGraph) as error:
+        graph.topological_order()
+    cycle = error.value.cycle
+    assert len(cycle) >= 2
+    for start, end in zip(cycle, cycle[1:] + cycle[:1]):
+        assert graph.is_connected(start, end)
+    with pytest.raises(CyclicGraph):
+        graph.dag_shortest_path(0)
+
+def test_dag_shortest_path_matches_bellman():
+    for seed in range(5):
+        graph = random_dag(seed)
+        for source in (0, 5):
+            tree = graph.dag_shortest_path(source)
+            assert distances(tree) == distances(graph.bellman(source))
+            for node in tree.list_nodes():
+                for father in tree.backward_star(node):
+                    assert tree.get_node_value(father) +\
+                           graph.get_weight(father, node) ==\
+                           tree.get_node_value(node)
+
+def test_dag_longest_path():
+    for seed in range(5):
+        graph = random_dag(seed)
+        negated = random_dag(seed, sign=-1)
+        longest = distances(graph.dag_longest_path(0))
+        shortest = distances(negated.bellman(0))
+        assert longest == {node: -d for node, d in shortest.items()}
+
+def test_dag_on_long_path():
+    graph = Graph(directed=True)
+    graph.add_edges_from((i, i + 1, -1) for i in range(20000))
+    assert graph.dag_shortest_path(0).get_node_value(20000) == -20000
+
+def test_shortest_path_auto():
+    graph = random_dag(1)
+    tree = distances(graph.bellman(0))
+    target = max(tree)
+    for algorithm in ("auto", "dag"):
+        distance, path = graph.shortest_path(0, target, algorithm=algorithm)
+        assert distance == tree[target]
+        assert sum(graph.get_weight(a, b)
+                   for a, b in zip(path, path[1:])) == distance
+    unreachable = next(n for n in graph.list_nodes() if n not in tree)
+    with pytest.raises(NoConnection):
+        graph.shortest_path(0, unreachable, algorithm="auto")
+    # with a cycle auto falls back to dijkstra
+    graph = Graph(directed=True)
+    graph.add_edges_from([(0, 1, 1), (1, 2, 1), (2, 0, 1)])
+    assert graph.shortest_path(0, 2, algorithm="auto") == (2, [0, 1, 2])
+    with pytest.raises(CyclicGraph):
+        graph.shortest_path(0, 2, algorithm="dag")
+    with pytest.raises(ValueError):
+        graph.shortest_path(0, 2, algorithm="dag", bidirectional=True)
+
+@pytest.mark.parametrize("method", ["dijkstra", "bellman"])
+def test_tree_builders_auto(method):
+    graph = random_dag(2)
+    expected = distances(graph.dag_shortest_path(0))
+    for algorithm in ("auto", "dag"):
+        tree = getattr(graph, method)(0, algorithm=algorithm)
+        assert distances(tree) == expected
+    graph.add_connection(29, 0, 1000)
+    graph.add_connection(0, 29, 1000)
+    assert distances(getattr(graph, method)(0, algorithm="auto")) ==\
+           distances(getattr(graph, method)(0))
+    with pytest.raises(CyclicGraph):
+        getattr(graph, method)(0, algorithm="dag")
+    with pytest.raises(ValueError):
+        getattr(graph, method)(0, algorithm="astar")
+
+def test_dag_needs_a_directed_graph():
+    graph = Graph(directed=False)
+    graph.add_connection(1, 2)
+    with pytest.raises(ValueError):
+        graph.topological_order()
+    assert not graph.freeze().is_dag()
@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from pgraph.graph import Graph, parse_dot
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_snapshot_dot_nodes_match_graph(directed):
+    graph = Graph(directed=directed)
+    graph.add_connection(1, 2, 3)
+    graph.add_connection(3, 3)
+    graph.add_node(4)
+    graph.add_node(5, 7)
+    graph.add_connection(5, 1)
+    expected = [(4, None), (5, 7)]
+    assert sorted(graph._dot_nodes()) == expected
+    assert sorted(graph.freeze()._dot_nodes()) == expected
+
+def test_numeric_labels_round_trip():
+    graph = Graph(directed=True)
+    graph.add_connection(2.5, 1e-05, 3)
+    graph.add_connection(1e-05, -1e+22, 1.5)
+    graph.add_connection(-1e+22, 2, 4)
+    graph.add_node("2.5", 0.1)
+    stream = io.StringIO()
+    graph.write_dot(stream)
+    stream.seek(0)
+    parsed = parse_dot(stream)
+    assert sorted(parsed.list_nodes(), key=repr) ==\
+           sorted([2.5, 1e-05, -1e+22, 2, "2.5"], key=repr)
+    assert [type(l) for l in parsed.list_nodes() if l in (2.5, 1e-05, -1e+22)]\
+           == [float] * 3
+    assert parsed.get_weight(1e-05, -1e+22) == 1.5
+    assert parsed.node_map["2.5"].value == 0.1
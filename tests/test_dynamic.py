@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from pgraph.graph import Graph
+
+def random_graph(rng, n=25, m=80):
+    graph = Graph(directed=True)
+    for i in range(n):
+        graph.add_node(i)
+    for _ in range(m):
+        start, end = rng.randrange(n), rng.randrange(n)
+        if start != end:
+            graph.add_connection(start, end, rng.randint(0, 20))
+    return graph
+
+def check(graph, dynamic):
+    tree = graph.dijkstra(dynamic.source)
+    for node in graph.list_nodes():
+        if node in tree.node_map:
+            expected = tree.get_node_value(node)
+        else:
+            expected = float("inf")
+        assert dynamic.get_distance(node) == expected
+        if expected != float("inf"):
+            path = dynamic.path(node)
+            assert path[0] == dynamic.source and path[-1] == node
+            assert sum(graph.get_weight(a, b)
+                       for a, b in zip(path, path[1:])) == expected
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "bellman"])
+def test_repair_matches_recomputation(algorithm):
+    for seed in range(5):
+        rng = random.Random(seed)
+        graph = random_graph(rng)
+        dynamic = graph.dynamic_shortest_path(0, algorithm)
+        check(graph, dynamic)
+        for _ in range(40):
+            start, end = rng.randrange(25), rng.randrange(25)
+            if start == end:
+                continue
+            change = rng.random()
+            if not graph.is_connected(start, end):
+                graph.add_connection(start, end, rng.randint(0, 20))
+            elif change < 0.3:
+                graph.remove_connection(start, end)
+            else:
+                graph.set_weight(start, end, rng.randint(0, 20))
+            check(graph, dynamic)
+        dynamic.close()
+
+def test_tree_and_close():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a", 1)
+    graph.add_connection("a", "b", 1)
+    graph.add_connection("s", "b", 5)
+    dynamic = graph.dynamic_shortest_path("s")
+    assert dynamic.get_father("b") == "a"
+    graph.set_weight("a", "b", 10)
+    assert dynamic.get_father("b") == "s"
+    assert dynamic.get_distance("b") == 5
+    tree = dynamic.tree()
+    assert sorted(tree.backward_star("b")) == ["s"]
+    assert tree.get_node_value("b") == 5
+    dynamic.close()
+    graph.set_weight("a", "b", 1)
+    assert dynamic.get_distance("b") == 5
+
+def test_unknown_algorithm():
+    graph = Graph(directed=True)
+    graph.add_node(0)
+    with pytest.raises(ValueError):
+        graph.dynamic_shortest_path(0, "floyd")
@@ -0,0 +1,156 @@
+import random
+
+import pytest
+
+from pgraph.graph import Graph
+
+ALGORITHMS = ["dinic", "push_relabel", "edmonds_karp"]
+
+def clrs_network():
+    graph = Graph(directed=True)
+    for start, end, ubound in [("s", "v1", 16), ("s", "v2", 13),
+                               ("v1", "v3", 12), ("v2", "v1", 4),
+                               ("v2", "v4", 14), ("v3", "v2", 9),
+                               ("v3", "t", 20), ("v4", "v3", 7),
+                               ("v4", "t", 4)]:
+        graph.add_connection(start, end, ubound=ubound, flux=0)
+    return graph
+
+def random_network(seed, n=20, m=70):
+    rng = random.Random(seed)
+    graph = Graph(directed=True)
+    for i in range(n):
+        graph.add_node(i)
+    for _ in range(m):
+        start, end = rng.randrange(n), rng.randrange(n)
+        if start != end:
+            graph.add_connection(start, end, ubound=rng.randint(1, 15),
+                                 flux=0)
+    return graph
+
+def check_flux(graph, source, sink, value):
+    """Checks the bounds and the conservation of the flux, and that no
+       augmenting path is left in the residual graph
+    """
+    balance = {node: 0 for node in graph.list_nodes()}
+    for node in graph.list_nodes():
+        for end in graph.forward_star(node):
+            flux = graph.get_flux(node, end) or 0
+            assert 0 <= flux <= graph.get_ubound(node, end)
+            balance[node] -= flux
+            balance[end] += flux
+    assert balance[source] == -value
+    assert balance[sink] == value
+    assert all(b == 0 for node, b in balance.items()
+               if node not in (source, sink))
+    reached = {source}
+    stack = [source]
+    while stack:
+        node = stack.pop()
+        for end in graph.flux_forward_star(node):
+            if end not in reached:
+                reached.add(end)
+                stack.append(end)
+    assert sink not in reached
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_max_flux_clrs(algorithm):
+    graph = clrs_network()
+    assert graph.max_flux("s", "t", algorithm) == 23
+    check_flux(graph, "s", "t", 23)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_max_flux_random(algorithm):
+    for seed in range(8):
+        graph = random_network(seed)
+        expected = random_network(seed).max_flux(0, 1, "edmonds_karp")
+        assert graph.max_flux(0, 1, algorithm) == expected
+        check_flux(graph, 0, 1, expected)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_max_flux_starts_from_current_flux(algorithm):
+    graph = clrs_network()
+    for start, end in [("s", "v1"), ("v1", "v3"), ("v3", "t")]:
+        graph.set_flux(start, end, 12)
+    assert graph.max_flux("s", "t", algorithm) == 23
+    check_flux(graph, "s", "t", 23)
+
+def test_max_flux_unbounded():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a")
+    graph.add_connection("a", "t")
+    with pytest.raises(ValueError):
+        graph.max_flux("s", "t")
+
+def test_max_flux_infinite_edge_with_bounded_cut():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a")
+    graph.add_connection("a", "t", ubound=5, flux=0)
+    assert graph.max_flux("s", "t") == 5
+    assert graph.get_flux("s", "a") == 5
+
+def test_max_flux_unknown_algorithm():
+    with pytest.raises(ValueError):
+        clrs_network().max_flux("s", "t", "ford")
+
+def test_min_cost_flow_negative_cycle_without_supplies():
+    graph = Graph(directed=True)
+    graph.add_connection(0, 1, -3)
+    graph.add_connection(1, 0, 2)
+    with pytest.raises(ValueError, match="Negative cost cycle"):
+        graph.min_cost_flow({0: 0})
+
+def test_min_cost_flow_bounded_negative_cycle():
+    graph = Graph(directed=True)
+    graph.add_connection(0, 1, -1, ubound=3)
+    graph.add_connection(1, 0, 0)
+    assert graph.min_cost_flow({0: 0}) == -3
+    assert graph.get_flux(0, 1) == 3
+    assert graph.get_flux(1, 0) == 3
+
+def test_min_cost_flow_cycle_unreachable_from_sources():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "t", 1, ubound=5)
+    graph.add_connection("a", "b", -2, ubound=4)
+    graph.add_connection("b", "a", 1, ubound=4)
+    assert graph.min_cost_flow({"s": 2, "t": -2}) == -2
+    assert graph.get_flux("s", "t") == 2
+    assert graph.get_flux("a", "b") == 4
+    assert graph.get_flux("b", "a") == 4
+
+def test_min_cost_flow_prefers_cheap_paths():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a", 1, ubound=3)
+    graph.add_connection("a", "t", 1, ubound=3)
+    graph.add_connection("s", "t", 5, ubound=10)
+    graph.add_connection("t", "s", 0, lbound=1)
+    # the lbound of t -> s sends a unit back, to be carried again
+    assert graph.min_cost_flow({"s": 5, "t": -5}) == 21
+    assert graph.get_flux("s", "a") == 3
+    assert graph.get_flux("s", "t") == 3
+    assert graph.get_flux("t", "s") == 1
+
+def test_min_cost_flow_infeasible():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "t", 1, ubound=1)
+    with pytest.raises(ValueError):
+        graph.min_cost_flow({"s": 2, "t": -2})
+    with pytest.raises(ValueError):
+        graph.min_cost_flow({"s": 1})
+
+def test_flux_is_written_on_every_edge():
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a", 1, ubound=2)
+    graph.add_connection("a", "t", 1, ubound=2)
+    graph.add_connection("s", "t", 5)
+    graph.add_connection("t", "s")
+    graph.min_cost_flow({"s": 2, "t": -2})
+    assert graph.get_flux("s", "t") == 0
+    assert graph.get_flux("t", "s") == 0
+    assert graph.get_flux("s", "a") == 2
+    graph = Graph(directed=True)
+    graph.add_connection("s", "t", ubound=1)
+    graph.add_connection("t", "s")
+    assert graph.max_flux("s", "t") == 1
+    assert graph.get_flux("s", "t") == 1
+    assert graph.get_flux("t", "s") == 0
@@ -0,0 +1,235 @@
+import pytest
+
+from pgraph.graph import Graph, parse_graph
+
+def test_backward_star_follows_connections():
+    graph = Graph(directed=True)
+    graph.add_connection(1, 2)
+    graph.add_connection(3, 2)
+    graph.add_connection(2, 4)
+    assert sorted(graph.backward_star(2)) == [1, 3]
+    assert list(graph.backward_star(1)) == []
+    graph.remove_connection(1, 2)
+    assert list(graph.backward_star(2)) == [3]
+    assert list(graph.backward_star(4)) == [2]
+
+def test_backward_star_of_copy():
+    graph = Graph(directed=True)
+    graph.add_connection(1, 2)
+    graph.add_connection(3, 2)
+    copy = graph.copy()
+    copy.remove_connection(3, 2)
+    assert list(copy.backward_star(2)) == [1]
+    assert sorted(graph.backward_star(2)) == [1, 3]
+
+def test_undirected_forward_star_has_both_ends():
+    graph = Graph(directed=False)
+    graph.add_connection(2, 1)
+    graph.add_connection(2, 3)
+    assert sorted(graph.forward_star(2)) == [1, 3]
+    assert list(graph.forward_star(1)) == [2]
+    assert list(graph.forward_star(3)) == [2]
+
+EDGES = [(1, 2), (2, 3, 5), (3, 1, -1, 0), (1, 4, 2, 0, 7), (4, 4, 1, 0, 3, 2)]
+
+@pytest.mark.parametrize("directed", [True, False])
+def test_add_edges_from_matches_add_connection(directed):
+    bulk = Graph(directed)
+    bulk.add_edges_from(iter(EDGES))
+    single = Graph(directed)
+    for edge in EDGES:
+        single.add_connection(*edge)
+    assert str(bulk) == str(single)
+    assert sorted(bulk.backward_star(1)) == sorted(single.backward_star(1))
+
+def test_add_nodes_from():
+    graph = Graph()
+    graph.add_node(1)
+    graph.add_nodes_from({1: 10, 2: 20, 3: None})
+    graph.add_nodes_from(x for x in [3, 4])
+    assert list(graph.list_nodes()) == [1, 2, 3, 4]
+    assert [graph.get_node_value(n) for n in range(1, 5)] == [10, 20, None,
+                                                             None]
+
+def test_bulk_adds_keep_version_when_nothing_changes():
+    graph = Graph()
+    graph.add_nodes_from({1: 10, 2: None})
+    frozen = graph.freeze()
+    version = graph.version
+    graph.add_nodes_from([1, 2])
+    graph.add_nodes_from({1: 20})
+    graph.add_edges_from([])
+    assert graph.version == version
+    assert graph.freeze() is frozen
+    graph.add_nodes_from({2: 5})
+    assert graph.version != version
+
+def test_add_edges_from_invalid_edge():
+    graph = Graph()
+    with pytest.raises(ValueError):
+        graph.add_edges_from([(1,)])
+    with pytest.raises(ValueError):
+        graph.add_edges_from([(1, 2, 3, 4, 5, 6, 7)])
+
+def test_bulk_add_notifies_listeners():
+    graph = Graph()
+    events = []
+    graph.subscribe(lambda *event: events.append(event))
+    graph.add_nodes_from([1])
+    graph.add_edges_from([(1, 2, 3)])
+    assert events == [("add_node", 1), ("add_node", 2),
+                      ("add_connection", 1, 2)]
+
+def test_bulk_add_invalidates_caches():
+    graph = Graph(cache_size=4)
+    graph.add_edges_from([(1, 2, 3)])
+    frozen = graph.freeze()
+    tree = graph.dijkstra(1)
+    assert graph.dijkstra(1) is tree
+    graph.add_edges_from([(1, 3, 1), (3, 2, 1)])
+    assert graph.freeze() is not frozen
+    assert graph.freeze().edge_count() == 3
+    tree = graph.dijkstra(1)
+    assert tree.get_node_value(2) == 2
+    graph.add_nodes_from([4])
+    assert graph.dijkstra(1) is not tree
+    assert 4 in graph.freeze().labels
+
+def flow_graph():
+    graph = Graph(directed=True)
+    graph.add_edges_from([("s", "a", 1, None, 4, 0), ("a", "t", 2, None, 3, 0),
+                          ("s", "t", 5, None, 2, 0)])
+    graph.add_node("a", 7)
+    return graph
+
+MUTATIONS = [
+    lambda g: g.set_weight("s", "a", 10),
+    lambda g: g.set_flux("a", "t", 3),
+    lambda g: g.set_ubound("s", "t", 9),
+    lambda g: g.set_lbound("s", "t", 1),
+    lambda g: g.set_node_value("a", 1),
+    lambda g: g.add_connection("t", "s", 3),
+    lambda g: g.add_connection("s", "a", 8),
+    lambda g: g.remove_connection("s", "a"),
+    lambda g: g.add_node("u", 2),
+    lambda g: g.max_flux("s", "t"),
+]
+
+@pytest.mark.parametrize("flatten", [False, True])
+@pytest.mark.parametrize("mutation", MUTATIONS)
+def test_copies_are_isolated(mutation, flatten):
+    graph = flow_graph()
+    expected = str(graph)
+    copy = graph.copy(flatten)
+    mutation(copy)
+    assert str(graph) == expected
+    assert sorted(graph.backward_star("a")) == ["s"]
+    changed = str(copy)
+    assert changed != expected
+    mutation(graph)
+    assert str(copy) == changed
+
+@pytest.mark.parametrize("mutation", MUTATIONS)
+def test_copy_of_copy_is_isolated(mutation):
+    graph = flow_graph()
+    first = graph.copy()
+    second = first.copy()
+    expected = str(graph)
+    mutation(second)
+    assert str(graph) == expected
+    assert str(first) == expected
+    mutation(first)
+    assert str(graph) == expected
+    assert str(first) == str(second)
+
+def test_flatten_keeps_the_graph():
+    graph = flow_graph()
+    copy = graph.copy()
+    copy.flatten()
+    copy.set_flux("s", "a", 4)
+    assert str(copy) != str(graph)
+    assert graph.get_flux("s", "a") == 0
+    assert sorted(copy.backward_star("t")) == ["a", "s"]
+
+def test_undirected_edges_from_both_ends():
+    graph = Graph(directed=False)
+    graph.add_connection("b", 1, 4, ubound=6, flux=0)
+    assert graph.is_connected(1, "b") and graph.is_connected("b", 1)
+    assert graph.get_weight(1, "b") == graph.get_weight("b", 1) == 4
+    graph.set_flux(1, "b", 2)
+    assert graph.get_flux("b", 1) == 2
+    assert list(graph.backward_star(1)) == ["b"]
+    graph.add_connection(1, "b", 7)
+    assert graph.get_weight("b", 1) == 7
+    graph.remove_connection("b", 1)
+    assert not graph.is_connected(1, "b")
+    assert list(graph.forward_star(1)) == []
+
+def test_undirected_self_loop():
+    graph = Graph(directed=False)
+    graph.add_connection(1, 1, 3)
+    graph.add_connection(1, 2, 1)
+    assert sorted(graph.forward_star(1)) == [1, 2]
+    assert graph.get_weight(1, 1) == 3
+    assert graph.freeze().edge_count() == 3
+    assert sorted(graph.freeze()._edges()) == [(1, 1, 3, None, None, None),
+                                              (1, 2, 1, None, None, None)]
+    graph.remove_connection(1, 1)
+    assert list(graph.forward_star(1)) == [2]
+
+def test_undirected_copy_shares_one_edge():
+    graph = Graph(directed=False)
+    graph.add_connection(1, 2, 3)
+    for copy in (graph.copy(), graph.copy(flatten=True)):
+        copy.set_weight(2, 1, 5)
+        assert copy.get_weight(1, 2) == 5
+        assert graph.get_weight(1, 2) == 3
+
+def test_mixed_labels_sort_numbers_first(tmp_path):
+    path = tmp_path / "graph.data"
+    path.write_text("b -> 10 ($1); 2 -> a ($2); a -> 1 ($3); 10 -> 2;")
+    graph = parse_graph(str(path))
+    assert list(graph.list_nodes()) == [1, 2, 10, "a", "b"]
+    assert list(graph.list_nodes(sort=False)) == ["b", 10, 2, "a", 1]
+    assert str(graph).splitlines()[0].startswith("1 -> ")
+
+def test_node_order_cache():
+    graph = Graph()
+    for label in (3, 1, 2):
+        graph.add_node(label)
+    assert list(graph.list_nodes()) == [1, 2, 3]
+    assert list(graph.list_nodes(sort=False)) == [3, 1, 2]
+    graph.add_node(0)
+    assert list(graph.list_nodes()) == [0, 1, 2, 3]
+    graph.add_connection(5, 4)
+    assert list(graph.list_nodes()) == [0, 1, 2, 3, 4, 5]
+    # adding an existing node keeps the order
+    order = graph._node_order
+    graph.add_node(2)
+    assert graph._node_order is order
+
+def test_node_order_after_copy():
+    graph = Graph()
+    graph.add_nodes_from([2, "x", 1])
+    assert list(graph.list_nodes()) == [1, 2, "x"]
+    copy = graph.copy()
+    assert list(copy.list_nodes()) == [1, 2, "x"]
+    copy.add_node(0)
+    assert list(copy.list_nodes()) == [0, 1, 2, "x"]
+    assert list(graph.list_nodes()) == [1, 2, "x"]
+    graph.add_node("a")
+    assert list(graph.list_nodes()) == [1, 2, "a", "x"]
+    assert list(copy.list_nodes()) == [0, 1, 2, "x"]
+
+def test_copy_materializes_only_changed_nodes():
+    graph = Graph(directed=True)
+    graph.add_edges_from((i, i + 1, 1) for i in range(1000))
+    for changes in (0, 1, 10):
+        copy = graph.copy()
+        for i in range(changes):
+            copy.set_weight(i, i + 1, 2)
+        owned = [label for label, node in copy.node_map.items()
+                 if node is not graph.node_map[label]]
+        # the starts and the ends of the edges changed, nodes 0..changes
+        assert len(owned) == (changes + 1 if changes else 0)
+        assert all(graph.get_weight(i, i + 1) == 1 for i in range(1000))
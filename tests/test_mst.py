@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from pgraph.graph import Graph
+
+ALGORITHMS = ["kruskal", "prim", "boruvka"]
+
+def random_graph(seed, n=25, m=60):
+    rng = random.Random(seed)
+    graph = Graph(directed=False)
+    graph.add_nodes_from(range(n))
+    for _ in range(m):
+        start, end = rng.randrange(n), rng.randrange(n)
+        if start != end:
+            graph.add_connection(start, end, rng.randint(-5, 30))
+    return graph
+
+def heaviest_on_path(forest, start, end):
+    """Returns the heaviest weight on the path of the forest from start
+       to end, None if they aren't connected
+    """
+    stack = [(start, float("-inf"))]
+    seen = {start}
+    while stack:
+        node, heaviest = stack.pop()
+        if node == end:
+            return heaviest
+        for neighbour in forest.forward_star(node):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                weight = forest.get_weight(node, neighbour)
+                stack.append((neighbour, max(heaviest, weight)))
+    return None
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_minimum_spanning_forest(algorithm):
+    for seed in range(5):
+        graph = random_graph(seed)
+        edges = graph.minimum_spanning_tree(algorithm, edge_list=True)
+        forest = graph.minimum_spanning_tree(algorithm)
+        assert sorted(forest.list_nodes()) == sorted(graph.list_nodes())
+        assert len(edges) == 25 - len(graph.connected_components())
+        for start, end, weight in edges:
+            assert forest.get_weight(start, end) == weight
+        # cycle property: no edge left out is lighter than the path of
+        # the forest joining its ends
+        for start in graph.list_nodes():
+            for end in graph.forward_star(start):
+                heaviest = heaviest_on_path(forest, start, end)
+                assert heaviest != None
+                assert graph.get_weight(start, end) >= heaviest
+
+def test_algorithms_agree():
+    for seed in range(5):
+        graph = random_graph(seed)
+        totals = {sum(w for _, _, w in
+                      graph.minimum_spanning_tree(algorithm, True))
+                  for algorithm in ALGORITHMS}
+        assert len(totals) == 1
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_forest_of_disconnected_graph(algorithm):
+    graph = Graph(directed=False)
+    graph.add_edges_from([(1, 2, 3), (2, 3, 1), (1, 3, 2), (4, 5, 2.5),
+                          (6, 7)])
+    graph.add_node(8, 1)
+    edges = graph.minimum_spanning_tree(algorithm, edge_list=True)
+    assert sorted(sorted(e[:2]) + [e[2]] for e in edges) ==\
+           [[1, 3, 2], [2, 3, 1], [4, 5, 2.5], [6, 7, 0]]
+    forest = graph.minimum_spanning_tree(algorithm)
+    assert forest.get_node_value(8) == 1
+    assert not forest.directed
+
+def test_minimum_spanning_tree_errors():
+    graph = Graph(directed=True)
+    graph.add_connection(1, 2, 1)
+    with pytest.raises(ValueError):
+        graph.minimum_spanning_tree()
+    graph = Graph(directed=False)
+    graph.add_connection(1, 2, 1)
+    with pytest.raises(ValueError):
+        graph.minimum_spanning_tree("dijkstra")
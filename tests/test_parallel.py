@@ -0,0 +1,17 @@
+import pytest
+
+from pgraph._errors import NegativeCycle
+from pgraph.graph import Graph
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_negative_cycle_has_labels(workers):
+    graph = Graph(directed=True)
+    graph.add_connection("s", "a", 1)
+    graph.add_connection("a", "b", -2)
+    graph.add_connection("b", "a", 1)
+    graph.add_connection("t", "a", 1)
+    with pytest.raises(NegativeCycle) as error:
+        list(graph.multi_source_shortest_paths(["s", "t"], workers=workers,
+                                               algorithm="bellman"))
+    assert sorted(error.value.cycle) == ["a", "b"]
+    assert str(error.value).startswith("Negative cycle: ")
@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from pgraph.graph import Graph, iter_edges, parse_graph
+
+DATA = """1 -> 2 ($2); 1 -> 4 ($-2 b1 B7);
+2 -> 3 ($5 ~3 B4); alpha -> 2 ($10);
+4-> beta (b-1);
+beta -> 1;
+// not an edge;
+3 -> 4 ($2); 10 -> 11 (B9)"""
+
+EXPECTED = [
+    (1, 2, 2, None, None, None),
+    (1, 4, -2, 1, 7, 0),
+    (2, 3, 5, None, 4, 3),
+    ("alpha", 2, 10, None, None, None),
+    (4, "beta", None, -1, None, None),
+    ("beta", 1, None, None, None, None),
+    (3, 4, 2, None, None, None),
+    (10, 11, None, None, 9, 0),
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+def test_iter_edges_chunk_sizes(chunk_size):
+    assert list(iter_edges(io.StringIO(DATA), chunk_size)) == EXPECTED
+
+def test_parse_graph(tmp_path):
+    path = tmp_path / "graph.data"
+    path.write_text(DATA)
+    assert list(iter_edges(str(path), 3)) == EXPECTED
+    graph = parse_graph(str(path))
+    assert sorted(graph.list_nodes(), key=str) ==\
+           sorted({1, 2, 3, 4, 10, 11, "alpha", "beta"}, key=str)
+    for start, end, weight, lbound, ubound, flux in EXPECTED:
+        assert graph.get_weight(start, end) == weight
+        assert graph.get_lbound(start, end) == lbound
+        assert graph.get_ubound(start, end) == ubound
+        assert graph.get_flux(start, end) == flux
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_written_edges_parse_back(chunk_size):
+    graph = Graph()
+    graph.add_connection(1, 2, weight=3, lbound=1, ubound=8, flux=2)
+    graph.add_connection(2, 3, lbound=-4)
+    graph.add_connection(3, 1, weight=-1)
+    edges = [(1, 2, 3, 1, 8, 2), (2, 3, None, -4, None, None),
+             (3, 1, -1, None, None, None)]
+    text = "".join("{} -> {};\n".format(start, graph.node_map[start]
+                                                   .connections[end])
+                   for start, end, *_ in edges)
+    assert "b1" in text
+    assert list(iter_edges(io.StringIO(text), chunk_size)) == edges
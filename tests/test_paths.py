@@ -0,0 +1,176 @@
+import io
+import itertools
+import json
+import random
+
+import pytest
+
+from pgraph._errors import NegativeCycle, NoConnection
+from pgraph._trace import Tracer
+from pgraph.graph import Graph
+
+def random_graph(seed, n=30, m=120, negative=False):
+    """Random graph with weights in 0..20; with negative, the weights
+       are shifted by node potentials, so that some are negative but
+       no cycle is
+    """
+    rng = random.Random(seed)
+    potential = [rng.randint(0, 10) if negative else 0 for _ in range(n)]
+    graph = Graph(directed=True)
+    for i in range(n):
+        graph.add_node(i)
+    for _ in range(m):
+        start, end = rng.randrange(n), rng.randrange(n)
+        if start != end:
+            graph.add_connection(start, end, rng.randint(0, 20) +
+                                 potential[end] - potential[start])
+    return graph
+
+def reference_distances(graph, source):
+    """Distances computed by the textbook Bellman-Ford"""
+    distance = {node: float("inf") for node in graph.list_nodes()}
+    distance[source] = 0
+    for _ in range(len(distance)):
+        for node in graph.list_nodes():
+            for end in graph.forward_star(node):
+                weight = graph.get_weight(node, end) or 0
+                if distance[node] + weight < distance[end]:
+                    distance[end] = distance[node] + weight
+    return {node: d for node, d in distance.items() if d != float("inf")}
+
+def tree_distances(tree):
+    return {node: tree.get_node_value(node) for node in tree.list_nodes()}
+
+@pytest.mark.parametrize("slf, lll",
+                         list(itertools.product([False, True], repeat=2)))
+def test_bellman_heuristics_match_reference(slf, lll):
+    for seed in range(5):
+        graph = random_graph(seed, negative=True)
+        tree = graph.bellman(0, slf=slf, lll=lll)
+        assert tree_distances(tree) == reference_distances(graph, 0)
+
+def test_bellman_matches_dijkstra():
+    for seed in range(5):
+        graph = random_graph(seed)
+        assert tree_distances(graph.bellman(0, slf=True, lll=True)) ==\
+               tree_distances(graph.dijkstra(0))
+
+def test_pairing_heap_matches_binary_heap():
+    for seed in range(5):
+        graph = random_graph(seed)
+        assert tree_distances(graph.dijkstra(0, heap="pairing")) ==\
+               tree_distances(graph.dijkstra(0))
+        assert tree_distances(graph.dijkstra(0, heap="pairing")) ==\
+               reference_distances(graph, 0)
+    with pytest.raises(ValueError):
+        graph.dijkstra(0, heap="fibonacci")
+
+def test_bellman_tree_fathers():
+    graph = random_graph(1, negative=True)
+    tree = graph.bellman(0)
+    for node in tree.list_nodes():
+        for father in tree.backward_star(node):
+            assert tree.get_node_value(father) +\
+                   graph.get_weight(father, node) ==\
+                   tree.get_node_value(node)
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "bellman"])
+def test_negative_cycle_is_reported(algorithm):
+    graph = Graph(directed=True)
+    graph.add_connection(0, 1, 1)
+    graph.add_connection(1, 2, 2)
+    graph.add_connection(2, 3, -4)
+    graph.add_connection(3, 1, 1)
+    graph.add_connection(3, 4, 1)
+    with pytest.raises(NegativeCycle) as error:
+        getattr(graph, algorithm)(0)
+    cycle = error.value.cycle
+    assert sorted(cycle) == [1, 2, 3]
+    assert sum(graph.get_weight(a, b)
+               for a, b in zip(cycle, cycle[1:] + cycle[:1])) < 0
+
+def test_negative_cycle_not_reachable():
+    graph = Graph(directed=True)
+    graph.add_connection(0, 1, 1)
+    graph.add_connection(2, 3, -1)
+    graph.add_connection(3, 2, -1)
+    assert tree_distances(graph.bellman(0)) == {0: 0, 1: 1}
+
+def tree_arcs(tree):
+    return {(father, node) for node in tree.list_nodes()
+            for father in tree.backward_star(node)}
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "bellman"])
+def test_traced_trees_match_untraced(algorithm):
+    for seed in range(5):
+        graph = random_graph(seed, negative=algorithm == "bellman")
+        tracer = Tracer()
+        traced = getattr(graph, algorithm)(0, tracer=tracer)
+        untraced = getattr(graph, algorithm)(0)
+        assert tree_distances(traced) == tree_distances(untraced)
+        assert tree_arcs(traced) == tree_arcs(untraced)
+        assert tracer.counters["pop"] == tracer.counters["queue_get"]
+
+def test_tracer_leaves_event_fields_alone():
+    received = []
+    stream = io.StringIO()
+    tracer = Tracer(lambda name, fields: received.append(fields), stream)
+    random_graph(0).dijkstra(0, tracer=tracer)
+    assert received and all("event" not in fields for fields in received)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [dict(fields, event=line["event"]) for fields, line in
+            zip(received, lines)] == lines
+
+def path_length(graph, path):
+    return sum(graph.get_weight(a, b) for a, b in zip(path, path[1:]))
+
+def grid_graph(seed, size=8):
+    rng = random.Random(seed)
+    graph = Graph(directed=True)
+    for x, y in itertools.product(range(size), repeat=2):
+        for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            if 0 <= x + dx < size and 0 <= y + dy < size:
+                graph.add_connection((x, y), (x + dx, y + dy),
+                                     rng.randint(1, 9))
+    return graph
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_shortest_path_matches_dijkstra(bidirectional):
+    for seed in range(5):
+        graph = random_graph(seed)
+        distances = tree_distances(graph.dijkstra(0))
+        for target in graph.list_nodes():
+            if target not in distances:
+                with pytest.raises(NoConnection):
+                    graph.shortest_path(0, target,
+                                        bidirectional=bidirectional)
+                continue
+            distance, path = graph.shortest_path(0, target,
+                                                 bidirectional=bidirectional)
+            assert distance == distances[target]
+            assert path[0] == 0 and path[-1] == target
+            assert path_length(graph, path) == distance
+
+def test_a_star_on_grid():
+    graph = grid_graph(3)
+    target = (7, 7)
+    distances = tree_distances(graph.dijkstra((0, 0)))
+    # every step costs at least 1, so the Manhattan distance is a lower
+    # bound
+    heuristic = lambda node: abs(node[0] - target[0]) +\
+                             abs(node[1] - target[1])
+    distance, path = graph.shortest_path((0, 0), target, heuristic)
+    assert distance == distances[target]
+    assert path_length(graph, path) == distance
+
+def test_shortest_path_to_source():
+    graph = random_graph(0)
+    assert graph.shortest_path(0, 0) == (0, [0])
+    assert graph.shortest_path(0, 0, bidirectional=True) == (0, [0])
+
+def test_shortest_path_errors():
+    graph = random_graph(0)
+    with pytest.raises(KeyError):
+        graph.shortest_path(0, "missing")
+    with pytest.raises(ValueError):
+        graph.shortest_path(0, 1, lambda node: 0, bidirectional=True)
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from pgraph._queues import (FifoQueue, PriorityQueue, PairingHeap,
+                            EmptyException)
+
+def test_fifo_order():
+    queue = FifoQueue()
+    for item in "abc":
+        queue.put(item)
+    assert queue.is_in("b")
+    assert [queue.get() for _ in range(3)] == ["a", "b", "c"]
+    assert queue.empty()
+    assert not queue.is_in("b")
+
+def test_fifo_counts_repeated_items():
+    queue = FifoQueue()
+    queue.put("a")
+    queue.put("a")
+    queue.get()
+    assert queue.is_in("a")
+    queue.get()
+    assert not queue.is_in("a")
+
+def test_small_label_first():
+    queue = FifoQueue(slf=True)
+    queue.put("a", 5)
+    queue.put("b", 7)
+    queue.put("c", 1)
+    assert [queue.get() for _ in range(3)] == ["c", "a", "b"]
+
+def test_large_label_last():
+    queue = FifoQueue(lll=True)
+    queue.put("a", 10)
+    queue.put("b", 1)
+    queue.put("c", 2)
+    # the average is above "b" and "c" only
+    assert queue.get() == "b"
+    queue.update("c", 20)
+    assert queue.get() == "a"
+    assert queue.get() == "c"
+
+@pytest.mark.parametrize("queue_class", [PriorityQueue, PairingHeap])
+def test_heaps_match_sorted_reference(queue_class):
+    rng = random.Random(0)
+    for _ in range(20):
+        queue = queue_class()
+        # item -> (priority, insertion number): equal priorities come
+        # out in insertion order
+        model = {}
+        counter = 0
+        for _ in range(300):
+            op = rng.random()
+            item = rng.randrange(40)
+            if op < 0.35:
+                value = rng.randint(-50, 50)
+                queue.put(item, value)
+                if item in model:
+                    model[item] = (value, model[item][1])
+                else:
+                    model[item] = (value, counter)
+                    counter += 1
+            elif op < 0.55 and model:
+                item = rng.choice(list(model))
+                value = model[item][0] - rng.randint(0, 10)
+                queue.decrease_key(item, value)
+                model[item] = (value, model[item][1])
+            elif op < 0.7 and model:
+                item = rng.choice(list(model))
+                value = rng.randint(-50, 50)
+                queue.update(item, value)
+                model[item] = (value, model[item][1])
+            elif op < 0.9:
+                if not model:
+                    assert queue.empty()
+                    with pytest.raises(EmptyException):
+                        queue.get()
+                    continue
+                first = min(model, key=model.get)
+                assert queue.peek() == first
+                assert queue.get() == first
+                del(model[first])
+            else:
+                assert queue.is_in(item) == (item in model)
+                if item in model:
+                    assert queue.priority(item) == model[item][0]
+            assert queue.qsize() == len(model)
+        order = sorted(model, key=model.get)
+        assert [queue.get() for _ in order] == order
+        assert queue.empty()
+
+@pytest.mark.parametrize("queue_class", [PriorityQueue, PairingHeap])
+def test_decrease_key_rejects_increase(queue_class):
+    queue = queue_class()
+    queue.put("a", 1)
+    with pytest.raises(ValueError):
+        queue.decrease_key("a", 2)
+    with pytest.raises(KeyError):
+        queue.decrease_key("b", 0)
@@ -0,0 +1,83 @@
+import pytest
+
+from pgraph import Graph, STOP
+
+def tree():
+    #       1
+    #     2   3
+    #    4 5   6
+    graph = Graph(directed=True)
+    graph.add_edges_from([(1, 2), (1, 3), (2, 4), (2, 5), (3, 6), (5, 1)])
+    return graph
+
+def test_bfs_order_and_depth_limit():
+    graph = tree()
+    assert list(graph.bfs(1)) == [1, 2, 3, 4, 5, 6]
+    assert list(graph.bfs(1, depth_limit=1)) == [1, 2, 3]
+    assert list(graph.bfs(3, 2)) == [3, 2, 6, 4, 5, 1]
+
+def test_dfs_preorder():
+    graph = tree()
+    assert list(graph.dfs(1)) == [1, 2, 4, 5, 3, 6]
+    assert list(graph.dfs(1, depth_limit=1)) == [1, 2, 3]
+    assert list(graph.dfs(6, 3)) == [6, 3]
+
+@pytest.mark.parametrize("traversal", ["bfs", "dfs"])
+def test_reports(traversal):
+    graph = tree()
+    visit = getattr(graph, traversal)
+    edges = list(visit(1, report="edges"))
+    assert sorted(edges) == [(1, 2), (1, 3), (2, 4), (2, 5), (3, 6)]
+    events = {node: (depth, parent) for node, depth, parent in
+              visit(1, report="events")}
+    assert events[1] == (0, None)
+    assert events[6] == (2, 3)
+    with pytest.raises(ValueError):
+        visit(1, report="paths")
+
+@pytest.mark.parametrize("traversal", ["bfs", "dfs"])
+def test_visitor_prunes_and_stops(traversal):
+    graph = tree()
+    visit = getattr(graph, traversal)
+    pruned = list(visit(1, visitor=lambda node, depth, parent: node != 2))
+    assert sorted(pruned) == [1, 2, 3, 6]
+    stopped = list(visit(1, visitor=lambda node, depth, parent:
+                            STOP if node == 3 else None))
+    assert stopped[-1] == 3
+    assert 6 not in stopped
+
+@pytest.mark.parametrize("traversal", ["bfs", "dfs"])
+def test_traversal_is_lazy(traversal):
+    graph = tree()
+    visited = []
+    visit = getattr(graph, traversal)(
+        1, visitor=lambda node, depth, parent: visited.append(node))
+    assert next(visit) == 1
+    assert visited == [1]
+
+@pytest.mark.parametrize("traversal", ["bfs", "dfs"])
+def test_unknown_start_fails_eagerly(traversal):
+    with pytest.raises(KeyError):
+        getattr(tree(), traversal)(7)
+
+def test_dfs_on_long_path():
+    graph = Graph(directed=True)
+    graph.add_edges_from((i, i + 1) for i in range(20000))
+    assert sum(1 for _ in graph.dfs(0)) == 20001
+
+def test_is_reachable():
+    graph = tree()
+    assert graph.is_reachable(5, 6)
+    assert not graph.is_reachable(6, 1)
+
+@pytest.mark.parametrize("traversal", ["bfs", "dfs"])
+def test_package_stop_ends_the_visit(traversal):
+    import pgraph
+    from pgraph._traversal import STOP as traversal_stop
+    assert pgraph.STOP is STOP is traversal_stop
+    visit = getattr(tree(), traversal)
+    assert list(visit(1, visitor=lambda node, depth, parent: STOP)) == [1]
+    edges = list(visit(1, visitor=lambda node, depth, parent:
+                                  STOP if node == 3 else None,
+                       report="edges"))
+    assert edges[-1] == (1, 3)